@@ -0,0 +1,225 @@
+# ==========================================
+# [주소 파서] 한국 주소 구조화 (단일 패스, 메모이제이션)
+# ==========================================
+# 원본 주소를 한 번 파싱하여 시도/시군구/읍면동/도로명/건물번호/상세주소/괄호로 나누고
+# 각 단계의 검색 키워드(기본 주소, 번지 제외 주소, 재시도 키워드)와
+# 캐시·중복 제거용 정규화 키를 함께 제공합니다.
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# 시도 정식 명칭 → 약칭
+SIDO_ALIASES = {
+    "서울특별시": "서울",
+    "부산광역시": "부산",
+    "대구광역시": "대구",
+    "인천광역시": "인천",
+    "광주광역시": "광주",
+    "대전광역시": "대전",
+    "울산광역시": "울산",
+    "세종특별자치시": "세종",
+    "경기도": "경기",
+    "강원도": "강원",
+    "강원특별자치도": "강원",
+    "충청북도": "충북",
+    "충청남도": "충남",
+    "전라북도": "전북",
+    "전북특별자치도": "전북",
+    "전라남도": "전남",
+    "경상북도": "경북",
+    "경상남도": "경남",
+    "제주특별자치도": "제주",
+}
+
+# 입력에 나올 수 있는 시도 표기 → 약칭 (서울특별시 / 서울시 / 서울)
+_SIDO_NORMAL = {}
+for _full, _short in SIDO_ALIASES.items():
+    _SIDO_NORMAL[_full] = _short
+    _SIDO_NORMAL[_short] = _short
+    _SIDO_NORMAL[_short + "시"] = _short
+    _SIDO_NORMAL[_short + "도"] = _short
+del _SIDO_NORMAL["제주시"]  # 제주시는 제주특별자치도의 시 (시군구)
+
+_PAREN = re.compile(r"\([^)]+\)")
+
+# 기본 주소 추출: 도로명(~로/~길 + 건물번호) → 지번(동/리 + 번지)
+_ROAD_BASE = re.compile(r"^(.+?(?:로|길)(?:\s*\d+번?길)?\s*\d+(?:-\d+)?)")
+_JIBUN_BASE = re.compile(r"^(.+?(?:동\d*가?|리|읍|면)\s+\d+(?:-\d+)?)")
+
+# 상세주소 (동/호/층/건물명 이후 전체) - 14개 패턴을 하나의 정규식으로 결합
+_DETAIL = re.compile(
+    r"\s+(?:"
+    r"\d+동\s*\d*호?"
+    r"|[A-Za-z가-힣]+동(?![가-힣]|\d+가)\s*\d*호?"
+    r"|\d+층"
+    r"|\d+-\d+호?"
+    r"|\d+호"
+    r"|[가-힣]+(?:아파트|빌딩|타워|오피스텔|빌라|맨션|주택|마을|단지)"
+    r").*$",
+    re.IGNORECASE,
+)
+
+# 기본 주소 안의 구성요소
+_ROAD_PART = re.compile(
+    r"(?:^|(?<=\s))(?P<road>[가-힣A-Za-z0-9]+(?:로|길)(?:\s*\d+번?길)?)"
+    r"\s*(?:지하\s*)?(?P<main>\d+)(?:-(?P<sub>\d+))?"
+)
+_JIBUN_PART = re.compile(
+    r"(?:^|(?<=\s))(?P<emd>[가-힣0-9]+(?:동|가|리|읍|면))"
+    r"\s+(?:산\s*)?(?P<main>\d+)(?:-(?P<sub>\d+))?"
+)
+_SIGUNGU = re.compile(r"^[가-힣]+(?:시|군|구)$")
+_EMD = re.compile(r"^[가-힣0-9]+(?:읍|면|동|가|리)$")
+
+# 기본 주소 끝의 번지 (번지 제외 재검색용)
+_TRAILING_NUMBER = re.compile(r"\s+\d+(-\d+)?$")
+
+# 재시도 키워드: 동/로/길 접미사 제거, 한글 외 문자 제거
+_RETRY_SUFFIX = re.compile(r"([가-힣]{2,})(?:동\d*가?|로|길)\d*")
+_NON_HANGUL = re.compile(r"[^가-힣\s]")
+
+
+@dataclass(frozen=True)
+class ParsedAddress:
+    """구조화된 주소 (parse_address 결과, 불변)"""
+
+    raw: str
+    sido: str = ""            # 시도 약칭 (서울, 경기, ...)
+    sigungu: str = ""         # 시군구 (성남시 분당구 처럼 두 단어일 수 있음)
+    emd: str = ""             # 읍/면/동/가/리
+    road_name: str = ""       # 도로명 (~로/~길)
+    main_no: int = 0          # 건물본번 (지번 주소면 본번)
+    sub_no: int = 0           # 건물부번 (지번 주소면 부번)
+    detail: str = ""          # 상세주소 (동/호/층/건물명 등)
+    paren: str = ""           # 괄호 내용 (괄호 포함)
+    base: str = ""            # 상세주소·괄호를 제외한 기본 주소
+    kind: str = "unknown"     # "road" / "jibun" / "unknown"
+    retry_keyword: str = ""   # 접미사 제거 핵심 키워드 (없으면 "")
+
+    @property
+    def base_address(self) -> str:
+        """기본 주소 + 괄호 내용 (API 검색 키워드)"""
+        if self.paren:
+            return f"{self.base} {self.paren}".strip()
+        return self.base
+
+    @property
+    def base_without_number(self) -> str:
+        """기본 주소에서 끝 번지를 뺀 주소 (검색 결과 없을 때 재검색용)"""
+        return _TRAILING_NUMBER.sub("", self.base_address)
+
+    @property
+    def building_no(self) -> str:
+        if not self.main_no:
+            return ""
+        return f"{self.main_no}-{self.sub_no}" if self.sub_no else str(self.main_no)
+
+    @property
+    def key(self) -> str:
+        """
+        정규화 키: 같은 건물을 가리키는 주소는 같은 키
+        (도로명/지번 구성요소가 없으면 공백 정리한 기본 주소)
+        """
+        if self.kind == "road":
+            return f"road:{self.sido}|{self.sigungu}|{self.road_name}|{self.building_no}"
+        if self.kind == "jibun":
+            return f"jibun:{self.sido}|{self.sigungu}|{self.emd}|{self.building_no}"
+        return "raw:" + " ".join(self.base.split()).lower()
+
+
+def _build_retry_keyword(no_paren: str) -> str:
+    """동/로/길 접미사를 제거한 핵심 키워드 (3글자 이하면 "")"""
+    cleaned = _RETRY_SUFFIX.sub(r"\1", no_paren)
+    cleaned = _NON_HANGUL.sub(" ", cleaned)
+    cleaned = " ".join(w for w in cleaned.split() if len(w) > 1)
+    return cleaned if len(cleaned) > 3 else ""
+
+
+def normalize_sido(token: str) -> str:
+    """시도 표기(서울특별시 / 서울시 / 서울) → 약칭 (시도가 아니면 "")"""
+    return _SIDO_NORMAL.get(token, "")
+
+
+def _split_region(prefix: str) -> tuple:
+    """도로명/지번 앞부분 → (시도, 시군구, 읍면동)"""
+    sido, sigungu, emd = "", [], ""
+    for token in prefix.split():
+        if not sido and not sigungu and token in _SIDO_NORMAL:
+            sido = _SIDO_NORMAL[token]
+        elif _SIGUNGU.match(token) and not emd:
+            sigungu.append(token)
+        elif _EMD.match(token):
+            emd = token
+    return sido, " ".join(sigungu), emd
+
+
+@lru_cache(maxsize=65536)
+def parse_address(full_address: str) -> ParsedAddress:
+    """
+    주소 문자열을 구조화합니다 (같은 입력은 캐시된 결과 반환).
+
+    Args:
+        full_address: 원본 주소
+
+    Returns:
+        ParsedAddress
+    """
+    if not full_address:
+        return ParsedAddress(raw=full_address or "")
+
+    address = full_address.strip()
+
+    # 괄호 안 내용 임시 보존
+    paren_match = _PAREN.search(address)
+    paren = paren_match.group() if paren_match else ""
+    no_paren = _PAREN.sub("", address).strip()
+
+    # 1단계: 도로명 / 2단계: 지번 / 3단계: 상세주소 제거
+    kind = "unknown"
+    match = _ROAD_BASE.match(no_paren)
+    if match:
+        kind = "road"
+    else:
+        match = _JIBUN_BASE.match(no_paren)
+        if match:
+            kind = "jibun"
+
+    if match:
+        base = match.group(1)
+    else:
+        base = _DETAIL.sub("", no_paren)
+    detail = no_paren[len(base):].strip() if no_paren.startswith(base) else ""
+    base = base.strip()
+
+    fields = {}
+    part = None
+    if kind == "road":
+        part = _ROAD_PART.search(base)
+        if part:
+            fields["road_name"] = re.sub(r"\s+", "", part.group("road"))
+    elif kind == "jibun":
+        part = _JIBUN_PART.search(base)
+        if part:
+            fields["emd"] = part.group("emd")
+
+    if part:
+        fields["main_no"] = int(part.group("main"))
+        fields["sub_no"] = int(part.group("sub") or 0)
+        sido, sigungu, emd = _split_region(base[:part.start()])
+        fields["sido"] = sido
+        fields["sigungu"] = sigungu
+        fields.setdefault("emd", emd)
+    else:
+        kind = "unknown"
+        fields["sido"], fields["sigungu"], fields["emd"] = _split_region(base)
+
+    return ParsedAddress(
+        raw=full_address,
+        detail=detail,
+        paren=paren,
+        base=base,
+        kind=kind,
+        retry_keyword=_build_retry_keyword(no_paren),
+        **fields,
+    )
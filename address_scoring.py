@@ -0,0 +1,88 @@
+# ==========================================
+# [후보 점수] 벡터화된 주소 유사도 계산
+# ==========================================
+# API 후보(roadAddr) 전체를 한 번에 점수화합니다.
+# - 문자 bigram을 고정 크기 비트 벡터로 해싱 (crc32: 실행마다 바뀌는 내장 hash()와 달리 점수가 항상 같음)
+# - 입력 주소 벡터는 한 번만 만들고 캐시 (recommend_zipcode에서 최대 3회 재사용)
+# - 유사도: Dice 계수 2|A∩B| / (|A|+|B|) + 키워드 포함 보너스 (0.1/키워드)
+
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+# 해시 비트 벡터 크기 (주소 bigram 수 대비 충분히 커서 충돌이 드묾)
+_DIM = 4096
+
+
+def _bigram_ids(text: str) -> np.ndarray:
+    """공백 정규화·소문자 문자열의 bigram → 해시 인덱스 (중복 제거)"""
+    text = " ".join(text.lower().split())
+    if len(text) < 2:
+        grams = {text} if text else set()
+    else:
+        grams = {text[i:i + 2] for i in range(len(text) - 1)}
+    ids = {zlib.crc32(gram.encode("utf-8")) % _DIM for gram in grams}
+    return np.fromiter(ids, dtype=np.intp, count=len(ids))
+
+
+@lru_cache(maxsize=4096)
+def _query_vector(full_input: str):
+    """입력 주소 bit 벡터와 bigram 수 (행마다 한 번 계산)"""
+    ids = _bigram_ids(full_input)
+    vector = np.zeros(_DIM, dtype=np.float64)
+    vector[ids] = 1.0
+    return vector, len(ids)
+
+
+@lru_cache(maxsize=65536)
+def _candidate_ids(road_addr: str) -> np.ndarray:
+    """후보 주소 bigram 인덱스 (같은 roadAddr은 여러 행에서 반복됨)"""
+    return _bigram_ids(road_addr)
+
+
+@lru_cache(maxsize=4096)
+def _keywords(base_address: str) -> tuple:
+    return tuple(base_address.split())
+
+
+def score_candidates(full_input: str, base_address: str, road_addrs: list) -> np.ndarray:
+    """
+    후보 주소 전체의 유사도를 한 번에 계산합니다.
+
+    Args:
+        full_input: 원본 입력 주소
+        base_address: 검색에 사용한 키워드 (공백 단위 포함 여부로 보너스)
+        road_addrs: 후보 roadAddr 리스트
+
+    Returns:
+        np.ndarray: 후보별 유사도 (0.0~1.0, float64)
+    """
+    n = len(road_addrs)
+    scores = np.zeros(n, dtype=np.float64)
+    if n == 0 or not full_input:
+        return scores
+
+    query, query_size = _query_vector(full_input)
+    if query_size == 0:
+        return scores
+
+    # 후보 bigram을 (행, 열) 좌표로 펼쳐 교집합 크기를 한 번에 합산
+    candidate_ids = [_candidate_ids(addr) if addr else np.empty(0, dtype=np.intp) for addr in road_addrs]
+    sizes = np.array([len(ids) for ids in candidate_ids], dtype=np.float64)
+    rows = np.repeat(np.arange(n), sizes.astype(np.intp))
+    cols = np.concatenate(candidate_ids) if n else np.empty(0, dtype=np.intp)
+    intersection = np.bincount(rows, weights=query[cols], minlength=n)
+
+    denom = query_size + sizes
+    np.divide(2.0 * intersection, denom, out=scores, where=(denom > 0) & (sizes > 0))
+
+    keywords = _keywords(base_address or "")
+    if keywords:
+        bonus = np.array(
+            [sum(1 for kw in keywords if kw in addr) for addr in road_addrs],
+            dtype=np.float64,
+        ) * 0.1
+        scores = np.where(sizes > 0, scores + bonus, 0.0)
+
+    return np.minimum(1.0, scores)
@@ -3,19 +3,33 @@
 # ==========================================
 # Streamlit 기반 - Google Sheets 연동
 
+import json
+import time
+
 import streamlit as st
 import pandas as pd
-import time
 
 from sheets_handler import (
     connect_sheet,
     get_worksheet_names,
     read_sheet_preview,
-    read_all_data,
+    read_columns,
+    get_last_modified,
     find_empty_zipcode_rows,
+    find_known_zipcode_pairs,
     write_results,
 )
-from zipcode_helper import recommend_zipcode
+from zipcode_helper import get_cache_stats, get_juso_health, warm_start
+from gemini_helper import get_gemini_cache
+from batch_runner import process_rows, group_rows_by_address
+from config import (
+    SHEET_CHANGE_PROBE_INTERVAL,
+    INCREMENTAL_FLUSH_ROWS,
+    WARM_START_ENABLED,
+    WARM_START_MIN_ACCURACY,
+)
+from job_journal import JobJournal
+from tracing import RunMetrics
 
 # ── 페이지 설정 ──
 st.set_page_config(
@@ -46,6 +60,64 @@ if "processing_done" not in st.session_state:
     st.session_state.processing_done = False
 if "results" not in st.session_state:
     st.session_state.results = []
+if "scan_cache" not in st.session_state:
+    st.session_state.scan_cache = None
+if "written_rows" not in st.session_state:
+    st.session_state.written_rows = set()
+if "run_metrics" not in st.session_state:
+    st.session_state.run_metrics = None
+
+
+def load_scan(ws, addr_idx: int, zip_idx: int, acc_idx: int = -1) -> dict:
+    """
+    주소/우편번호(/정확도) column 스캔 결과를 rerun 사이에 재사용합니다.
+    우편번호가 이미 있는 행은 warm start용 (주소, 우편번호) 쌍으로 함께 모읍니다.
+    (spreadsheet, worksheet, column)이 같고 시트 수정 시각이 그대로면 다시 읽지 않습니다.
+    수정 시각 확인은 SHEET_CHANGE_PROBE_INTERVAL초에 한 번만 합니다.
+    """
+    key = (ws.spreadsheet.id, ws.id, addr_idx, zip_idx, acc_idx)
+    cached = st.session_state.scan_cache
+    now = time.time()
+
+    if cached and cached["key"] == key:
+        if now - cached["probed_at"] < SHEET_CHANGE_PROBE_INTERVAL:
+            return cached
+        modified = get_last_modified(ws)
+        cached["probed_at"] = now
+        if modified is not None and modified == cached["modified"]:
+            return cached
+    else:
+        modified = get_last_modified(ws)
+
+    # 주소/우편번호(/정확도) column만 읽기 → [[주소, 우편번호(, 정확도)], ...]
+    started = time.perf_counter()
+    columns = [addr_idx, zip_idx] + ([acc_idx] if acc_idx >= 0 else [])
+    column_data = list(read_columns(ws, columns))
+    scan = {
+        "key": key,
+        "modified": modified,
+        "probed_at": now,
+        "read_seconds": time.perf_counter() - started,
+        "total_rows": max(len(column_data) - 1, 0),
+        "rows_to_process": find_empty_zipcode_rows(column_data, 0, 1),
+        "known_pairs": (
+            find_known_zipcode_pairs(
+                column_data, 0, 1, 2 if acc_idx >= 0 else -1, WARM_START_MIN_ACCURACY
+            )
+            if WARM_START_ENABLED else []
+        ),
+        "warm_started": False,
+    }
+    st.session_state.scan_cache = scan
+    return scan
+
+
+def reset_scan():
+    """재스캔: 처리 결과와 시트 스캔 캐시 초기화"""
+    st.session_state.processing_done = False
+    st.session_state.results = []
+    st.session_state.written_rows = set()
+    st.session_state.scan_cache = None
 
 
 # ══════════════════════════════════════════
@@ -92,6 +164,7 @@ if connect_clicked and sheet_url:
             st.session_state.acc_col = None
             st.session_state.processing_done = False
             st.session_state.results = []
+            st.session_state.scan_cache = None
             st.rerun()
         except Exception as e:
             st.error(f"연결 실패: {e}")
@@ -191,18 +264,31 @@ if (
     zip_idx = headers.index(st.session_state.zip_col)
     acc_idx = headers.index(st.session_state.acc_col) if st.session_state.acc_col else -1
 
-    all_data = read_all_data(ws)
-    rows_to_process = find_empty_zipcode_rows(all_data, addr_idx, zip_idx)
+    scan = load_scan(ws, addr_idx, zip_idx, acc_idx)
+    rows_to_process = scan["rows_to_process"]
 
-    st.info(f"📋 전체 {len(all_data) - 1}행 중 **{len(rows_to_process)}행**의 우편번호가 비어있습니다.")
+    st.info(f"📋 전체 {scan['total_rows']}행 중 **{len(rows_to_process)}행**의 우편번호가 비어있습니다.")
 
     if not rows_to_process:
         st.success("모든 행에 우편번호가 이미 있습니다! 🎉")
         if st.button("🔄 재스캔", key="rescan_empty"):
-            st.session_state.processing_done = False
-            st.session_state.results = []
+            reset_scan()
             st.rerun()
     else:
+        # 중복 주소 집계 (같은 주소는 한 번만 조회)
+        unique_count = len(group_rows_by_address(rows_to_process))
+        dup_count = len(rows_to_process) - unique_count
+        if dup_count:
+            st.caption(
+                f"🔁 고유 주소 {unique_count}건 (중복 {dup_count}건, "
+                f"{dup_count / len(rows_to_process):.0%} 조회 생략)"
+            )
+        if scan["known_pairs"]:
+            st.caption(
+                f"📚 우편번호가 있는 {len(scan['known_pairs'])}행을 확인된 주소로 사용합니다 "
+                "(같은 주소·같은 건물은 API 호출 없이 입력)"
+            )
+
         # 미리보기: 처리 대상 주소 목록
         with st.expander(f"처리 대상 주소 {len(rows_to_process)}건 보기"):
             for r in rows_to_process[:20]:
@@ -210,10 +296,31 @@ if (
             if len(rows_to_process) > 20:
                 st.text(f"  ... 외 {len(rows_to_process) - 20}건")
 
+        # 이전 실행 체크포인트 (같은 행·같은 주소의 성공 결과만 이어서 사용)
+        journal = JobJournal.for_worksheet(ws, addr_idx, zip_idx, acc_idx)
+        journal_results, _ = journal.load()
+        resumed = {
+            r["row_num"]: journal_results[r["row_num"]]
+            for r in rows_to_process
+            if r["row_num"] in journal_results
+            and journal_results[r["row_num"]]["address"] == r["address"]
+            and journal_results[r["row_num"]]["zipcode"]
+        }
+        if resumed:
+            col_resume, col_discard = st.columns([4, 1])
+            col_resume.info(f"⏯️ 이전 실행에서 완료된 {len(resumed)}건은 이어서 사용합니다.")
+            if col_discard.button("처음부터", key="discard_journal"):
+                journal.clear()
+                st.rerun()
+
         # 실행 버튼
         col_run, col_rescan, col_option = st.columns([2, 1, 3])
         with col_option:
             use_gemini = st.checkbox("Gemini AI 주소 정제 (지번/오타 자동 보정)", value=True)
+            incremental = st.checkbox(
+                f"처리 중 {INCREMENTAL_FLUSH_ROWS}건마다 시트에 바로 기록",
+                value=False,
+            )
 
         with col_run:
             run_clicked = st.button(
@@ -224,44 +331,83 @@ if (
 
         with col_rescan:
             if st.button("🔄 재스캔", key="rescan_run"):
-                st.session_state.processing_done = False
-                st.session_state.results = []
+                reset_scan()
                 st.rerun()
 
         # ── 처리 실행 ──
         if run_clicked:
             st.session_state.processing_done = False
             st.session_state.results = []
+            st.session_state.written_rows = set()
+
+            metrics = RunMetrics()
+            metrics.resumed = len(resumed)
+            metrics.add_phase("sheet_read", scan["read_seconds"])
+            st.session_state.run_metrics = metrics
+
+            # warm start: 시트의 기존 (주소, 우편번호)를 확인된 주소 캐시/도로구간 인덱스에 적재 (스캔당 한 번)
+            if scan["known_pairs"] and not scan["warm_started"]:
+                with metrics.phase("warm_start"):
+                    warm_start(scan["known_pairs"])
+                scan["warm_started"] = True
 
             progress_bar = st.progress(0)
             status_text = st.empty()
             results_container = st.container()
 
-            results = []
             total = len(rows_to_process)
-
-            for i, row_info in enumerate(rows_to_process):
-                row_num = row_info["row_num"]
-                address = row_info["address"]
-
-                status_text.text(f"처리 중... ({i + 1}/{total}) - {address[:40]}")
-                progress_bar.progress((i + 1) / total)
-
-                # 우편번호 추천
-                rec = recommend_zipcode(address, use_gemini_fallback=use_gemini)
-
-                result_entry = {
-                    "row_num": row_num,
-                    "address": address,
-                    "zipcode": rec["zipcode"],
-                    "road_addr": rec["road_addr"],
-                    "accuracy": rec["accuracy"],
-                    "source": rec["source"],
-                }
-                results.append(result_entry)
-
-                # API rate limit 방지
-                time.sleep(0.3)
+            pending_rows = [r for r in rows_to_process if r["row_num"] not in resumed]
+            pending_writes = []
+
+            def flush_writes():
+                """중간 기록: 모인 성공 결과를 시트에 쓰고 일지에 표시"""
+                if not pending_writes:
+                    return
+                with metrics.phase("sheet_write"):
+                    summary = write_results(ws, pending_writes, zip_idx, acc_idx)
+                failed = set(summary["failed_rows"])
+                written = {r["row_num"] for r in pending_writes} - failed
+                journal.mark_written(written)
+                st.session_state.written_rows.update(written)
+                pending_writes.clear()
+
+            def handle_result(entries):
+                journal.record_results(entries)
+                if incremental:
+                    pending_writes.extend(e for e in entries if e["zipcode"])
+                    if len(pending_writes) >= INCREMENTAL_FLUSH_ROWS:
+                        flush_writes()
+
+            def show_progress(done, _, row_info):
+                done += len(resumed)
+                health = get_juso_health()
+                warning = ""
+                if health["breaker"] != "closed":
+                    warning = f" ⚠️ 주소 API 일시 차단 ({health['last_error']})"
+                elif health["throttled"]:
+                    warning = f" ⏬ 주소 API 속도 조절 중 ({health['rate']:.1f}건/초)"
+                status_text.text(f"처리 중... ({done}/{total}) - {row_info['address'][:40]}{warning}")
+                progress_bar.progress(done / total)
+
+            status_text.text(f"처리 중... ({len(resumed)}/{total})")
+            try:
+                new_results = process_rows(
+                    pending_rows,
+                    use_gemini=use_gemini,
+                    on_progress=show_progress,
+                    on_result=handle_result,
+                    metrics=metrics,
+                )
+            finally:
+                journal.flush()
+            if incremental:
+                flush_writes()
+            metrics.finish()
+
+            # 이어서 사용한 결과 + 새 결과를 원래 행 순서대로
+            by_row = {r["row_num"]: r for r in new_results}
+            by_row.update(resumed)
+            results = [by_row[r["row_num"]] for r in rows_to_process]
 
             # ── 결과 표시 ──
             status_text.text("결과 확인 중...")
@@ -295,13 +441,25 @@ if st.session_state.processing_done and st.session_state.results:
     col_s3.metric("실패", f"{fail_count}건")
     col_s4.metric("평균 정확도", f"{avg_accuracy:.0f}%")
 
+    # API 호출 실패로 조회하지 못한 행 (검색 결과 없음과 구분)
+    api_error_count = sum(1 for r in results if r["source"] == "api_error")
+    if api_error_count:
+        health = get_juso_health()
+        st.warning(
+            f"⚠️ 주소 API 오류로 {api_error_count}건을 조회하지 못했습니다 "
+            f"(차단기: {health['breaker']}, 사용 가능 키 {health['available_keys']}/{health['key_count']}개, "
+            f"제한 응답 {health['throttled']}회, "
+            f"마지막 오류: {health['last_error'] or '-'}). "
+            "다시 실행하면 이 행들만 다시 조회합니다."
+        )
+
     # 결과 테이블
     df_results = pd.DataFrame(
         [
             {
                 "행": r["row_num"],
                 "원본 주소": r["address"],
-                "우편번호": r["zipcode"] or "❌ 조회 실패",
+                "우편번호": r["zipcode"] or ("⚠️ API 오류" if r["source"] == "api_error" else "❌ 조회 실패"),
                 "매칭 주소": r["road_addr"],
                 "정확도": f"{r['accuracy']}%" if r["zipcode"] else "-",
                 "방식": r["source"],
@@ -320,11 +478,52 @@ if st.session_state.processing_done and st.session_state.results:
         },
     )
 
+    # 실행 요약 (단계별 시간 / API 호출 수)
+    metrics = st.session_state.run_metrics
+    if metrics is not None:
+        run_summary = metrics.summary()
+        per_row = run_summary["counters_per_row"]
+        with st.expander("⏱️ 실행 요약 (단계별 시간 / API 호출)"):
+            col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+            col_m1.metric("처리 속도", f"{run_summary['rows_per_sec']:.1f}행/초")
+            col_m2.metric(
+                "조회 지연 p50 / p95",
+                f"{run_summary['lookup_latency_ms']['p50']:.0f} / "
+                f"{run_summary['lookup_latency_ms']['p95']:.0f}ms",
+            )
+            col_m3.metric("주소 API 요청/행", f"{per_row.get('juso_requests', 0):.2f}")
+            col_m4.metric("Gemini 요청/행", f"{per_row.get('gemini_requests', 0):.2f}")
+
+            # 주소별 단계 시간은 worker 합계, 일괄 단계는 실제 경과 시간
+            timing = {f"조회: {k}": v for k, v in run_summary["stage_seconds"].items()}
+            timing.update({f"일괄: {k}": v for k, v in run_summary["phase_seconds"].items()})
+            if timing:
+                st.bar_chart(pd.Series(timing, name="초"))
+            st.caption(
+                f"캐시 적중: 주소 {run_summary['counters'].get('juso_cache_hits', 0)}건 · "
+                f"Gemini {run_summary['counters'].get('gemini_cache_hits', 0)}건 · "
+                f"로컬 인덱스 {run_summary['counters'].get('local_index_hits', 0)}건 · "
+                f"도로구간 {run_summary['counters'].get('road_index_hits', 0)}건 · "
+                f"확인된 주소 {run_summary['counters'].get('known_hits', 0)}건 / "
+                f"종료 단계: {run_summary['exit_stages']}"
+            )
+            st.download_button(
+                "📥 메트릭 내보내기 (JSON)",
+                data=json.dumps(run_summary, ensure_ascii=False, indent=2),
+                file_name="zip_auto_metrics.json",
+                mime="application/json",
+            )
+
     # 시트에 기록 버튼
     st.divider()
 
-    # 성공한 결과만 필터
-    writable_results = [r for r in results if r["zipcode"]]
+    # 성공한 결과 중 아직 시트에 기록되지 않은 것만 필터
+    written_rows = st.session_state.written_rows
+    writable_results = [
+        r for r in results if r["zipcode"] and r["row_num"] not in written_rows
+    ]
+    if written_rows:
+        st.caption(f"✏️ 처리 중 {len(written_rows)}건이 이미 시트에 기록되었습니다.")
 
     if writable_results:
         write_clicked = st.button(
@@ -353,12 +552,26 @@ if st.session_state.processing_done and st.session_state.results:
                         }
                         for r in writable_results
                     ]
-                    write_results(ws, write_data, zip_idx, acc_idx)
-                    st.success(f"✅ {len(writable_results)}건이 시트에 기록되었습니다!")
-                    st.balloons()
+                    if metrics is not None:
+                        with metrics.phase("sheet_write"):
+                            summary = write_results(ws, write_data, zip_idx, acc_idx)
+                    else:
+                        summary = write_results(ws, write_data, zip_idx, acc_idx)
+                    failed_rows = summary["failed_rows"]
+                    if failed_rows:
+                        st.warning(
+                            f"⚠️ {len(failed_rows)}개 행 기록 실패 (행: "
+                            f"{', '.join(map(str, failed_rows[:20]))}"
+                            f"{' ...' if len(failed_rows) > 20 else ''})"
+                        )
+                    else:
+                        JobJournal.for_worksheet(
+                            ws, headers.index(st.session_state.addr_col), zip_idx, acc_idx
+                        ).clear()
+                        st.success(f"✅ {len(writable_results)}건이 시트에 기록되었습니다!")
+                        st.balloons()
                     if st.button("🔄 재스캔", key="rescan_done"):
-                        st.session_state.processing_done = False
-                        st.session_state.results = []
+                        reset_scan()
                         st.rerun()
                 except Exception as e:
                     st.error(f"기록 실패: {e}")
@@ -381,6 +594,8 @@ with st.sidebar:
     ```toml
     GEMINI_API_KEY = "..."
     JUSO_API_KEY = "..."
+    # (선택) 추가 키: 쉼표로 구분
+    JUSO_API_KEYS = "...,..."
     ```
     """)
 
@@ -398,3 +613,28 @@ with st.sidebar:
     - **70~85%** : Gemini 보정 후 매칭
     - **50% 이하** : 불확실한 매칭
     """)
+
+    cache_stats = get_cache_stats()
+    gemini_cache = get_gemini_cache()
+    if cache_stats or gemini_cache is not None:
+        st.divider()
+        st.markdown("### 조회 캐시")
+    if cache_stats:
+        st.caption(
+            f"주소 API: 적중 {cache_stats['hits']}건 / 미적중 {cache_stats['misses']}건 "
+            f"(적중률 {cache_stats['hit_rate']:.0%}) · 저장 {cache_stats['entries']:,}건"
+        )
+    juso_health = get_juso_health()
+    if (juso_health["throttled"] or juso_health["breaker"] != "closed"
+            or juso_health["available_keys"] < juso_health["key_count"]):
+        st.caption(
+            f"주소 API 상태: {juso_health['breaker']} · 현재 {juso_health['rate']:.1f}건/초 "
+            f"· 제한 응답 {juso_health['throttled']}회 "
+            f"· 사용 가능 키 {juso_health['available_keys']}/{juso_health['key_count']}개"
+        )
+    if gemini_cache is not None:
+        gemini_stats = gemini_cache.stats()
+        st.caption(
+            f"Gemini: 적중 {gemini_stats['hits']}건 / 미적중 {gemini_stats['misses']}건 "
+            f"(적중률 {gemini_stats['hit_rate']:.0%}) · 저장 {gemini_stats['entries']:,}건"
+        )
@@ -0,0 +1,167 @@
+# ==========================================
+# [일괄 처리] 행 단위 우편번호 조회 병렬 실행
+# ==========================================
+# 여러 행의 recommend_zipcode를 worker pool에서 동시에 실행합니다.
+# API 호출 속도는 각 helper의 토큰 버킷이 제한하므로 고정 sleep이 필요 없습니다.
+# 같은 주소(정규화 키 기준)를 가진 행들은 한 번만 조회하여 모든 행에 결과를 복사합니다.
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+from address_parser import parse_address
+from config import MAX_WORKERS
+from gemini_helper import refine_addresses_with_gemini
+from stage_policy import new_adaptive_order, prefetch_gemini
+from tracing import RunMetrics
+from zipcode_helper import prepare_indexes, recommend_zipcode, resume_recommendation
+
+
+def _make_entry(row_info: dict, rec: dict) -> dict:
+    """recommend_zipcode 결과 → 행 결과 dict"""
+    return {
+        "row_num": row_info["row_num"],
+        "address": row_info["address"],
+        "zipcode": rec["zipcode"],
+        "road_addr": rec["road_addr"],
+        "accuracy": rec["accuracy"],
+        "source": rec["source"],
+        "trace": rec.get("trace"),
+    }
+
+
+def _recommend_safe(address: str, use_gemini: bool, gemini_result: dict,
+                    defer_gemini: bool = False, adaptive=None) -> dict:
+    """worker 예외가 전체 실행을 중단시키지 않도록 실패 결과로 변환"""
+    try:
+        return recommend_zipcode(
+            address,
+            use_gemini_fallback=use_gemini,
+            gemini_result=gemini_result,
+            defer_gemini=defer_gemini,
+            adaptive=adaptive,
+        )
+    except Exception:
+        return {"zipcode": "", "road_addr": "", "accuracy": 0, "source": "error"}
+
+
+def _resume_safe(address: str, partial: dict, gemini_result: dict) -> dict:
+    """Gemini 일괄 정제 후 남은 단계 실행 (예외 시 앞 단계 결과 유지)"""
+    try:
+        return resume_recommendation(address, partial, gemini_result)
+    except Exception:
+        partial = dict(partial)
+        partial.pop("pending_stages", None)
+        return partial
+
+
+def group_rows_by_address(rows: list) -> dict:
+    """
+    행들을 정규화 주소 키로 묶습니다.
+
+    Returns:
+        dict: {주소 키: [rows 내 위치, ...]} (처음 등장한 순서 유지)
+    """
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(parse_address(row["address"]).key, []).append(i)
+    return groups
+
+
+def process_rows(rows: list, use_gemini: bool = True, max_workers: int = None,
+                 on_progress=None, on_result=None, metrics: RunMetrics = None) -> list:
+    """
+    여러 행의 우편번호를 병렬로 조회합니다.
+    같은 주소 키를 가진 행은 대표 행 하나만 조회하고 결과를 나머지 행에 복사합니다.
+    cheap_first/adaptive 정책에서는 앞 단계로 충분하지 않은 주소만 모아 Gemini로 일괄 정제합니다.
+
+    Args:
+        rows: [{row_num, address}, ...]
+        use_gemini: Gemini AI 사용 여부
+        max_workers: 동시 실행 worker 수 (None이면 MAX_WORKERS)
+        on_progress: 주소 그룹 완료 시 호출되는 콜백 (완료 행 수, 전체 행 수, 대표 row_info)
+                     호출한 스레드에서 실행되므로 Streamlit UI 갱신에 사용 가능
+        on_result: 주소 그룹 완료 시 해당 행 결과 리스트로 호출되는 콜백
+                   (체크포인트 기록/중간 시트 기록용, 호출한 스레드에서 실행)
+        metrics: 주소별 추적 정보와 Gemini 일괄 정제 시간을 모을 RunMetrics (선택)
+
+    Returns:
+        list[dict]: 입력 순서대로 [{row_num, address, zipcode, road_addr, accuracy, source, trace}, ...]
+    """
+    if max_workers is None:
+        max_workers = MAX_WORKERS
+
+    total = len(rows)
+    if total == 0:
+        return []
+
+    # 조회 캐시 → 로컬/도로구간 인덱스 적재 (프로세스당 한 번, worker 시작 전)
+    phase = metrics.phase("index_load") if metrics is not None else nullcontext()
+    with phase:
+        prepare_indexes()
+
+    groups = list(group_rows_by_address(rows).values())
+    representatives = [rows[members[0]] for members in groups]
+
+    # gemini_first: 모든 대표 주소를 먼저 Gemini로 일괄 정제 (여러 주소를 한 요청으로 묶어 호출 횟수 절감)
+    # 그 외: 앞 단계로 충분하지 않은 주소만 모아서 나중에 일괄 정제 (defer_gemini)
+    prefetch = use_gemini and prefetch_gemini()
+    defer = use_gemini and not prefetch
+    gemini_results = [None] * len(groups)
+    if prefetch:
+        phase = metrics.phase("gemini_prefetch") if metrics is not None else nullcontext()
+        with phase:
+            gemini_results = refine_addresses_with_gemini(
+                [r["address"] for r in representatives], max_workers=max_workers
+            )
+
+    # adaptive 정책의 정규식 성공률은 이번 실행 안에서만 집계
+    adaptive = new_adaptive_order()
+    results = [None] * total
+    done = 0
+
+    def finish(g, rec):
+        nonlocal done
+        entries = [_make_entry(rows[i], rec) for i in groups[g]]
+        if metrics is not None:
+            metrics.add_row_trace(rec.get("trace"), rows=len(groups[g]), source=rec["source"])
+        for i, entry in zip(groups[g], entries):
+            results[i] = entry
+        if on_result:
+            on_result(entries)
+        done += len(groups[g])
+        if on_progress:
+            on_progress(done, total, representatives[g])
+
+    # 행 worker에서 current_run()으로 RunMetrics를 찾을 수 있도록 (버린 동시 실행 단계 집계용)
+    recommend = metrics.wrap(_recommend_safe) if metrics is not None else _recommend_safe
+    resume = metrics.wrap(_resume_safe) if metrics is not None else _resume_safe
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(recommend, r["address"], use_gemini, gemini_results[g], defer, adaptive): g
+            for g, r in enumerate(representatives)
+        }
+        deferred = {}  # g → Gemini 정제를 기다리는 중간 결과
+        for future in as_completed(futures):
+            g = futures[future]
+            rec = future.result()
+            if rec.get("pending_stages"):
+                deferred[g] = rec
+            else:
+                finish(g, rec)
+
+        if deferred:
+            pending = list(deferred)
+            phase = metrics.phase("gemini_batch") if metrics is not None else nullcontext()
+            with phase:
+                refined = refine_addresses_with_gemini(
+                    [representatives[g]["address"] for g in pending], max_workers=max_workers
+                )
+            futures = {
+                executor.submit(resume, representatives[g]["address"], deferred[g], gemini): g
+                for g, gemini in zip(pending, refined)
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+
+    return results
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+전체 파이프라인 벤치마크 (로컬 stub 서버, API 할당량 사용 없음)
+
+도로명주소 API(addrLinkApi.do)와 Gemini generateContent를 흉내 내는 로컬 HTTP 서버를 띄우고,
+정답(우편번호)이 붙은 합성 주소 코퍼스를 batch_runner.process_rows로 처리합니다.
+  - 처리량 (행/초)
+  - 고유 주소당 조회 지연 p50 / p95
+  - 행당 API 호출 수 (Juso / Gemini, 오류 응답 포함) 및 Gemini로 정제 요청한 주소 수
+  - 정답 우편번호 일치율 / 조회 성공률
+
+stub 서버는 응답 지연, 5xx 오류율, 할당량 초과(429) 비율, 키별 초당 할당량을 설정할 수 있습니다.
+--keys N이면 API마다 키 N개로 키 풀을 구성합니다 (키별 할당량과 함께 키 수에 따른 처리량 비교).
+캐시는 임시 디렉토리를 사용하므로 실제 캐시에 영향을 주지 않으며,
+--runs 2 이상이면 두 번째 실행부터 캐시가 채워진 상태(warm)로 측정합니다.
+
+사용법:
+    python benchmarks/bench_pipeline.py --rows 2000
+    python benchmarks/bench_pipeline.py --rows 5000 --juso-latency 80 --juso-error-rate 0.02 --runs 2
+    python benchmarks/bench_pipeline.py --no-gemini --workers 16 --juso-rate 0 --json result.json
+    python benchmarks/bench_pipeline.py --policy gemini_first --gemini-rate 0 --juso-rate 0
+    python benchmarks/bench_pipeline.py --keys 3 --juso-rate 0 --juso-key-quota 10
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+SIDO = {
+    "서울특별시": ("서울", ["강남구", "서초구", "마포구", "종로구", "송파구"]),
+    "부산광역시": ("부산", ["해운대구", "수영구", "부산진구"]),
+    "대구광역시": ("대구", ["수성구", "달서구"]),
+    "인천광역시": ("인천", ["연수구", "남동구"]),
+    "경기도": ("경기", ["성남시 분당구", "수원시 영통구", "고양시 일산동구"]),
+}
+ROADS = [
+    "테헤란로", "강남대로", "반포대로", "잠원로", "월드컵북로", "세종대로", "해운대해변로",
+    "달구벌대로", "컨벤시아대로", "판교역로", "광교중앙로", "도산대로", "양재천로", "올림픽로",
+]
+DONGS = ["역삼동", "서초동", "합정동", "청운동", "잠실동", "우동", "범어동", "송도동", "정자동", "원천동"]
+DETAILS = ["", " 101동 1203호", " 3층", " 2층 201호", " B동 305호", " 지하1층", " (역삼동)"]
+TYPOS = {"테헤란로": "태헤란로", "강남대로": "강남대루", "반포대로": "반포데로", "세종대로": "새종대로"}
+
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+# ──────────────────────────────────────────
+# 합성 주소DB / 정답 코퍼스
+# ──────────────────────────────────────────
+
+def build_address_db(size: int, rng: random.Random) -> list:
+    """도로명주소 API juso dict 형식의 합성 주소 목록"""
+    db, seen = [], set()
+    while len(db) < size:
+        si_nm = rng.choice(list(SIDO))
+        sgg_nm = rng.choice(SIDO[si_nm][1])
+        rn = rng.choice(ROADS)
+        main_no = rng.randint(1, 400)
+        sub_no = rng.choice([0, 0, 0, rng.randint(1, 30)])
+        if (si_nm, sgg_nm, rn, main_no, sub_no) in seen:
+            continue
+        seen.add((si_nm, sgg_nm, rn, main_no, sub_no))
+
+        emd_nm = rng.choice(DONGS)
+        lot_main, lot_sub = rng.randint(1, 900), rng.choice([0, rng.randint(1, 60)])
+        building_no = f"{main_no}-{sub_no}" if sub_no else str(main_no)
+        lot = f"{lot_main}-{lot_sub}" if lot_sub else str(lot_main)
+        road_part1 = f"{si_nm} {sgg_nm} {rn} {building_no}"
+        db.append({
+            "roadAddr": f"{road_part1} ({emd_nm})",
+            "roadAddrPart1": road_part1,
+            "roadAddrPart2": f"({emd_nm})",
+            "jibunAddr": f"{si_nm} {sgg_nm} {emd_nm} {lot}",
+            "zipNo": f"{rng.randint(1000, 63999):05d}",
+            "siNm": si_nm, "sggNm": sgg_nm, "emdNm": emd_nm, "liNm": "", "rn": rn,
+            "buldMnnm": str(main_no), "buldSlno": str(sub_no),
+            "lnbrMnnm": str(lot_main), "lnbrSlno": str(lot_sub), "mtYn": "0", "udrtYn": "0",
+            "bdNm": "", "bdKdcd": "0", "bdMgtSn": f"{len(db):025d}",
+        })
+    return db
+
+
+def _variant(juso: dict, kind: str, rng: random.Random) -> str:
+    """정답 주소로부터 사용자 입력 형태의 주소 생성"""
+    detail = rng.choice(DETAILS)
+    building_no = juso["roadAddrPart1"].rsplit(" ", 1)[1]
+    if kind == "abbrev":
+        return f"{SIDO[juso['siNm']][0]} {juso['sggNm']} {juso['rn']} {building_no}{detail}"
+    if kind == "no_sido":
+        return f"{juso['sggNm']} {juso['rn']}{building_no}{detail}"
+    if kind == "jibun":
+        return juso["jibunAddr"] + detail
+    if kind == "typo":
+        road = TYPOS.get(juso["rn"], juso["rn"][:-1] + "루")
+        return f"{juso['siNm']} {juso['sggNm']} {road} {building_no}{detail}"
+    return juso["roadAddrPart1"] + detail
+
+
+def build_corpus(db: list, rows: int, dup_ratio: float, rng: random.Random) -> list:
+    """[{address, zipcode, road_addr, kind}, ...] (dup_ratio 비율은 앞선 행의 주소 반복)"""
+    kinds = ["clean"] * 5 + ["abbrev"] * 2 + ["no_sido", "jibun", "typo"]
+    corpus = []
+    for _ in range(rows):
+        if corpus and rng.random() < dup_ratio:
+            corpus.append(dict(rng.choice(corpus)))
+            continue
+        juso = rng.choice(db)
+        kind = rng.choice(kinds)
+        corpus.append({
+            "address": _variant(juso, kind, rng),
+            "zipcode": juso["zipNo"],
+            "road_addr": juso["roadAddrPart1"],
+            "kind": kind,
+        })
+    return corpus
+
+
+# ──────────────────────────────────────────
+# stub 서버
+# ──────────────────────────────────────────
+
+class StubConfig:
+    def __init__(self, latency_ms: float, error_rate: float, quota_rate: float, seed: int,
+                 key_quota: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.quota_rate = quota_rate
+        self.key_quota = key_quota      # 키 1개의 초당 허용 요청 수 (0: 무제한)
+        self.calls = 0
+        self.items = 0      # Gemini: 정제 요청된 주소 수 (일괄 요청은 항목 수만큼)
+        self._rng = random.Random(seed)
+        self._key_windows = {}          # 키 → 최근 1초 요청 시각
+        self._lock = threading.Lock()
+
+    def _over_key_quota(self, key: str) -> bool:
+        now = time.monotonic()
+        window = self._key_windows.setdefault(key, [])
+        window[:] = [t for t in window if now - t < 1.0]
+        if len(window) >= self.key_quota:
+            return True
+        window.append(now)
+        return False
+
+    def draw(self, key: str = None) -> tuple:
+        """(지연 초, 'error' | 'quota' | None)"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * self._rng.uniform(0.5, 1.5)
+            r = self._rng.random()
+            over_quota = self.key_quota > 0 and self._over_key_quota(key)
+        if over_quota or r < self.quota_rate:
+            return delay, "quota"
+        if r < self.quota_rate + self.error_rate:
+            return delay, "error"
+        return delay, None
+
+
+class JusoIndex:
+    """stub 검색: 모든 키워드 토큰이 주소 토큰과 일치(숫자) 또는 접두 일치(문자)하는 항목"""
+
+    def __init__(self, db: list):
+        self.db = db
+        self.postings = {}
+        for i, juso in enumerate(db):
+            text = f"{juso['roadAddr']} {juso['jibunAddr']} {SIDO[juso['siNm']][0]}"
+            for token in set(_TOKEN_PATTERN.findall(text)):
+                self.postings.setdefault(token, set()).add(i)
+        self.text_tokens = [t for t in self.postings if not t.isdigit()]
+
+    def _ids(self, token: str) -> set:
+        if token.isdigit():
+            return self.postings.get(token, set())
+        ids = set()
+        for t in self.text_tokens:
+            if t.startswith(token):
+                ids |= self.postings[t]
+        return ids
+
+    def search(self, keyword: str) -> list:
+        ids = None
+        for token in _TOKEN_PATTERN.findall(keyword):
+            ids = self._ids(token) if ids is None else ids & self._ids(token)
+            if not ids:
+                return []
+        return [self.db[i] for i in sorted(ids or ())]
+
+
+def _juso_handler(index: JusoIndex, stub: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            delay, fault = stub.draw(params.get("confmKey", [""])[0])
+            time.sleep(delay)
+            if fault == "quota":
+                return self._send(429, {"error": "too many requests"})
+            if fault == "error":
+                return self._send(500, {"error": "internal error"})
+
+            keyword = params.get("keyword", [""])[0]
+            per_page = int(params.get("countPerPage", ["10"])[0])
+            if not keyword.strip():
+                common = {"errorCode": "E0005", "errorMessage": "검색어가 입력되지 않았습니다.", "totalCount": "0"}
+                return self._send(200, {"results": {"common": common, "juso": None}})
+
+            found = index.search(keyword)
+            common = {"errorCode": "0", "errorMessage": "정상", "totalCount": str(len(found))}
+            self._send(200, {"results": {"common": common, "juso": found[:per_page]}})
+
+    return Handler
+
+
+def _gemini_handler(corrections: dict, stub: StubConfig, accuracy: float, seed: int):
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    def refine(address: str) -> dict:
+        """정답을 아는 주소는 accuracy 확률로 정답, 나머지는 입력 그대로"""
+        with rng_lock:
+            correct = rng.random() < accuracy
+        truth = corrections.get(address)
+        if truth and correct:
+            return {"refined_address": truth, "search_keyword": truth, "changes": "보정", "confidence": 0.9}
+        return {"refined_address": address, "search_keyword": address, "changes": "", "confidence": 0.5}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            delay, fault = stub.draw(parse_qs(urlparse(self.path).query).get("key", [""])[0])
+            time.sleep(delay)
+            if fault == "quota":
+                return self._send(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}})
+            if fault == "error":
+                return self._send(500, {"error": {"code": 500, "status": "INTERNAL"}})
+
+            parts = body["contents"][0]["parts"]
+            if len(parts) >= 3:
+                # 일괄 정제: [{"index", "address"}, ...]
+                items = json.loads(parts[-1]["text"])
+                stub.items += len(items)
+                out = [{"index": item["index"], **refine(item["address"])} for item in items]
+            else:
+                stub.items += 1
+                out = refine(parts[-1]["text"].split(": ", 1)[-1])
+            text = json.dumps(out, ensure_ascii=False)
+            self._send(200, {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+    return Handler
+
+
+def start_server(handler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ──────────────────────────────────────────
+# 측정
+# ──────────────────────────────────────────
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_once(corpus: list, args, juso_stub: StubConfig, gemini_stub: StubConfig) -> dict:
+    import batch_runner
+    from tracing import RunMetrics
+    from zipcode_helper import get_juso_health
+
+    rows = [{"row_num": i + 2, "address": c["address"]} for i, c in enumerate(corpus)]
+    juso_before, gemini_before = juso_stub.calls, gemini_stub.calls
+    items_before = gemini_stub.items
+
+    metrics = RunMetrics()
+    started = time.perf_counter()
+    results = batch_runner.process_rows(rows, use_gemini=not args.no_gemini, max_workers=args.workers,
+                                        metrics=metrics)
+    elapsed = time.perf_counter() - started
+    metrics.finish()
+    counters = metrics.summary()["counters"]
+
+    # 고유 주소당 조회 지연 (같은 주소 그룹의 행은 같은 trace 공유)
+    traces = {id(r["trace"]): r["trace"] for r in results if r.get("trace")}
+    latencies = [t["total_ms"] / 1000 for t in traces.values()]
+
+    found = sum(1 for r in results if r["zipcode"])
+    correct = sum(1 for r, c in zip(results, corpus) if r["zipcode"] == c["zipcode"])
+    by_kind = {}
+    for r, c in zip(results, corpus):
+        stats = by_kind.setdefault(c["kind"], [0, 0])
+        stats[0] += 1
+        stats[1] += r["zipcode"] == c["zipcode"]
+
+    n = len(corpus)
+    health = get_juso_health()
+    return {
+        "rows": n,
+        "unique_lookups": len(latencies),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(n / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "latency_p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "latency_mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        "juso_calls_per_row": round((juso_stub.calls - juso_before) / n, 3),
+        # 추적(RunMetrics)으로 센 호출 수: stub 서버 기준 값과 같아야 함 (버린 동시 실행 단계 포함)
+        "traced_juso_calls_per_row": round(counters.get("juso_requests", 0) / n, 3),
+        "gemini_calls_per_row": round((gemini_stub.calls - gemini_before) / n, 3),
+        "gemini_addresses_per_row": round((gemini_stub.items - items_before) / n, 3),
+        "found_rate": round(found / n, 4),
+        "accuracy": round(correct / n, 4),
+        "accuracy_by_kind": {k: round(v[1] / v[0], 4) for k, v in sorted(by_kind.items())},
+        # 키 풀 상태 (실행 간 누적)
+        "juso_key_requests": [k["requests"] for k in health["keys"]],
+        "juso_throttled": health["throttled"],
+    }
+
+
+def _print_report(label: str, r: dict):
+    print(f"\n[{label}] {r['rows']}행 (고유 조회 {r['unique_lookups']}건) / {r['seconds']:.2f}초")
+    print(f"  처리량          {r['rows_per_sec']:>10.1f} 행/초")
+    print(f"  조회 지연 p50   {r['latency_p50_ms']:>10.1f} ms")
+    print(f"  조회 지연 p95   {r['latency_p95_ms']:>10.1f} ms")
+    print(f"  Juso 호출/행    {r['juso_calls_per_row']:>10.3f}  (추적 {r['traced_juso_calls_per_row']:.3f})")
+    print(f"  Gemini 호출/행  {r['gemini_calls_per_row']:>10.3f}")
+    print(f"  Gemini 주소/행  {r['gemini_addresses_per_row']:>10.3f}")
+    print(f"  조회 성공률     {r['found_rate']:>10.1%}")
+    print(f"  정답 일치율     {r['accuracy']:>10.1%}")
+    print("  유형별 정답률   " + ", ".join(f"{k} {v:.0%}" for k, v in r["accuracy_by_kind"].items()))
+    print(f"  Juso 키별 호출  {r['juso_key_requests']} (제한 응답 {r['juso_throttled']}회, 누적)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 벤치마크 (로컬 stub 서버)")
+    parser.add_argument("--rows", type=int, default=1000, help="코퍼스 행 수")
+    parser.add_argument("--db-size", type=int, default=3000, help="stub 주소DB 크기")
+    parser.add_argument("--dup-ratio", type=float, default=0.2, help="중복 주소 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None, help="worker 수 (기본: MAX_WORKERS)")
+    parser.add_argument("--no-gemini", action="store_true", help="Gemini 사용 안 함")
+    parser.add_argument("--policy", choices=["gemini_first", "cheap_first", "adaptive"],
+                        help="단계 순서 정책 (기본: config.STAGE_ORDER_POLICY)")
+    parser.add_argument("--speculative", action="store_true", help="앞쪽 독립 단계 동시 실행")
+    parser.add_argument("--runs", type=int, default=1, help="반복 실행 횟수 (2회차부터 warm cache)")
+    parser.add_argument("--no-cache", action="store_true", help="조회/Gemini 캐시 비활성화")
+    parser.add_argument("--no-road-index", action="store_true", help="도로구간 인덱스 비활성화")
+    parser.add_argument("--juso-rate", type=float, default=None,
+                        help="Juso 초당 요청 제한 (기본: config.JUSO_RATE_LIMIT, 0: 제한 없음)")
+    parser.add_argument("--gemini-rate", type=float, default=None,
+                        help="Gemini 초당 요청 제한 (기본: config.GEMINI_RATE_LIMIT, 0: 제한 없음)")
+    parser.add_argument("--juso-latency", type=float, default=30.0, help="Juso stub 평균 지연 (ms)")
+    parser.add_argument("--juso-error-rate", type=float, default=0.0, help="Juso stub 5xx 비율")
+    parser.add_argument("--juso-quota-rate", type=float, default=0.0, help="Juso stub 429 비율")
+    parser.add_argument("--juso-key-quota", type=float, default=0.0,
+                        help="Juso stub 키별 초당 허용 요청 수 (초과 시 429, 0: 무제한)")
+    parser.add_argument("--gemini-latency", type=float, default=300.0, help="Gemini stub 평균 지연 (ms)")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="Gemini stub 5xx 비율")
+    parser.add_argument("--gemini-quota-rate", type=float, default=0.0, help="Gemini stub 429 비율")
+    parser.add_argument("--gemini-key-quota", type=float, default=0.0,
+                        help="Gemini stub 키별 초당 허용 요청 수 (초과 시 429, 0: 무제한)")
+    parser.add_argument("--keys", type=int, default=1, help="API별 키 풀 크기")
+    parser.add_argument("--gemini-accuracy", type=float, default=0.9, help="Gemini stub 정답 보정 확률")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    db = build_address_db(args.db_size, rng)
+    corpus = build_corpus(db, args.rows, args.dup_ratio, rng)
+    corrections = {c["address"]: c["road_addr"] for c in corpus}
+
+    juso_stub = StubConfig(args.juso_latency, args.juso_error_rate, args.juso_quota_rate, args.seed,
+                           key_quota=args.juso_key_quota)
+    gemini_stub = StubConfig(args.gemini_latency, args.gemini_error_rate, args.gemini_quota_rate,
+                             args.seed + 1, key_quota=args.gemini_key_quota)
+    juso_server = start_server(_juso_handler(JusoIndex(db), juso_stub))
+    gemini_server = start_server(_gemini_handler(corrections, gemini_stub, args.gemini_accuracy, args.seed))
+
+    # 모듈 import 전에 stub 주소 / 격리된 캐시 디렉토리 지정
+    cache_dir = tempfile.mkdtemp(prefix="zip_auto_bench_")
+    os.environ["JUSO_API_URL"] = f"http://127.0.0.1:{juso_server.server_port}/addrlink/addrLinkApi.do"
+    os.environ["GEMINI_API_URL"] = (
+        f"http://127.0.0.1:{gemini_server.server_port}/v1beta/models/stub:generateContent"
+    )
+    os.environ["ZIP_AUTO_CACHE_DIR"] = cache_dir
+    os.environ.setdefault("JUSO_API_KEY", "bench")
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+    # 키 풀은 helper 모듈 import 시 만들어지므로 그 전에 키 목록 교체
+    import config
+    config.JUSO_API_KEYS = [f"bench-juso-{i}" for i in range(max(1, args.keys))]
+    config.GEMINI_API_KEYS = [f"bench-gemini-{i}" for i in range(max(1, args.keys))]
+
+    import gemini_helper
+    import zipcode_helper
+    import stage_policy
+    if args.policy:
+        stage_policy.STAGE_ORDER_POLICY = args.policy
+    if args.speculative:
+        zipcode_helper.SPECULATIVE_STAGES = True
+    if args.no_cache:
+        zipcode_helper.LOOKUP_CACHE_ENABLED = False
+        gemini_helper.GEMINI_CACHE_ENABLED = False
+    if args.no_road_index:
+        zipcode_helper.ROAD_INDEX_ENABLED = False
+    if args.juso_rate is not None:
+        zipcode_helper._juso_keys.set_rate(args.juso_rate)
+    if args.gemini_rate is not None:
+        gemini_helper._gemini_keys.set_rate(args.gemini_rate)
+
+    print(f"코퍼스 {len(corpus)}행 / 주소DB {len(db)}건 / 캐시 {cache_dir}")
+    reports = []
+    try:
+        for i in range(args.runs):
+            report = run_once(corpus, args, juso_stub, gemini_stub)
+            reports.append(report)
+            _print_report("cold" if i == 0 else f"warm #{i}", report)
+    finally:
+        juso_server.shutdown()
+        gemini_server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "runs": reports}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+후보 점수 계산 벤치마크
+
+기존 SequenceMatcher 기반 _find_best_match와 address_scoring.score_candidates를
+같은 (입력 주소, 후보 10건) 세트로 비교합니다.
+  - 쿼리당 처리 시간
+  - 1순위 후보 일치율 / 정답 후보 적중률 (정답: 입력 주소를 만든 원본 후보)
+
+사용법:
+    python benchmarks/bench_scoring.py --queries 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from address_scoring import score_candidates  # noqa: E402
+
+SIDO_SGG = [
+    ("서울특별시", "강남구"), ("서울특별시", "서초구"), ("서울특별시", "마포구"),
+    ("서울특별시", "종로구"), ("부산광역시", "해운대구"), ("대구광역시", "수성구"),
+    ("인천광역시", "연수구"), ("경기도", "성남시 분당구"), ("경기도", "수원시 영통구"),
+]
+ROADS = [
+    "테헤란로", "강남대로", "반포대로", "잠원로", "월드컵북로", "세종대로", "해운대해변로",
+    "달구벌대로", "컨벤시아대로", "판교역로", "광교중앙로", "도산대로", "양재천로",
+]
+DETAILS = ["", " 101동 1203호", " 3층", " 2층 201호", " B동 305호", " 지하1층", " 12-3호"]
+
+
+def legacy_find_best_match(search_results, full_input, base_address):
+    """기존 구현 (후보마다 SequenceMatcher, 루프 안에서 split)"""
+    best_match = None
+    best_similarity = 0.0
+    for item in search_results:
+        road_addr = item["roadAddr"]
+        similarity = SequenceMatcher(None, full_input.lower(), road_addr.lower()).ratio()
+        keywords = base_address.split()
+        keyword_bonus = sum(0.1 for kw in keywords if kw in road_addr)
+        similarity = min(1.0, similarity + keyword_bonus)
+        if similarity > best_similarity:
+            best_similarity = similarity
+            best_match = item
+    return best_match, best_similarity
+
+
+def vectorized_find_best_match(search_results, full_input, base_address):
+    scores = score_candidates(full_input, base_address, [item["roadAddr"] for item in search_results])
+    best = int(scores.argmax())
+    if scores[best] <= 0:
+        return None, 0.0
+    return search_results[best], float(scores[best])
+
+
+def _random_address(rng):
+    sido, sgg = rng.choice(SIDO_SGG)
+    road = rng.choice(ROADS)
+    main_no = rng.randint(1, 400)
+    sub_no = rng.choice([0, 0, 0, rng.randint(1, 30)])
+    number = f"{main_no}-{sub_no}" if sub_no else str(main_no)
+    return f"{sido} {sgg} {road} {number}", (sgg, road, number)
+
+
+def _noisy_input(rng, parts):
+    """사용자 입력처럼 시도 생략/오타/상세주소 추가"""
+    sgg, road, number = parts
+    if rng.random() < 0.3 and len(road) > 2:
+        i = rng.randrange(len(road) - 1)
+        road = road[:i] + rng.choice("가나다라마바사") + road[i + 1:]
+    prefix = rng.choice(["", "서울 ", "서울시 "])
+    return f"{prefix}{sgg} {road} {number}{rng.choice(DETAILS)}", f"{sgg} {road} {number}"
+
+
+def build_workload(n_queries, n_candidates, seed):
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(n_queries):
+        truth, parts = _random_address(rng)
+        candidates = [{"roadAddr": truth}]
+        # 같은 도로의 다른 번지 + 다른 도로 주소로 후보 채우기
+        while len(candidates) < n_candidates:
+            other, _ = _random_address(rng)
+            if rng.random() < 0.6:
+                other = truth.rsplit(" ", 1)[0] + f" {rng.randint(1, 400)}"
+            if other != truth:
+                candidates.append({"roadAddr": other})
+        rng.shuffle(candidates)
+        full_input, base_address = _noisy_input(rng, parts)
+        workload.append((full_input, base_address, candidates, truth))
+    return workload
+
+
+def run(name, func, workload):
+    start = time.perf_counter()
+    picks = [func(cands, full_input, base)[0] for full_input, base, cands, _ in workload]
+    elapsed = time.perf_counter() - start
+    correct = sum(1 for pick, (_, _, _, truth) in zip(picks, workload) if pick and pick["roadAddr"] == truth)
+    print(f"{name:<12} {elapsed * 1e6 / len(workload):8.1f} µs/query   정답 적중 {correct / len(workload):6.1%}")
+    return picks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="후보 점수 계산 벤치마크")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    workload = build_workload(args.queries, args.candidates, args.seed)
+    print(f"쿼리 {args.queries:,}건 × 후보 {args.candidates}건")
+
+    legacy = run("legacy", legacy_find_best_match, workload)
+    fast = run("vectorized", vectorized_find_best_match, workload)
+
+    agree = sum(1 for a, b in zip(legacy, fast) if (a and a["roadAddr"]) == (b and b["roadAddr"]))
+    print(f"1순위 일치율 {agree / len(workload):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# ==========================================
+# [CLI] 브라우저 없이 우편번호 일괄 입력
+# ==========================================
+# Streamlit UI와 같은 처리(빈 행 스캔 → 병렬 조회 → 시트 기록)를 명령행에서 실행합니다.
+# cron 등에서 여러 시트를 야간 일괄 처리할 때 사용합니다.
+# API 키는 ~/.secrets/ 또는 환경 변수(JUSO_API_KEY, GEMINI_API_KEY,
+# GOOGLE_APPLICATION_CREDENTIALS, 추가 키 JUSO_API_KEYS / GEMINI_API_KEYS)에서 읽습니다.
+#
+# 사용법:
+#   python cli.py sheet "https://docs.google.com/..." --address-col 주소 --zip-col 우편번호
+#   python cli.py sheet URL1 URL2 --address-col 주소 --zip-col 우편번호 --acc-col 정확도 --no-gemini
+#   python cli.py file addresses.csv -o result.csv --address-col 주소
+#   python cli.py sheet URL --address-col 주소 --zip-col 우편번호 --metrics-out metrics.json
+#
+# 종료 코드:
+#   0 정상 / 1 실행 오류 / 2 인자·설정 오류 / 3 일부 행 기록 실패 / 4 주소 API 오류로 조회하지 못한 행 있음
+
+import argparse
+import json
+import sys
+import time
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+EXIT_API_ERROR = 4  # 주소 API 오류(차단/인증/제한)로 조회하지 못한 행이 있음
+
+
+class UsageError(Exception):
+    """잘못된 인자/시트 구성 (종료 코드 2)"""
+
+
+def _log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def _progress_printer(label: str, offset: int = 0):
+    """process_rows on_progress 콜백 (stderr에 진행률 출력)"""
+    started = time.monotonic()
+
+    def show(done, total, _row_info):
+        done += offset
+        total += offset
+        elapsed = time.monotonic() - started
+        rate = (done - offset) / elapsed if elapsed > 0 else 0.0
+        end = "\n" if done == total else ""
+        print(f"\r{label} {done}/{total} ({rate:.1f}행/초)", end=end, file=sys.stderr, flush=True)
+
+    return show
+
+
+def _resolve_column(headers: list, name: str, label: str, required: bool = True) -> int:
+    from sheets_handler import get_column_index
+
+    if not name:
+        return -1
+    idx = get_column_index(headers, name)
+    if idx < 0 and required:
+        raise UsageError(f"{label} column '{name}'을(를) 헤더에서 찾을 수 없습니다: {headers}")
+    return idx
+
+
+def run_sheet(url: str, args, metrics) -> int:
+    """시트 하나 처리 후 종료 코드 반환"""
+    from batch_runner import process_rows
+    from job_journal import JobJournal
+    from config import WARM_START_ENABLED, WARM_START_MIN_ACCURACY
+    from sheets_handler import (
+        connect_sheet,
+        find_empty_zipcode_rows,
+        find_known_zipcode_pairs,
+        read_columns,
+        read_sheet_preview,
+        write_results,
+    )
+
+    ws, _ = connect_sheet(url, args.worksheet)
+    label = f"[{ws.spreadsheet.title} / {ws.title}]"
+
+    preview = read_sheet_preview(ws, 1)
+    headers = preview[0] if preview else []
+    addr_idx = _resolve_column(headers, args.address_col, "주소")
+    zip_idx = _resolve_column(headers, args.zip_col, "우편번호")
+    acc_idx = _resolve_column(headers, args.acc_col, "정확도")
+
+    with metrics.phase("sheet_read"):
+        columns = [addr_idx, zip_idx] + ([acc_idx] if acc_idx >= 0 else [])
+        column_data = list(read_columns(ws, columns))
+        rows_to_process = find_empty_zipcode_rows(column_data, 0, 1)
+
+    # warm start: 이미 채워진 행을 확인된 주소로 적재 (여러 시트를 처리하면 다음 시트에도 사용)
+    if WARM_START_ENABLED and not args.no_warm_start:
+        from zipcode_helper import warm_start
+
+        pairs = find_known_zipcode_pairs(
+            column_data, 0, 1, 2 if acc_idx >= 0 else -1, WARM_START_MIN_ACCURACY
+        )
+        if pairs:
+            with metrics.phase("warm_start"):
+                warm = warm_start(pairs)
+            _log(
+                f"{label} 확인된 주소 {warm['added']}건 적재 "
+                f"(기존 우편번호 {warm['pairs']}행, 우편번호 불일치 {warm['conflicts']}건, "
+                f"지역·번지 없음 {warm['skipped']}건 제외)"
+            )
+
+    if not rows_to_process:
+        _log(f"{label} 우편번호가 비어있는 행이 없습니다.")
+        return EXIT_OK
+
+    # 이전 실행 체크포인트 (같은 행·같은 주소의 성공 결과만 이어서 사용)
+    journal = JobJournal.for_worksheet(ws, addr_idx, zip_idx, acc_idx)
+    if args.no_resume:
+        journal.clear()
+    journal_results, written = journal.load()
+    resumed = {
+        r["row_num"]: journal_results[r["row_num"]]
+        for r in rows_to_process
+        if r["row_num"] in journal_results
+        and journal_results[r["row_num"]]["address"] == r["address"]
+        and journal_results[r["row_num"]]["zipcode"]
+    }
+    pending_rows = [r for r in rows_to_process if r["row_num"] not in resumed]
+    metrics.resumed = len(resumed)
+
+    _log(f"{label} 대상 {len(rows_to_process)}행 (이어하기 {len(resumed)}행)")
+    try:
+        new_results = process_rows(
+            pending_rows,
+            use_gemini=not args.no_gemini,
+            max_workers=args.workers,
+            on_progress=_progress_printer(label, len(resumed)),
+            on_result=journal.record_results,
+            metrics=metrics,
+        )
+    finally:
+        journal.flush()
+    metrics.finish()
+    results = sorted([*resumed.values(), *new_results], key=lambda r: r["row_num"])
+
+    writable = [
+        r for r in results
+        if r["zipcode"] and r["accuracy"] >= args.min_accuracy and r["row_num"] not in written
+    ]
+    found = sum(1 for r in results if r["zipcode"])
+    api_errors = sum(1 for r in results if r["source"] == "api_error")
+
+    failed_rows = []
+    if args.dry_run:
+        for r in writable:
+            print(f"{r['row_num']}\t{r['zipcode']}\t{r['accuracy']}%\t{r['address']}")
+    elif writable:
+        with metrics.phase("sheet_write"):
+            summary = write_results(ws, writable, zip_idx, acc_idx)
+        failed_rows = summary["failed_rows"]
+        journal.mark_written({r["row_num"] for r in writable} - set(failed_rows))
+
+    if not failed_rows and not args.dry_run:
+        journal.clear()
+
+    if api_errors:
+        from zipcode_helper import get_juso_health
+
+        health = get_juso_health()
+        _log(
+            f"{label} 주소 API 오류 {api_errors}건 (차단기 {health['breaker']}, "
+            f"사용 가능 키 {health['available_keys']}/{health['key_count']}개, "
+            f"제한 응답 {health['throttled']}회, 마지막 오류: {health['last_error'] or '-'})"
+        )
+    _log(
+        f"{label} 조회 성공 {found}/{len(results)}건, "
+        f"{'기록 예정' if args.dry_run else '기록'} {len(writable) - len(failed_rows)}건"
+        + (f", 기록 실패 {len(failed_rows)}건 (행: {', '.join(map(str, failed_rows[:20]))})"
+           if failed_rows else "")
+    )
+    if api_errors:
+        return EXIT_API_ERROR
+    return EXIT_PARTIAL if failed_rows else EXIT_OK
+
+
+def run_file(args, metrics) -> int:
+    """CSV/XLSX 파일 처리 후 종료 코드 반환"""
+    from file_io import process_file
+
+    started = time.monotonic()
+
+    def show(rows):
+        elapsed = time.monotonic() - started
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        print(f"\r[{args.input}] {rows:,}행 ({rate:.1f}행/초)", end="", file=sys.stderr, flush=True)
+
+    try:
+        summary = process_file(
+            args.input, args.output, args.address_col,
+            zip_col=args.zip_col,
+            use_gemini=not args.no_gemini,
+            max_workers=args.workers,
+            chunk_rows=args.chunk_rows,
+            encoding=args.encoding,
+            sheet_name=args.worksheet,
+            use_warm_start=not args.no_warm_start,
+            on_progress=show,
+            metrics=metrics,
+        )
+        metrics.finish()
+    except ValueError as e:
+        raise UsageError(str(e)) from e
+
+    _log(
+        f"\n[{args.input}] 전체 {summary['rows']:,}행, 조회 {summary['looked_up']:,}행, "
+        f"우편번호 찾음 {summary['found']:,}행 → {args.output}"
+        + (f", 주소 API 오류 {summary['api_errors']:,}행" if summary["api_errors"] else "")
+    )
+    return EXIT_API_ERROR if summary["api_errors"] else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="우편번호 자동 입력 (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_sheet = sub.add_parser("sheet", help="Google Sheets의 빈 우편번호 채우기")
+    p_sheet.add_argument("urls", nargs="+", metavar="URL", help="Google Sheet URL (여러 개 가능)")
+    p_sheet.add_argument("--worksheet", help="워크시트 이름 (기본: 첫 번째 시트)")
+    p_sheet.add_argument("--address-col", required=True, help="주소 column 헤더명")
+    p_sheet.add_argument("--zip-col", required=True, help="우편번호 column 헤더명")
+    p_sheet.add_argument("--acc-col", help="정확도 column 헤더명 (선택)")
+    p_sheet.add_argument("--no-gemini", action="store_true", help="Gemini AI 주소 정제 사용 안 함")
+    p_sheet.add_argument("--workers", type=int, default=None, help="동시 실행 worker 수")
+    p_sheet.add_argument("--min-accuracy", type=int, default=0,
+                         help="이 정확도(%%) 미만 결과는 기록하지 않음")
+    p_sheet.add_argument("--dry-run", action="store_true",
+                         help="시트에 기록하지 않고 결과만 stdout에 출력")
+    p_sheet.add_argument("--no-resume", action="store_true",
+                         help="이전 실행 체크포인트를 버리고 처음부터 처리")
+    p_sheet.add_argument("--no-warm-start", action="store_true",
+                         help="우편번호가 이미 있는 행을 확인된 주소로 사용하지 않음")
+    p_sheet.add_argument("--metrics-out", help="실행 요약(단계별 시간/API 호출 수)을 저장할 JSON 경로")
+
+    p_file = sub.add_parser("file", help="CSV/XLSX 파일을 읽어 결과 파일 쓰기 (대용량)")
+    p_file.add_argument("input", help="입력 파일 (.csv / .xlsx)")
+    p_file.add_argument("-o", "--output", required=True, help="출력 파일 (.csv / .xlsx)")
+    p_file.add_argument("--address-col", required=True, help="주소 column 헤더명")
+    p_file.add_argument("--zip-col", help="기존 우편번호 column 헤더명 (값이 있는 행은 조회 생략)")
+    p_file.add_argument("--worksheet", help="XLSX 입력 워크시트 이름 (기본: 첫 번째 시트)")
+    p_file.add_argument("--encoding", default="utf-8-sig", help="CSV 인코딩 (예: cp949)")
+    p_file.add_argument("--chunk-rows", type=int, default=None, help="한 번에 처리할 행 수")
+    p_file.add_argument("--no-gemini", action="store_true", help="Gemini AI 주소 정제 사용 안 함")
+    p_file.add_argument("--workers", type=int, default=None, help="동시 실행 worker 수")
+    p_file.add_argument("--no-warm-start", action="store_true",
+                        help="--zip-col에 우편번호가 있는 행을 확인된 주소로 사용하지 않음")
+    p_file.add_argument("--metrics-out", help="실행 요약(단계별 시간/API 호출 수)을 저장할 JSON 경로")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    try:
+        import config  # noqa: F401  (API 키/인증 설정 확인)
+    except (Exception, SystemExit) as e:
+        _log(f"[설정 오류] {e}")
+        return EXIT_USAGE
+
+    from tracing import RunMetrics
+
+    if args.command == "file":
+        jobs = [(args.input, lambda m: run_file(args, m))]
+    else:
+        jobs = [(url, lambda m, url=url: run_sheet(url, args, m)) for url in args.urls]
+
+    exit_code = EXIT_OK
+    run_summaries = []
+    for name, job in jobs:
+        metrics = RunMetrics()
+        try:
+            code = job(metrics)
+        except UsageError as e:
+            _log(f"[인자 오류] {e}")
+            code = EXIT_USAGE
+        except KeyboardInterrupt:
+            if args.command == "sheet":
+                _log("\n[중단] 완료된 행은 체크포인트에 저장되었습니다. 다시 실행하면 이어서 처리합니다.")
+            else:
+                _log("\n[중단]")
+            return EXIT_ERROR
+        except Exception as e:
+            _log(f"[오류] {name}: {e}")
+            code = EXIT_ERROR
+        exit_code = max(exit_code, code)
+        run_summaries.append({"target": name, "exit_code": code, **metrics.summary()})
+
+    if args.metrics_out:
+        with open(args.metrics_out, "w", encoding="utf-8") as f:
+            json.dump({"runs": run_summaries}, f, ensure_ascii=False, indent=2)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,14 @@
 # [설정값] API 키 및 기본 설정
 # ==========================================
 # 로컬: ~/.secrets/ 에서 로드
+# CLI / cron: 환경 변수에서 로드 (JUSO_API_KEY 설정 시)
 # Streamlit Cloud: st.secrets 에서 로드
+# streamlit은 st.secrets가 필요할 때만 import (CLI에서 UI 없이 사용 가능)
+# JUSO_API_KEYS / GEMINI_API_KEYS: 추가 키 (쉼표로 구분, 기본 키와 함께 키 풀로 번갈아 사용)
 
 import os
 import sys
 
-import streamlit as st
-
 
 def load_env(filename: str) -> dict:
     """~/.secrets/ 에서 .env 파일을 읽어 dict로 반환"""
@@ -25,6 +26,20 @@ def load_env(filename: str) -> dict:
     return result
 
 
+def _key_list(*values) -> list:
+    """기본 키와 추가 키(쉼표 구분 문자열 또는 리스트)를 중복 없는 키 목록으로"""
+    keys = []
+    for value in values:
+        if not value:
+            continue
+        items = value if isinstance(value, (list, tuple)) else str(value).split(",")
+        for item in items:
+            item = str(item).strip()
+            if item and item not in keys:
+                keys.append(item)
+    return keys
+
+
 def _is_local() -> bool:
     """로컬 환경 여부 (~/.secrets/ 디렉토리 존재 확인)"""
     return os.path.isdir(os.path.expanduser("~/.secrets"))
@@ -38,14 +53,29 @@ if IS_LOCAL:
     _juso = load_env("juso_api.env")
     GEMINI_API_KEY = _gemini["GEMINI_API_KEY"]
     JUSO_API_KEY = _juso["JUSO_API_KEY"]
+    GEMINI_API_KEYS = _key_list(GEMINI_API_KEY, _gemini.get("GEMINI_API_KEYS"))
+    JUSO_API_KEYS = _key_list(JUSO_API_KEY, _juso.get("JUSO_API_KEYS"))
 
     SERVICE_ACCOUNT_FILE = os.path.expanduser("~/.secrets/google_order_automation.json")
     SERVICE_ACCOUNT_INFO = None
+elif os.environ.get("JUSO_API_KEY"):
+    # ── CLI / cron: 환경 변수에서 로드 ──
+    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
+    JUSO_API_KEY = os.environ["JUSO_API_KEY"]
+    GEMINI_API_KEYS = _key_list(GEMINI_API_KEY, os.environ.get("GEMINI_API_KEYS"))
+    JUSO_API_KEYS = _key_list(JUSO_API_KEY, os.environ.get("JUSO_API_KEYS"))
+
+    SERVICE_ACCOUNT_FILE = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    SERVICE_ACCOUNT_INFO = None
 else:
     # ── Streamlit Cloud: st.secrets 에서 로드 ──
+    import streamlit as st
+
     try:
         GEMINI_API_KEY = st.secrets["GEMINI_API_KEY"]
         JUSO_API_KEY = st.secrets["JUSO_API_KEY"]
+        GEMINI_API_KEYS = _key_list(GEMINI_API_KEY, st.secrets.get("GEMINI_API_KEYS"))
+        JUSO_API_KEYS = _key_list(JUSO_API_KEY, st.secrets.get("JUSO_API_KEYS"))
         SERVICE_ACCOUNT_FILE = None
         SERVICE_ACCOUNT_INFO = dict(st.secrets["gcp_service_account"])
     except KeyError as e:
@@ -57,3 +87,126 @@ else:
             "GEMINI_API_KEY, JUSO_API_KEY, [gcp_service_account] 를 설정하세요."
         )
         sys.exit(1)
+
+# ==========================================
+# [조회 캐시] 도로명주소 API 응답 캐시
+# ==========================================
+CACHE_DIR = os.environ.get("ZIP_AUTO_CACHE_DIR") or os.path.expanduser("~/.cache/zip_auto")
+
+LOOKUP_CACHE_ENABLED = True
+LOOKUP_CACHE_PATH = os.path.join(CACHE_DIR, "lookup_cache.sqlite3")
+LOOKUP_CACHE_TTL = 30 * 24 * 3600           # 정상 결과: 30일
+LOOKUP_CACHE_NEGATIVE_TTL = 3 * 24 * 3600   # 검색 결과 없음: 3일
+LOOKUP_CACHE_MAX_ENTRIES = 200_000
+
+# ── 확인된 주소 캐시 (warm start): 시트에 이미 우편번호가 있는 행의 (주소 → 우편번호) ──
+WARM_START_ENABLED = True
+WARM_START_MIN_ACCURACY = 80    # 정확도 column 값이 이 미만인 행(자동 입력된 낮은 정확도)은 제외, 빈 값은 사용
+KNOWN_PAIRS_TTL = 365 * 24 * 3600
+KNOWN_PAIRS_MAX_ENTRIES = 500_000
+
+# ── Gemini 정제 결과 캐시 (SYSTEM_PROMPT 변경 시 자동 무효화) ──
+GEMINI_CACHE_ENABLED = True
+GEMINI_CACHE_TTL = 90 * 24 * 3600           # 90일
+GEMINI_CACHE_MAX_ENTRIES = 100_000
+
+# ── Gemini 일괄 정제: 요청당 주소 수 ──
+GEMINI_BATCH_SIZE = 30
+GEMINI_BATCH_RETRIES = 2    # 묶음 요청 자체가 실패(429/5xx/연결 오류)했을 때 백오프 후 다시 보내는 횟수
+
+# ==========================================
+# [단계 순서] "gemini_first" / "cheap_first" / "adaptive"
+# ==========================================
+# cheap_first: 정규식+API 조회를 먼저 하고, 정확도가 GEMINI_GATE_ACCURACY 미만일 때만 Gemini 호출
+#   (Gemini 단계가 남아 있으면 앞 단계 조기 종료도 이 값 기준: 80보다 높이면 80~미만 결과도 Gemini로 보정)
+# adaptive: 정규식 단계 성공률이 ADAPTIVE_CHEAP_MIN_SUCCESS 미만이면 Gemini를 먼저 호출
+STAGE_ORDER_POLICY = "cheap_first"
+GEMINI_GATE_ACCURACY = 80
+ADAPTIVE_WINDOW = 200               # 성공률 계산에 쓰는 최근 주소 수
+ADAPTIVE_MIN_SAMPLES = 30           # 이 수만큼 모이기 전에는 cheap_first
+ADAPTIVE_CHEAP_MIN_SUCCESS = 0.5
+ADAPTIVE_EXPLORE_EVERY = 10         # gemini_first 중에도 N건마다 한 번은 cheap_first로 성공률 갱신
+
+# ── 단계 동시 실행: 서로 독립인 앞쪽 단계를 동시에 시작하고 정확도 80 이상이 먼저 나오면 바로 반환 ──
+# (먼저 끝난 단계가 이기면 나머지 단계의 API 호출은 버려지므로 호출 수는 늘 수 있음)
+SPECULATIVE_STAGES = False
+STAGE_EXECUTOR_WORKERS = 24         # 단계 실행 전용 스레드 수 (행 worker pool과 별도)
+
+# ==========================================
+# [병렬 처리] worker 수 및 API별 초당 요청 제한 (토큰 버킷)
+# ==========================================
+MAX_WORKERS = 8
+JUSO_RATE_LIMIT = 10.0      # 도로명주소 API 키 1개당 초당 요청 수 (0 이하: 제한 없음)
+GEMINI_RATE_LIMIT = 2.0     # Gemini API 키 1개당 초당 요청 수 (0 이하: 제한 없음)
+
+# ── API 키 풀: 키마다 따로 속도 제한/차단기를 두고 번갈아 사용 (키 N개 → 최대 N배 처리량) ──
+KEY_THROTTLE_COOLDOWN = 5.0     # 제한 응답을 받은 키를 다른 키보다 뒤로 미루는 시간 (초)
+KEY_ACQUIRE_MAX_WAIT = 10.0     # 모든 키가 차단 중일 때 시험 요청을 기다리는 최대 시간 (초, 넘으면 circuit_open)
+GEMINI_BREAKER_THRESHOLD = 5    # Gemini 키별 연속 실패 횟수 → 차단 (인증 오류는 즉시 차단)
+GEMINI_BREAKER_RESET = 60       # Gemini 키 차단 후 시험 요청까지 대기 (초)
+
+# ── 도로명주소 API 속도 자동 조절 (AIMD) / 차단기 ──
+# 제한 응답(HTTP 429, errorCode -999)을 받으면 속도를 JUSO_RATE_DECREASE배로 줄이고,
+# 성공이 이어지면 초당 JUSO_RATE_INCREASE씩 JUSO_RATE_MAX까지 다시 올립니다. (모두 키 1개 기준)
+JUSO_RATE_MIN = 1.0
+JUSO_RATE_MAX = 20.0
+JUSO_RATE_INCREASE = 1.0
+JUSO_RATE_DECREASE = 0.5
+JUSO_THROTTLE_RETRIES = 3       # 제한 응답 시 속도를 낮춘 뒤 다시 보내는 횟수 (차단기 실패로 세지 않음)
+JUSO_BREAKER_THRESHOLD = 10     # 연속 오류 횟수 → 차단 (인증 오류 키는 실행 동안 제외)
+JUSO_BREAKER_RESET = 30         # 차단 후 시험 요청까지 대기 (초)
+
+# ==========================================
+# [HTTP] 연결 풀 / timeout / 재시도
+# ==========================================
+HTTP_POOL_SIZE = MAX_WORKERS        # 엔드포인트별 유지할 keep-alive 연결 수
+HTTP_MAX_RETRIES = 2                # 5xx/timeout 재시도 횟수
+HTTP_BACKOFF_BASE = 0.5             # 백오프 기본 대기 (초, 시도마다 2배)
+HTTP_BACKOFF_MAX = 8.0              # 백오프 최대 대기 (초)
+JUSO_TIMEOUT = 10                   # 도로명주소 API timeout (초)
+GEMINI_TIMEOUT = 15                 # Gemini API timeout (초)
+
+# ==========================================
+# [주소 조회 백엔드] "api": 도로명주소 API / "offline": 로컬 주소DB
+# ==========================================
+JUSO_BACKEND = "api"
+JUSO_OFFLINE_DB_PATH = os.path.join(CACHE_DIR, "juso_offline.sqlite3")
+
+# ==========================================
+# [로컬 n-gram 인덱스] 받아 둔 주소로 재시도 후보를 로컬에서 검색
+# ==========================================
+LOCAL_INDEX_ENABLED = True
+LOCAL_INDEX_MAX_DOCS = 500_000
+LOCAL_INDEX_MIN_ACCURACY = 70   # 로컬 후보 정확도가 이 값 이상이면 API 재시도 생략
+
+# ==========================================
+# [도로구간 인덱스] (시군구, 도로명, 건물번호)가 같은 주소는 받아 둔 결과로 바로 응답
+# ==========================================
+ROAD_INDEX_ENABLED = True
+ROAD_INDEX_MAX_ENTRIES = 1_000_000
+
+# ==========================================
+# [시트 읽기] 선택 column만 행 묶음 단위로 요청
+# ==========================================
+SHEET_READ_CHUNK_ROWS = 5000
+SPREADSHEET_CACHE_SIZE = 8          # 재사용할 열린 spreadsheet 핸들 수
+SHEET_CHANGE_PROBE_INTERVAL = 5     # 시트 변경 확인 최소 간격 (초, 그 사이 rerun은 캐시 사용)
+
+# ==========================================
+# [파일 입출력] CSV/XLSX 스트리밍 처리
+# ==========================================
+FILE_CHUNK_ROWS = 5000              # 한 번에 메모리에 올려 처리할 행 수
+
+# ==========================================
+# [시트 기록] 연속 구간 value range 일괄 기록
+# ==========================================
+WRITE_CHUNK_CELLS = 10_000      # 요청당 최대 셀 수
+WRITE_MAX_RETRIES = 3           # 요청당 재시도 횟수
+
+# ==========================================
+# [작업 일지] 체크포인트 / 중간 기록
+# ==========================================
+JOB_JOURNAL_DIR = os.path.join(CACHE_DIR, "jobs")
+JOB_JOURNAL_FLUSH_ROWS = 200    # 결과를 모아 두었다가 N건마다 일지 파일에 기록 (fsync 1회)
+JOB_JOURNAL_FLUSH_SECONDS = 5.0 # 또는 마지막 기록 후 N초가 지나면 기록
+INCREMENTAL_FLUSH_ROWS = 200    # 중간 기록 시 N건마다 시트에 기록
@@ -0,0 +1,223 @@
+# ==========================================
+# [파일 입출력] CSV/XLSX 스트리밍 일괄 처리
+# ==========================================
+# 시트에 담을 수 없는 대용량 주소 파일을 행 묶음(FILE_CHUNK_ROWS) 단위로 읽어
+# 우편번호를 조회하고, 결과 column을 덧붙인 새 파일로 바로 씁니다.
+# 한 번에 메모리에 올라가는 행은 묶음 하나뿐입니다.
+# XLSX는 openpyxl(선택 의존성)이 설치되어 있을 때만 사용할 수 있습니다.
+
+import csv
+import os
+from contextlib import nullcontext
+from itertools import islice
+
+from config import FILE_CHUNK_ROWS, WARM_START_ENABLED
+
+try:
+    import openpyxl
+except ImportError:  # XLSX 미사용 시 불필요
+    openpyxl = None
+
+OUTPUT_COLUMNS = ["우편번호", "정확도", "출처", "매칭주소"]
+
+
+def _is_xlsx(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm")
+
+
+def _require_openpyxl():
+    if openpyxl is None:
+        raise RuntimeError("XLSX 파일을 처리하려면 openpyxl이 필요합니다: pip install openpyxl")
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_file_rows(path: str, encoding: str = "utf-8-sig", sheet_name: str = None):
+    """
+    CSV/XLSX 파일의 행을 문자열 리스트로 하나씩 반환합니다 (헤더 포함).
+
+    Args:
+        path: 입력 파일 경로 (.csv / .xlsx)
+        encoding: CSV 인코딩 (XLSX는 무시)
+        sheet_name: XLSX 워크시트 이름 (None이면 첫 번째 시트)
+    """
+    if _is_xlsx(path):
+        _require_openpyxl()
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+            for row in ws.iter_rows(values_only=True):
+                yield [_cell_text(v) for v in row]
+        finally:
+            wb.close()
+    else:
+        with open(path, encoding=encoding, newline="") as f:
+            yield from csv.reader(f)
+
+
+class FileRowWriter:
+    """CSV/XLSX 행 단위 쓰기 (XLSX는 write-only 모드로 메모리 사용 최소화)"""
+
+    def __init__(self, path: str, encoding: str = "utf-8-sig"):
+        self.path = path
+        self._file = None
+        self._wb = None
+        if _is_xlsx(path):
+            _require_openpyxl()
+            self._wb = openpyxl.Workbook(write_only=True)
+            self._ws = self._wb.create_sheet()
+        else:
+            self._file = open(path, "w", encoding=encoding, newline="")
+            self._writer = csv.writer(self._file)
+
+    def writerows(self, rows):
+        if self._wb is not None:
+            for row in rows:
+                self._ws.append(row)
+        else:
+            self._writer.writerows(rows)
+
+    def close(self):
+        if self._wb is not None:
+            self._wb.save(self.path)
+            self._wb = None
+        elif self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _find_column(header: list, name: str) -> int:
+    for i, h in enumerate(header):
+        if h.strip() == name.strip():
+            return i
+    return -1
+
+
+def _output_header(header: list) -> list:
+    """입력 헤더 + 결과 column 헤더 (입력에 같은 이름이 있으면 '조회_' 접두어로 구분)"""
+    names = {h.strip() for h in header}
+    added = []
+    for name in OUTPUT_COLUMNS:
+        out = name
+        while out in names:
+            out = f"조회_{out}"
+        names.add(out)
+        added.append(out)
+    return header + added
+
+
+def process_file(input_path: str, output_path: str, address_col: str, zip_col: str = None,
+                 use_gemini: bool = True, max_workers: int = None, chunk_rows: int = None,
+                 encoding: str = "utf-8-sig", sheet_name: str = None, use_warm_start: bool = True,
+                 on_progress=None, metrics=None) -> dict:
+    """
+    주소 파일을 묶음 단위로 처리하여 결과 파일을 씁니다.
+    출력 파일은 입력 column 뒤에 우편번호/정확도/출처/매칭주소 column이 붙습니다.
+    (결과 column은 항상 헤더 길이 위치부터: 짧은 행은 빈 칸으로 채우고,
+    헤더보다 긴 행의 남는 칸은 버리지 않고 결과 column 뒤로 옮깁니다.
+    입력에 같은 이름의 column이 있으면 결과 column에 '조회_' 접두어를 붙입니다)
+
+    Args:
+        input_path: 입력 CSV/XLSX 경로
+        output_path: 출력 CSV/XLSX 경로
+        address_col: 주소 column 헤더명
+        zip_col: 기존 우편번호 column 헤더명 (지정 시 값이 있는 행은 조회 생략)
+        use_gemini: Gemini AI 사용 여부
+        max_workers: 동시 실행 worker 수
+        chunk_rows: 한 번에 처리할 행 수 (None이면 FILE_CHUNK_ROWS)
+        encoding: CSV 인코딩
+        sheet_name: XLSX 입력 워크시트 이름
+        use_warm_start: 기존 우편번호가 있는 행을 확인된 주소로 적재하여 같은 주소 행에 사용
+        on_progress: 묶음 완료 시 호출되는 콜백 (누적 처리 행 수)
+        metrics: 추적 정보를 모을 tracing.RunMetrics (선택)
+
+    Returns:
+        dict: {"rows": 전체 행 수, "looked_up": 조회 행 수, "found": 우편번호 찾은 행 수,
+               "api_errors": 주소 API 오류로 조회하지 못한 행 수}
+    """
+    from batch_runner import process_rows
+    from zipcode_helper import warm_start
+
+    chunk_rows = chunk_rows or FILE_CHUNK_ROWS
+    summary = {"rows": 0, "looked_up": 0, "found": 0, "api_errors": 0}
+
+    rows = iter_file_rows(input_path, encoding, sheet_name)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError(f"빈 파일입니다: {input_path}")
+
+    addr_idx = _find_column(header, address_col)
+    if addr_idx < 0:
+        raise ValueError(f"주소 column '{address_col}'을(를) 헤더에서 찾을 수 없습니다: {header}")
+    zip_idx = _find_column(header, zip_col) if zip_col else -1
+    if zip_col and zip_idx < 0:
+        raise ValueError(f"우편번호 column '{zip_col}'을(를) 헤더에서 찾을 수 없습니다: {header}")
+
+    with FileRowWriter(output_path, encoding) as writer:
+        writer.writerows([_output_header(header)])
+        width = len(header)
+
+        row_num = 1
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+
+            # 조회 대상: 주소가 있고 (기존 우편번호 column이 비어있는) 행
+            # 우편번호가 이미 있는 행은 확인된 주소로 먼저 적재 (이번 묶음과 이후 묶음에서 사용)
+            targets = []
+            known_pairs = []
+            for offset, row in enumerate(chunk):
+                address = row[addr_idx].strip() if addr_idx < len(row) else ""
+                existing = row[zip_idx].strip() if 0 <= zip_idx < len(row) else ""
+                if address and not existing:
+                    targets.append({"row_num": row_num + offset, "address": address})
+                elif address:
+                    known_pairs.append((address, existing))
+
+            if known_pairs and use_warm_start and WARM_START_ENABLED:
+                phase = metrics.phase("warm_start") if metrics is not None else nullcontext()
+                with phase:
+                    warm_start(known_pairs)
+
+            results = {
+                r["row_num"]: r
+                for r in process_rows(targets, use_gemini=use_gemini,
+                                      max_workers=max_workers, metrics=metrics)
+            }
+
+            out_rows = []
+            for offset, row in enumerate(chunk):
+                cells = row[:width] + [""] * (width - len(row))
+                extra = row[width:]
+                r = results.get(row_num + offset)
+                if r is None:
+                    out_rows.append(cells + ["", "", "", ""] + extra)
+                    continue
+                accuracy = f'{r["accuracy"]}%' if r["zipcode"] else ""
+                out_rows.append(cells + [r["zipcode"], accuracy, r["source"], r["road_addr"]] + extra)
+                if r["zipcode"]:
+                    summary["found"] += 1
+                if r["source"] == "api_error":
+                    summary["api_errors"] += 1
+            writer.writerows(out_rows)
+
+            row_num += len(chunk)
+            summary["rows"] += len(chunk)
+            summary["looked_up"] += len(targets)
+            if on_progress:
+                on_progress(summary["rows"])
+
+    return summary
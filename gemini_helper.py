@@ -3,12 +3,40 @@
 # ==========================================
 # 기존 정규식 정제 실패 시 Gemini로 주소를 보정합니다.
 
+import hashlib
 import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
-from config import GEMINI_API_KEY
+from config import (
+    GEMINI_API_KEYS,
+    GEMINI_BATCH_RETRIES,
+    GEMINI_BATCH_SIZE,
+    GEMINI_BREAKER_RESET,
+    GEMINI_BREAKER_THRESHOLD,
+    GEMINI_CACHE_ENABLED,
+    GEMINI_CACHE_TTL,
+    GEMINI_CACHE_MAX_ENTRIES,
+    GEMINI_RATE_LIMIT,
+    GEMINI_TIMEOUT,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    KEY_THROTTLE_COOLDOWN,
+    LOOKUP_CACHE_PATH,
+)
+import http_client
+import tracing
+from key_pool import KeyPool
+from lookup_cache import LookupCache
 
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-3.0-flash-lite:generateContent"
+# 환경 변수로 대체 가능 (벤치마크용 로컬 stub 서버 등)
+GEMINI_API_URL = os.environ.get(
+    "GEMINI_API_URL",
+    "https://generativelanguage.googleapis.com/v1beta/models/gemini-3.0-flash-lite:generateContent",
+)
 
 SYSTEM_PROMPT = """당신은 한국 주소 정제 전문가입니다. 
 입력된 주소를 분석하여 행정안전부 도로명주소 API에서 검색 가능한 형태로 정제해주세요.
@@ -30,13 +58,140 @@ confidence 기준:
 - 0.5 미만: 불확실한 변환
 """
 
+# 모든 worker가 공유하는 API 키 풀 (키별 속도 제한 + 연속 실패 차단기, 설정 안 된 예시 키는 제외)
+_gemini_keys = KeyPool(
+    "gemini",
+    [k for k in GEMINI_API_KEYS if k != "YOUR_GEMINI_API_KEY"],
+    GEMINI_RATE_LIMIT, GEMINI_BREAKER_THRESHOLD, GEMINI_BREAKER_RESET,
+    throttle_cooldown=KEY_THROTTLE_COOLDOWN,
+)
 
-def refine_address_with_gemini(address: str) -> dict:
+# 프롬프트 버전: SYSTEM_PROMPT가 바뀌면 캐시 키와 캐시 버전이 함께 바뀜
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+_gemini_cache = None
+_gemini_cache_lock = threading.Lock()
+
+
+def get_gemini_cache():
+    """Gemini 정제 결과 캐시 (최초 호출 시 생성, 비활성화 시 None)"""
+    global _gemini_cache
+    if not GEMINI_CACHE_ENABLED:
+        return None
+    if _gemini_cache is None:
+        with _gemini_cache_lock:
+            if _gemini_cache is None:
+                _gemini_cache = LookupCache(
+                    LOOKUP_CACHE_PATH,
+                    table="gemini",
+                    ttl=GEMINI_CACHE_TTL,
+                    max_entries=GEMINI_CACHE_MAX_ENTRIES,
+                    version=f"{GEMINI_API_URL}|{PROMPT_VERSION}",
+                )
+    return _gemini_cache
+
+
+def _cache_key(address: str) -> str:
+    """(모델 URL, 프롬프트 버전, 원본 주소) 해시"""
+    raw = f"{GEMINI_API_URL}\n{PROMPT_VERSION}\n{address.strip()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def clear_gemini_cache():
+    """Gemini 정제 결과 캐시 전체 삭제"""
+    cache = get_gemini_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def _default_result(address: str) -> dict:
+    """정제 실패 시 반환할 기본 결과"""
+    return {
+        "refined_address": address,
+        "search_keyword": address,
+        "changes": "정제 실패",
+        "confidence": 0.0,
+        "success": False,
+    }
+
+
+def _has_api_key() -> bool:
+    return len(_gemini_keys) > 0
+
+
+def get_gemini_health():
+    """Gemini API 키 풀 상태 (zipcode_helper.get_juso_health()와 같은 형식)"""
+    return _gemini_keys.health()
+
+
+def _generate(parts: list, generation_config: dict):
+    """
+    generateContent 호출 후 응답 텍스트를 반환합니다.
+
+    키 풀에서 고른 키로 호출하고, 응답에 따라 그 키의 상태를 기록합니다.
+    (429: 제한 → 잠시 다른 키 우선, 5xx 등: http_client 재시도 후 차단기 실패,
+     400 API_KEY_INVALID/401/403: 해당 키 차단)
+
+    Returns:
+        str | None: 응답 텍스트 (HTTP 오류 또는 모든 키 차단 시 None)
+    """
+    key = _gemini_keys.acquire()
+    if key is None:
+        tracing.count("gemini_circuit_open")
+        return None
+
+    headers = {"Content-Type": "application/json"}
+    payload = {
+        "contents": [{"parts": parts}],
+        "generationConfig": generation_config,
+    }
+
+    try:
+        response = http_client.request(
+            "gemini", "POST", f"{GEMINI_API_URL}?key={key.key}",
+            timeout=GEMINI_TIMEOUT,
+            limiter=key.limiter,
+            headers=headers,
+            json=payload,
+        )
+    except requests.RequestException as e:
+        _gemini_keys.record_failure(key, type(e).__name__)
+        raise
+
+    status = response.status_code
+    if status == 429:
+        _gemini_keys.record_throttle(key, f"HTTP {status}")
+        return None
+    if status in (401, 403) or (status == 400 and "API_KEY_INVALID" in response.text):
+        _gemini_keys.disable(key, f"HTTP {status}")
+        return None
+    if status != 200:
+        _gemini_keys.record_failure(key, f"HTTP {status}")
+        return None
+    _gemini_keys.record_success(key)
+
+    data = response.json()
+    return data["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def _parse_json_text(text: str):
+    """JSON 파싱 (마크다운 코드블록 제거)"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return json.loads(text.strip())
+
+
+def refine_address_with_gemini(address: str, use_cache: bool = True) -> dict:
     """
     Gemini API를 사용하여 주소를 정제합니다.
+    이전에 성공한 정제 결과는 캐시에서 바로 반환합니다.
 
     Args:
         address: 원본 주소 문자열
+        use_cache: 정제 결과 캐시 사용 여부
 
     Returns:
         dict: {
@@ -47,61 +202,190 @@ def refine_address_with_gemini(address: str) -> dict:
             "success": 성공 여부
         }
     """
-    default_result = {
-        "refined_address": address,
-        "search_keyword": address,
-        "changes": "정제 실패",
-        "confidence": 0.0,
-        "success": False,
-    }
+    default_result = _default_result(address)
 
     if not address:
         return default_result
 
-    if not GEMINI_API_KEY or GEMINI_API_KEY == "YOUR_GEMINI_API_KEY":
+    if not _has_api_key():
         return default_result
 
+    cache = get_gemini_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(_cache_key(address))
+        if cached is not None:
+            tracing.count("gemini_cache_hits")
+            return cached
+
     try:
-        headers = {"Content-Type": "application/json"}
-        payload = {
-            "contents": [
-                {
-                    "parts": [
-                        {"text": SYSTEM_PROMPT},
-                        {"text": f"주소를 정제해주세요: {address}"},
-                    ]
-                }
+        text = _generate(
+            [
+                {"text": SYSTEM_PROMPT},
+                {"text": f"주소를 정제해주세요: {address}"},
             ],
-            "generationConfig": {
+            {
                 "temperature": 0.1,
                 "maxOutputTokens": 256,
             },
-        }
-
-        response = requests.post(
-            f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
-            headers=headers,
-            json=payload,
-            timeout=15,
         )
-
-        if response.status_code != 200:
+        if text is None:
             return default_result
 
-        data = response.json()
-        text = data["candidates"][0]["content"]["parts"][0]["text"]
-
-        # JSON 파싱 (마크다운 코드블록 제거)
-        text = text.strip()
-        if text.startswith("```"):
-            text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
-        result = json.loads(text)
+        result = _parse_json_text(text)
         result["success"] = True
+
+        if cache is not None:
+            cache.set(_cache_key(address), result)
         return result
 
-    except (json.JSONDecodeError, KeyError, IndexError, requests.RequestException):
+    except (json.JSONDecodeError, KeyError, IndexError, TypeError, requests.RequestException):
         return default_result
+
+
+# ==========================================
+# [일괄 정제] 여러 주소를 한 번의 요청으로 정제
+# ==========================================
+
+BATCH_PROMPT = """여러 개의 주소가 JSON 배열로 주어집니다. 각 항목은 {"index": 번호, "address": "주소"} 형식입니다.
+각 주소를 위 규칙대로 정제하여, 입력과 같은 index를 포함한 JSON 배열로만 응답하세요:
+[{"index": 번호, "refined_address": "...", "search_keyword": "...", "changes": "...", "confidence": 0.0~1.0}, ...]
+"""
+
+BATCH_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "index": {"type": "INTEGER"},
+            "refined_address": {"type": "STRING"},
+            "search_keyword": {"type": "STRING"},
+            "changes": {"type": "STRING"},
+            "confidence": {"type": "NUMBER"},
+        },
+        "required": ["index", "refined_address", "search_keyword", "confidence"],
+    },
+}
+
+# 주소 1건당 출력 토큰 예산
+_BATCH_TOKENS_PER_ADDRESS = 160
+
+
+def _refine_batch(addresses: list) -> dict:
+    """
+    주소 묶음을 한 번의 generateContent 호출로 정제합니다.
+
+    Returns:
+        dict | None: {입력 위치: 정제 결과} (파싱에 성공한 항목만),
+                     요청 자체가 실패했거나 응답이 JSON 배열이 아니면 None
+    """
+    items = [{"index": i, "address": addr} for i, addr in enumerate(addresses)]
+    try:
+        text = _generate(
+            [
+                {"text": SYSTEM_PROMPT},
+                {"text": BATCH_PROMPT},
+                {"text": json.dumps(items, ensure_ascii=False)},
+            ],
+            {
+                "temperature": 0.1,
+                "maxOutputTokens": min(8192, 256 + _BATCH_TOKENS_PER_ADDRESS * len(addresses)),
+                "responseMimeType": "application/json",
+                "responseSchema": BATCH_RESPONSE_SCHEMA,
+            },
+        )
+        if text is None:
+            return None
+        parsed = _parse_json_text(text)
+    except (json.JSONDecodeError, KeyError, IndexError, TypeError, requests.RequestException):
+        return None
+
+    if not isinstance(parsed, list):
+        return None
+
+    refined = {}
+    for item in parsed:
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("index", None)
+        if not isinstance(index, int) or not 0 <= index < len(addresses):
+            continue
+        if not item.get("search_keyword"):
+            continue
+        item.setdefault("refined_address", item["search_keyword"])
+        item.setdefault("changes", "")
+        item["success"] = True
+        refined[index] = item
+    return refined
+
+
+def refine_addresses_with_gemini(addresses: list, batch_size: int = None,
+                                 use_cache: bool = True, max_workers: int = 1) -> list:
+    """
+    여러 주소를 batch_size개씩 묶어 Gemini로 일괄 정제합니다.
+    캐시 적중 주소는 요청에서 제외하고, 응답에서 빠진 주소만 개별 호출로 재시도합니다.
+    묶음 요청 자체가 실패하면 (429/5xx/연결 오류) 주소마다 개별 호출하지 않고
+    백오프 후 묶음을 GEMINI_BATCH_RETRIES번까지 다시 보내며, 그래도 실패하면 기본값을 반환합니다.
+
+    Args:
+        addresses: 원본 주소 리스트
+        batch_size: 요청당 주소 수 (None이면 GEMINI_BATCH_SIZE)
+        use_cache: 정제 결과 캐시 사용 여부
+        max_workers: 동시에 보낼 묶음 요청 수
+
+    Returns:
+        list[dict]: 입력 순서대로 refine_address_with_gemini()와 같은 형식의 결과
+    """
+    if batch_size is None:
+        batch_size = GEMINI_BATCH_SIZE
+
+    results = [None] * len(addresses)
+    cache = get_gemini_cache() if use_cache else None
+
+    # 빈 주소/키 미설정/캐시 적중 처리, 나머지는 중복 제거 후 요청 대상
+    pending = {}  # 주소 → [입력 위치, ...]
+    for i, address in enumerate(addresses):
+        if not address or not _has_api_key():
+            results[i] = _default_result(address)
+            continue
+        if cache is not None:
+            cached = cache.get(_cache_key(address))
+            if cached is not None:
+                tracing.count("gemini_cache_hits")
+                results[i] = cached
+                continue
+        pending.setdefault(address, []).append(i)
+
+    def process_chunk(chunk):
+        refined = _refine_batch(chunk)
+        for attempt in range(GEMINI_BATCH_RETRIES):
+            # 사용할 수 있는 키가 없으면 (모두 차단/비활성) 다시 보내도 실패
+            if refined is not None or not _gemini_keys.health()["available_keys"]:
+                break
+            tracing.count("gemini_batch_retries")
+            time.sleep(min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+            refined = _refine_batch(chunk)
+        if refined is None:
+            return chunk, [_default_result(address) for address in chunk]
+
+        chunk_results = []
+        for j, address in enumerate(chunk):
+            result = refined.get(j)
+            if result is None:
+                # 응답은 받았지만 빠진 항목만 개별 호출로 fallback
+                result = refine_address_with_gemini(address, use_cache=use_cache)
+            elif cache is not None:
+                cache.set(_cache_key(address), result)
+            chunk_results.append(result)
+        return chunk, chunk_results
+
+    unique = list(pending)
+    batch_size = max(1, batch_size)
+    chunks = [unique[start:start + batch_size] for start in range(0, len(unique), batch_size)]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for chunk, chunk_results in executor.map(tracing.wrap(process_chunk), chunks):
+            for address, result in zip(chunk, chunk_results):
+                for i in pending[address]:
+                    results[i] = result
+
+    return results
@@ -44,6 +44,11 @@ def main():
     lines.append("# Streamlit Cloud Secrets")
     lines.append(f'GEMINI_API_KEY = "{gemini["GEMINI_API_KEY"]}"')
     lines.append(f'JUSO_API_KEY = "{juso["JUSO_API_KEY"]}"')
+    # 추가 키 (키 풀, 선택)
+    if gemini.get("GEMINI_API_KEYS"):
+        lines.append(f'GEMINI_API_KEYS = "{gemini["GEMINI_API_KEYS"]}"')
+    if juso.get("JUSO_API_KEYS"):
+        lines.append(f'JUSO_API_KEYS = "{juso["JUSO_API_KEYS"]}"')
     lines.append("")
     lines.append("[gcp_service_account]")
 
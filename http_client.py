@@ -0,0 +1,104 @@
+# ==========================================
+# [HTTP 클라이언트] 연결 풀 + keep-alive + 재시도
+# ==========================================
+# 엔드포인트별로 하나의 연결 풀(HTTPAdapter)을 모든 스레드가 공유합니다.
+# requests.Session은 스레드마다 따로 만들고 같은 adapter를 mount하므로
+# 쿠키 등 세션 상태는 분리되면서 TCP/TLS 연결은 재사용됩니다.
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import tracing
+from config import HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX
+
+# 재시도 대상 HTTP 상태 코드 (일시적 서버 오류)
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+_adapters = {}
+_adapters_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_adapter(name: str) -> HTTPAdapter:
+    """엔드포인트별 공유 연결 풀"""
+    with _adapters_lock:
+        adapter = _adapters.get(name)
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=HTTP_POOL_SIZE,
+                pool_block=False,
+            )
+            _adapters[name] = adapter
+        return adapter
+
+
+def get_session(name: str) -> requests.Session:
+    """현재 스레드의 세션 (엔드포인트별 공유 연결 풀 사용)"""
+    sessions = getattr(_local, "sessions", None)
+    if sessions is None:
+        sessions = _local.sessions = {}
+
+    session = sessions.get(name)
+    if session is None:
+        session = requests.Session()
+        adapter = _get_adapter(name)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        sessions[name] = session
+    return session
+
+
+def _backoff_delay(attempt: int) -> float:
+    """지수 백오프 + full jitter"""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def request(name: str, method: str, url: str, timeout: float, limiter=None,
+            max_retries: int = None, retry_statuses=None, **kwargs) -> requests.Response:
+    """
+    공유 연결 풀로 HTTP 요청을 보냅니다.
+    5xx 응답, timeout, 연결 오류는 지터가 포함된 백오프 후 재시도합니다.
+
+    Args:
+        name: 엔드포인트 이름 (연결 풀 구분용, 예: "juso", "gemini")
+        method: HTTP 메서드
+        url: 요청 URL
+        timeout: 요청 timeout (초)
+        limiter: 매 시도 전에 acquire()할 TokenBucket (None이면 제한 없음)
+        max_retries: 최대 재시도 횟수 (None이면 HTTP_MAX_RETRIES)
+        retry_statuses: 재시도할 HTTP 상태 코드 (None이면 RETRY_STATUS_CODES,
+                        호출 측이 속도 조절 후 직접 재시도하면 빈 값)
+        **kwargs: requests.Session.request 인자 (params, json, headers 등)
+
+    Returns:
+        requests.Response: 마지막 시도의 응답
+
+    Raises:
+        requests.RequestException: 재시도 후에도 연결 실패/timeout인 경우
+    """
+    if max_retries is None:
+        max_retries = HTTP_MAX_RETRIES
+    if retry_statuses is None:
+        retry_statuses = RETRY_STATUS_CODES
+
+    session = get_session(name)
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        tracing.count(f"{name}_requests")
+        if attempt:
+            tracing.count(f"{name}_retries")
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.Timeout, requests.ConnectionError):
+            if attempt >= max_retries:
+                raise
+        else:
+            if response.status_code not in retry_statuses or attempt >= max_retries:
+                return response
+        time.sleep(_backoff_delay(attempt))
@@ -0,0 +1,112 @@
+# ==========================================
+# [작업 일지] 처리 결과 체크포인트 / 이어하기
+# ==========================================
+# 행 처리 결과를 모아 두었다가 일정 건수/시간마다(또는 시트 기록 표시와 함께) JSONL 파일에 추가합니다.
+# 비정상 종료 시 마지막 기록 이후의 결과(최대 JOB_JOURNAL_FLUSH_ROWS건 / JOB_JOURNAL_FLUSH_SECONDS초)만 다시 조회합니다.
+# 브라우저 연결이 끊기거나 컨테이너가 재시작되어도
+# 같은 작업(시트/워크시트/column)을 다시 실행하면 완료된 행은 건너뜁니다.
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config import JOB_JOURNAL_DIR, JOB_JOURNAL_FLUSH_ROWS, JOB_JOURNAL_FLUSH_SECONDS
+
+
+class JobJournal:
+    """
+    작업 하나의 진행 기록 (append-only JSONL).
+
+    레코드 형식:
+        {"type": "result", "row_num": ..., "address": ..., "zipcode": ..., ...}
+        {"type": "written", "rows": [row_num, ...]}
+    """
+
+    def __init__(self, job_key: str, directory: str = None):
+        directory = directory or JOB_JOURNAL_DIR
+        digest = hashlib.sha1(job_key.encode("utf-8")).hexdigest()[:16]
+        self.job_key = job_key
+        self.path = os.path.join(directory, f"{digest}.jsonl")
+        self._lock = threading.Lock()
+        self._buffer = []           # 아직 파일에 쓰지 않은 결과 레코드
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def for_worksheet(cls, worksheet, addr_idx: int, zip_idx: int, acc_idx: int):
+        """시트/워크시트/column 조합으로 식별되는 작업 일지 (앱과 CLI가 공유)"""
+        return cls(f"{worksheet.spreadsheet.id}|{worksheet.id}|{addr_idx}|{zip_idx}|{acc_idx}")
+
+    def _append(self, records: list):
+        """모아 둔 결과 + records를 한 번에 추가 (fsync 1회)"""
+        with self._lock:
+            records = self._buffer + records
+            self._buffer = []
+            self._last_flush = time.monotonic()
+            if not records:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def load(self) -> tuple:
+        """
+        기록된 결과와 시트 기록 완료 행을 읽습니다.
+        마지막 줄이 중간에 끊긴 경우(비정상 종료) 그 줄은 무시합니다.
+
+        Returns:
+            tuple: ({row_num: 결과 dict}, {시트에 기록된 row_num, ...})
+        """
+        results, written = {}, set()
+        if not os.path.exists(self.path):
+            return results, written
+
+        with self._lock, open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                kind = record.pop("type", None)
+                if kind == "result":
+                    results[record["row_num"]] = record
+                elif kind == "written":
+                    written.update(record["rows"])
+        return results, written
+
+    def record_results(self, entries: list):
+        """
+        완료된 행 결과 기록.
+        JOB_JOURNAL_FLUSH_ROWS건이 모이거나 JOB_JOURNAL_FLUSH_SECONDS초가 지나면 파일에 씁니다.
+        """
+        if not entries:
+            return
+        with self._lock:
+            self._buffer.extend(
+                {"type": "result", **{k: v for k, v in entry.items() if k != "trace"}}
+                for entry in entries
+            )
+            due = (len(self._buffer) >= JOB_JOURNAL_FLUSH_ROWS
+                   or time.monotonic() - self._last_flush >= JOB_JOURNAL_FLUSH_SECONDS)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 결과를 파일에 기록 (처리 종료/중단 시 호출)"""
+        self._append([])
+
+    def mark_written(self, row_nums):
+        """시트에 기록 완료된 행 표시 (모아 둔 결과도 함께 기록)"""
+        row_nums = sorted(row_nums)
+        self._append([{"type": "written", "rows": row_nums}] if row_nums else [])
+
+    def clear(self):
+        """작업 완료 후 일지 삭제"""
+        with self._lock:
+            self._buffer = []
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# ==========================================
+# [오프라인 주소DB] 도로명주소 전체분 로컬 검색
+# ==========================================
+# 행정안전부 주소기반산업지원서비스에서 제공하는 "도로명주소 한글" 전체분
+# (rnaddrkor_*.txt, '|' 구분, CP949)을 SQLite FTS5 인덱스로 적재하고
+# search_zipcode_api와 같은 juso dict 형식으로 검색합니다.
+#
+# 사용법:
+#   python juso_offline.py import 202401_도로명주소_한글_전체분.zip
+#   python juso_offline.py import rnaddrkor_seoul.txt rnaddrkor_busan.txt --db ./juso.sqlite3
+#   python juso_offline.py search "테헤란로 152"
+
+import argparse
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import zipfile
+
+from address_parser import SIDO_ALIASES, normalize_sido
+
+# rnaddrkor_*.txt 컬럼 위치 (0-based)
+RNADDRKOR_COLUMNS = {
+    "bdMgtSn": 0,       # 도로명주소관리번호
+    "admCd": 1,         # 법정동코드
+    "siNm": 2,          # 시도명
+    "sggNm": 3,         # 시군구명
+    "emdNm": 4,         # 법정읍면동명
+    "liNm": 5,          # 법정리명
+    "mtYn": 6,          # 산여부
+    "lnbrMnnm": 7,      # 지번본번
+    "lnbrSlno": 8,      # 지번부번
+    "rnMgtSn": 9,       # 도로명코드
+    "rn": 10,           # 도로명
+    "udrtYn": 11,       # 지하여부
+    "buldMnnm": 12,     # 건물본번
+    "buldSlno": 13,     # 건물부번
+    "zipNo": 16,        # 기초구역번호 (우편번호)
+    "bdKdcd": 19,       # 공동주택구분
+    "bdNm": 22,         # 시군구용건물명
+}
+
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+# 띄어쓰기 없이 붙은 도로명 + 건물번호 (테헤란로152, 중앙로3번길12)
+_ROAD_NUMBER = re.compile(r"^(.*?[가-힣](?:로|길))(\d+)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS juso_addr (
+    id INTEGER PRIMARY KEY,
+    bd_mgt_sn TEXT UNIQUE,
+    sgg_nm TEXT,
+    rn TEXT,
+    buld_mnnm INTEGER,
+    buld_slno INTEGER,
+    zip_no TEXT,
+    data TEXT NOT NULL,
+    search_text TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS juso_fts USING fts5(
+    search_text, content='juso_addr', content_rowid='id'
+);
+"""
+
+
+def _to_int(value: str) -> int:
+    value = value.strip()
+    return int(value) if value.isdigit() else 0
+
+
+def _build_juso(fields: list) -> dict:
+    """rnaddrkor 한 행 → 도로명주소 API juso dict"""
+    col = {key: fields[idx].strip() if idx < len(fields) else ""
+           for key, idx in RNADDRKOR_COLUMNS.items()}
+
+    main_no = _to_int(col["buldMnnm"])
+    sub_no = _to_int(col["buldSlno"])
+    building_no = f"{main_no}-{sub_no}" if sub_no else str(main_no)
+    underground = "지하 " if col["udrtYn"] == "1" else ""
+
+    road_part1 = " ".join(
+        p for p in (col["siNm"], col["sggNm"], col["rn"], f"{underground}{building_no}") if p
+    )
+
+    # 참고항목: 법정동(동 지역) + 공동주택 건물명
+    extras = []
+    if col["emdNm"].endswith(("동", "가", "로")) and not col["liNm"]:
+        extras.append(col["emdNm"])
+    if col["bdNm"] and col["bdKdcd"] == "1":
+        extras.append(col["bdNm"])
+    road_part2 = f"({', '.join(extras)})" if extras else ""
+
+    lnbr_main = _to_int(col["lnbrMnnm"])
+    lnbr_sub = _to_int(col["lnbrSlno"])
+    lnbr = f"{lnbr_main}-{lnbr_sub}" if lnbr_sub else str(lnbr_main)
+    mountain = "산 " if col["mtYn"] == "1" else ""
+    jibun = " ".join(
+        p for p in (col["siNm"], col["sggNm"], col["emdNm"], col["liNm"], f"{mountain}{lnbr}", col["bdNm"]) if p
+    )
+
+    return {
+        "roadAddr": f"{road_part1} {road_part2}".strip(),
+        "roadAddrPart1": road_part1,
+        "roadAddrPart2": road_part2,
+        "jibunAddr": jibun,
+        "engAddr": "",
+        "zipNo": col["zipNo"],
+        "admCd": col["admCd"],
+        "rnMgtSn": col["rnMgtSn"],
+        "bdMgtSn": col["bdMgtSn"],
+        "bdNm": col["bdNm"],
+        "bdKdcd": col["bdKdcd"],
+        "siNm": col["siNm"],
+        "sggNm": col["sggNm"],
+        "emdNm": col["emdNm"],
+        "liNm": col["liNm"],
+        "rn": col["rn"],
+        "udrtYn": col["udrtYn"] or "0",
+        "buldMnnm": str(main_no),
+        "buldSlno": str(sub_no),
+        "mtYn": col["mtYn"] or "0",
+        "lnbrMnnm": str(lnbr_main),
+        "lnbrSlno": str(lnbr_sub),
+        "emdNo": "",
+    }
+
+
+def _search_text(juso: dict) -> str:
+    """FTS 색인용 텍스트 (도로명/지번 주소 구성요소 + 시도 약칭)"""
+    parts = [
+        juso["siNm"], SIDO_ALIASES.get(juso["siNm"], ""), juso["sggNm"],
+        juso["emdNm"], juso["liNm"], juso["rn"],
+        juso["buldMnnm"], juso["buldSlno"] if juso["buldSlno"] != "0" else "",
+        juso["lnbrMnnm"], juso["lnbrSlno"] if juso["lnbrSlno"] != "0" else "",
+        juso["bdNm"],
+    ]
+    return " ".join(p for p in parts if p)
+
+
+def _iter_source_lines(path: str, encoding: str):
+    """txt 파일 또는 zip 안의 rnaddrkor*.txt 파일들의 행을 순회"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for name in sorted(zf.namelist()):
+                base = os.path.basename(name).lower()
+                if base.startswith("rnaddrkor") and base.endswith(".txt"):
+                    with zf.open(name) as raw:
+                        yield from io.TextIOWrapper(raw, encoding=encoding, errors="replace")
+    else:
+        with open(path, encoding=encoding, errors="replace") as f:
+            yield from f
+
+
+def import_juso_files(paths: list, db_path: str, encoding: str = "cp949",
+                      batch_size: int = 20_000, on_progress=None) -> int:
+    """
+    도로명주소 한글 전체분 파일을 로컬 DB로 적재합니다.
+    같은 도로명주소관리번호는 덮어쓰므로 월별 전체분을 다시 적재해도 됩니다.
+
+    Args:
+        paths: rnaddrkor_*.txt 또는 이를 담은 zip 파일 경로 리스트
+        db_path: SQLite DB 경로
+        encoding: 원본 파일 인코딩
+        batch_size: 한 트랜잭션에 넣을 행 수
+        on_progress: 배치 적재 후 호출되는 콜백 (적재된 누적 행 수)
+
+    Returns:
+        int: 적재한 행 수
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_SCHEMA)
+
+    sql = (
+        "INSERT OR REPLACE INTO juso_addr"
+        " (bd_mgt_sn, sgg_nm, rn, buld_mnnm, buld_slno, zip_no, data, search_text)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    count = 0
+    batch = []
+    for path in paths:
+        for line in _iter_source_lines(path, encoding):
+            fields = line.rstrip("\r\n").split("|")
+            if len(fields) <= RNADDRKOR_COLUMNS["zipNo"]:
+                continue
+            juso = _build_juso(fields)
+            if not juso["rn"] or not juso["zipNo"]:
+                continue
+            batch.append((
+                juso["bdMgtSn"], juso["sggNm"], juso["rn"],
+                int(juso["buldMnnm"]), int(juso["buldSlno"]), juso["zipNo"],
+                json.dumps(juso, ensure_ascii=False), _search_text(juso),
+            ))
+            if len(batch) >= batch_size:
+                with conn:
+                    conn.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+                if on_progress:
+                    on_progress(count)
+
+    if batch:
+        with conn:
+            conn.executemany(sql, batch)
+        count += len(batch)
+
+    # content 테이블 기준으로 FTS 색인 재구성 (덮어쓴 행 반영)
+    with conn:
+        conn.execute("INSERT INTO juso_fts(juso_fts) VALUES ('rebuild')")
+        conn.execute("CREATE INDEX IF NOT EXISTS juso_addr_road ON juso_addr(rn, buld_mnnm, buld_slno)")
+    conn.close()
+    return count
+
+
+class OfflineJusoBackend:
+    """로컬 주소DB 검색 (search_zipcode_api와 같은 juso dict 리스트 반환)"""
+
+    def __init__(self, db_path: str):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(
+                f"오프라인 주소DB가 없습니다: {db_path} (python juso_offline.py import ... 로 생성)"
+            )
+        self.db_path = db_path
+        self._conn = sqlite3.connect(
+            f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fts_query(keyword: str) -> str:
+        """
+        검색어 → FTS5 쿼리 (모든 토큰 prefix AND).
+        첫 토큰의 시도 표기(서울시 등)는 색인된 약칭으로 바꾸고, 도로명에 붙은 건물번호는 떼어 냅니다.
+        """
+        tokens = []
+        for i, token in enumerate(_TOKEN_PATTERN.findall(keyword)):
+            if i == 0 and normalize_sido(token):
+                tokens.append(normalize_sido(token))
+                continue
+            match = _ROAD_NUMBER.match(token)
+            tokens.extend(match.groups() if match else (token,))
+        return " ".join(f'"{t}"*' for t in tokens)
+
+    def search(self, keyword: str, limit: int = 10) -> list:
+        """키워드 검색 (도로명주소 API와 동일하게 최대 limit건)"""
+        query = self._fts_query(keyword or "")
+        if not query:
+            return []
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT a.data FROM juso_fts f JOIN juso_addr a ON a.id = f.rowid"
+                " WHERE juso_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM juso_addr").fetchone()[0]
+
+
+def main():
+    from config import JUSO_OFFLINE_DB_PATH
+
+    parser = argparse.ArgumentParser(description="도로명주소 오프라인 DB 적재/검색")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="도로명주소 한글 전체분 파일 적재")
+    p_import.add_argument("files", nargs="+", help="rnaddrkor_*.txt 또는 zip 파일")
+    p_import.add_argument("--db", default=JUSO_OFFLINE_DB_PATH, help="SQLite DB 경로")
+    p_import.add_argument("--encoding", default="cp949", help="원본 파일 인코딩")
+
+    p_search = sub.add_parser("search", help="적재된 DB에서 주소 검색")
+    p_search.add_argument("keyword")
+    p_search.add_argument("--db", default=JUSO_OFFLINE_DB_PATH, help="SQLite DB 경로")
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        count = import_juso_files(
+            args.files, args.db, encoding=args.encoding,
+            on_progress=lambda n: print(f"\r적재 중... {n:,}건", end="", file=sys.stderr),
+        )
+        print(f"\n[완료] {count:,}건 → {args.db}")
+    else:
+        for juso in OfflineJusoBackend(args.db).search(args.keyword):
+            print(f"{juso['zipNo']}  {juso['roadAddr']}")
+
+
+if __name__ == "__main__":
+    main()
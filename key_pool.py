@@ -0,0 +1,208 @@
+# ==========================================
+# [API 키 풀] 여러 API 키를 번갈아 사용
+# ==========================================
+# 키마다 토큰 버킷(속도 제한), AIMD 속도 조절, 차단기를 따로 둡니다.
+# 요청마다 차단되지 않은 키 중 토큰을 가장 빨리 얻을 수 있는 키를 고르고 (같으면 돌아가며),
+# 제한 응답을 받은 키는 속도를 낮추고(AIMD) throttle_cooldown초 동안 다른 키보다 뒤로 미룹니다.
+# 제한 응답은 차단기 실패로 세지 않습니다 (차단기는 연속 오류 전용).
+# 인증 오류가 난 키는 이번 실행 동안 제외하고 나머지 키로 계속 처리합니다.
+# 사용할 수 있는 키가 없으면 차단기 시험 요청 시각까지 최대 max_wait초 기다립니다.
+
+import threading
+import time
+
+from rate_limiter import AdaptiveRate, CircuitBreaker, TokenBucket
+
+
+def mask_key(key: str) -> str:
+    """화면/로그 표시용 키 (앞 4자리만)"""
+    return f"{key[:4]}…" if len(key) > 4 else "…"
+
+
+class ApiKey:
+    """키 1개와 그 키의 호출 상태"""
+
+    def __init__(self, key: str, index: int, limiter: TokenBucket, rate, breaker: CircuitBreaker):
+        self.key = key
+        self.label = f"#{index + 1} {mask_key(key)}"
+        self.limiter = limiter
+        self.rate = rate                # AdaptiveRate (속도 자동 조절을 쓰지 않으면 None)
+        self.breaker = breaker
+        self.requests = 0
+        self.throttled = 0
+        self.cooldown_until = 0.0
+        self.disabled = False           # 인증 오류로 제외된 키
+        self.last_throttle = None       # 마지막 제한 응답 설명
+
+
+class KeyPool:
+    """
+    한 API의 키 목록.
+
+    rate: 키 1개의 초당 요청 수 (0 이하: 제한 없음)
+    min_rate / max_rate: 둘 다 지정하면 키별로 AIMD 속도 조절
+    """
+
+    def __init__(self, name: str, keys: list, rate: float,
+                 breaker_threshold: int, breaker_reset: float,
+                 min_rate: float = None, max_rate: float = None,
+                 increase: float = 1.0, decrease: float = 0.5, throttle_cooldown: float = 5.0,
+                 max_wait: float = 10.0):
+        self.name = name
+        self.throttle_cooldown = throttle_cooldown
+        self.max_wait = max_wait
+        self.keys = []
+        for i, key in enumerate(k for k in keys if k):
+            limiter = TokenBucket(rate)
+            adaptive = None
+            if min_rate is not None and max_rate is not None:
+                adaptive = AdaptiveRate(limiter, min_rate, max_rate, increase=increase, decrease=decrease)
+            breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+            self.keys.append(ApiKey(key, i, limiter, adaptive, breaker))
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def set_rate(self, rate: float):
+        """모든 키의 초당 요청 수 변경"""
+        for key in self.keys:
+            key.limiter.set_rate(rate)
+
+    def acquire(self, preferred: str = None):
+        """
+        이번 요청에 쓸 키.
+        쓸 수 있는 키가 없으면 차단기 시험 요청 시각까지 기다리고, 그 시각이 max_wait초 이후이거나
+        모든 키가 인증 오류로 제외되었으면 None.
+        토큰은 차감하지 않으므로 호출 측이 key.limiter로 속도 제한을 적용합니다.
+
+        Args:
+            preferred: 이 키만 사용 (다른 키로 바꾸지 않음)
+
+        Raises:
+            ValueError: preferred가 풀에 없는 키인 경우
+        """
+        keys = self.keys
+        if preferred is not None:
+            keys = [k for k in self.keys if k.key == preferred]
+            if not keys:
+                raise ValueError(f"{self.name} 키 풀에 없는 API 키입니다: {mask_key(preferred)}")
+
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            key = self._select(keys)
+            if key is not None:
+                return key
+            active = [k for k in keys if not k.disabled]
+            now = time.monotonic()
+            if not active or now >= deadline:
+                return None
+            # 가장 먼저 시험 요청이 가능해지는 키까지 (시험 요청 중이면 잠깐) 대기,
+            # 그 시각이 max_wait 이후면 기다리지 않고 바로 None (차단 중인 동안 행마다 max_wait씩 멈추지 않도록)
+            wait = min(k.breaker.retry_after() for k in active) or 0.05
+            if wait > deadline - now:
+                return None
+            time.sleep(wait)
+
+    def _select(self, keys: list):
+        """
+        지금 바로 쓸 수 있는 키 (없으면 None).
+        시험 요청을 기다리는 half_open 키 → 정상 키 → 제한 응답 후 대기 중인 키 순으로,
+        같은 순위에서는 토큰을 빨리 얻을 수 있는 키부터 (같으면 돌아가며) 고릅니다.
+        시험 요청이 이미 나간 half_open 키와 차단/제외된 키는 건너뜁니다.
+        """
+        if not keys:
+            return None
+        with self._lock:
+            start = self._cursor
+            self._cursor = (self._cursor + 1) % len(self.keys)
+
+        now = time.monotonic()
+        candidates = []
+        for offset in range(len(keys)):
+            key = keys[(start + offset) % len(keys)]
+            if key.disabled:
+                continue
+            state = key.breaker.state
+            if state == CircuitBreaker.OPEN:
+                continue
+            if state == CircuitBreaker.HALF_OPEN:
+                tier = 0
+            else:
+                tier = 2 if now < key.cooldown_until else 1
+            candidates.append(((tier, key.limiter.wait_time(), offset), key))
+        for _, key in sorted(candidates, key=lambda c: c[0]):
+            if key.breaker.allow():
+                return self._take(key)
+        return None
+
+    def _take(self, key: ApiKey) -> ApiKey:
+        with self._lock:
+            key.requests += 1
+        return key
+
+    def record_success(self, key: ApiKey):
+        if key.rate is not None:
+            key.rate.on_success()
+        key.breaker.record_success()
+
+    def record_throttle(self, key: ApiKey, error: str = None):
+        """
+        제한 응답: 속도를 낮추고 잠시 다른 키를 우선 사용 (차단기 실패로 세지 않음).
+        half_open 시험 요청이었다면 시험 슬롯을 풀어 cooldown 후 다시 시험할 수 있게 합니다.
+        """
+        with self._lock:
+            key.throttled += 1
+            key.cooldown_until = time.monotonic() + self.throttle_cooldown
+            key.last_throttle = error
+        key.breaker.release_probe()
+        if key.rate is not None:
+            key.rate.on_throttle()
+
+    def record_failure(self, key: ApiKey, error: str = None):
+        """오류 응답 (연속 breaker_threshold회면 이 키를 breaker_reset초 동안 차단)"""
+        key.breaker.record_failure(error)
+
+    def disable(self, key: ApiKey, error: str = None):
+        """인증 오류: 재시도해도 해결되지 않으므로 이번 실행 동안 이 키를 제외"""
+        with self._lock:
+            key.disabled = True
+        key.breaker.record_failure(error, trip=True)
+
+    def health(self) -> dict:
+        """
+        풀 전체 상태.
+        rate는 차단되지 않은 키들의 초당 요청 수 합계, breaker는 가장 나은 키의 차단기 상태입니다.
+        """
+        keys = []
+        for key in self.keys:
+            keys.append({
+                "key": key.label,
+                "breaker": "disabled" if key.disabled else key.breaker.state,
+                "rate": key.limiter.rate,
+                "requests": key.requests,
+                "throttled": key.throttled,
+                "consecutive_failures": key.breaker.failures,
+                "last_error": key.breaker.last_error,
+            })
+
+        available = [k for k in keys if k["breaker"] not in (CircuitBreaker.OPEN, "disabled")]
+        states = {k["breaker"] for k in keys}
+        breaker = next(
+            (s for s in (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN) if s in states),
+            CircuitBreaker.OPEN,
+        )
+        return {
+            "rate": sum(k["rate"] for k in available),
+            "breaker": breaker,
+            "consecutive_failures": min((k["consecutive_failures"] for k in keys), default=0),
+            "throttled": sum(k["throttled"] for k in keys),
+            "last_error": next(
+                (k["last_error"] for k in keys if k["last_error"]),
+                next((k.last_throttle for k in self.keys if k.last_throttle), None),
+            ),
+            "key_count": len(keys),
+            "available_keys": len(available),
+            "keys": keys,
+        }
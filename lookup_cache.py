@@ -0,0 +1,238 @@
+# ==========================================
+# [조회 캐시] SQLite 기반 영구 캐시
+# ==========================================
+# 키워드 → API 응답을 디스크에 저장하여 재실행 시 API 호출을 생략합니다.
+# - TTL: 항목별 만료 시각 (결과 없음/오류는 짧은 TTL)
+# - LRU: 최대 항목 수 초과 시 가장 오래 조회되지 않은 항목부터 삭제
+# - 적중/미적중 카운터
+# - 버전: 저장된 버전과 다르면 테이블 전체 무효화 (프롬프트 변경 등)
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# 최대 항목 수 검사 주기 (쓰기 N회마다 한 번)
+_EVICT_CHECK_INTERVAL = 100
+# get_many/delete_many 한 번의 SQL에 넣는 키 수 (SQLite 변수 개수 제한 이하), values() 묶음 크기
+_BATCH_SIZE = 500
+
+
+class LookupCache:
+    """
+    스레드 안전한 SQLite 키-값 캐시.
+
+    값은 JSON으로 직렬화되어 저장되며, get()은 미적중/만료 시 None을 반환합니다.
+    negative=True 로 저장한 항목(결과 없음/오류)은 별도 카운터로 집계됩니다.
+    version을 지정하면 DB에 기록된 버전과 다를 때 기존 항목을 모두 삭제합니다.
+    """
+
+    def __init__(self, path: str, table: str = "lookup", ttl: float = 30 * 24 * 3600,
+                 max_entries: int = 100_000, version: str = None):
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table):
+            raise ValueError(f"잘못된 테이블 이름: {table}")
+
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self._conn = self._connect(path)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " negative INTEGER NOT NULL DEFAULT 0,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed_at)"
+        )
+        if version is not None:
+            self._check_version(version)
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        """캐시 DB 연결 (디스크 사용 불가 시 메모리 DB로 대체)"""
+        if path != ":memory:":
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                return conn
+            except (OSError, sqlite3.Error):
+                pass
+        return sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+
+    def _check_version(self, version: str):
+        """저장된 버전이 다르면 테이블을 비우고 새 버전을 기록"""
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, version TEXT NOT NULL)"
+        )
+        row = self._conn.execute(
+            "SELECT version FROM cache_meta WHERE name = ?", (self.table,)
+        ).fetchone()
+        if row is None or row[0] != version:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_meta (name, version) VALUES (?, ?)",
+                (self.table, version),
+            )
+
+    def get(self, key: str):
+        """캐시 조회 (미적중/만료 시 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, negative, expires_at FROM {self.table} WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, negative, expires_at = row
+            if expires_at < now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            if negative:
+                self.negative_hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value, ttl: float = None, negative: bool = False):
+        """캐시 저장 (ttl 미지정 시 기본 TTL)"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        data = json.dumps(value, ensure_ascii=False)
+
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table}"
+                " (key, value, negative, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, int(negative), expires_at, now),
+            )
+            self._writes += 1
+            if self._writes % _EVICT_CHECK_INTERVAL == 0:
+                self._evict()
+
+    def set_many(self, items, ttl: float = None):
+        """여러 항목을 한 트랜잭션으로 저장 ((키, 값) 목록, 대량 적재용)"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        rows = [
+            (key, json.dumps(value, ensure_ascii=False), 0, expires_at, now)
+            for key, value in items
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table}"
+                    " (key, value, negative, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._writes += len(rows)
+            self._evict()
+
+    def get_many(self, keys) -> dict:
+        """여러 키를 한 번에 조회 (만료·negative 제외, 적중 통계/LRU 시각은 갱신하지 않음)"""
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), _BATCH_SIZE):
+                batch = keys[i:i + _BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.table}"
+                    f" WHERE key IN ({placeholders}) AND negative = 0 AND expires_at >= ?",
+                    (*batch, now),
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def delete_many(self, keys):
+        """여러 키 삭제"""
+        keys = list(keys)
+        with self._lock:
+            for i in range(0, len(keys), _BATCH_SIZE):
+                batch = keys[i:i + _BATCH_SIZE]
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ({','.join('?' * len(batch))})", batch
+                )
+
+    def _evict(self):
+        """만료 항목 삭제 후 최대 항목 수 초과분을 LRU 순으로 삭제 (lock 보유 상태에서 호출)"""
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def values(self):
+        """
+        만료되지 않은 정상 항목(negative 제외)의 값을 순회.
+        전체를 한 번에 읽지 않고 key 순으로 _BATCH_SIZE건씩 읽으며, 묶음 사이에는 lock을 풀어 둡니다.
+        """
+        now = time.time()
+        last_key = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.table}"
+                    " WHERE key > ? AND negative = 0 AND expires_at >= ? ORDER BY key LIMIT ?",
+                    (last_key, now, _BATCH_SIZE),
+                ).fetchall()
+            if not rows:
+                return
+            last_key = rows[-1][0]
+            for _, value in rows:
+                yield json.loads(value)
+
+    def clear(self):
+        """전체 항목 삭제"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> dict:
+        """적중/미적중 통계"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self),
+        }
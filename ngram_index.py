@@ -0,0 +1,125 @@
+# ==========================================
+# [n-gram 인덱스] 로컬 주소 후보 검색
+# ==========================================
+# 이미 받아 둔 juso 결과(캐시/API 응답)를 문자 n-gram 역색인으로 만들어
+# 오타·접미사 누락이 있는 주소도 API 호출 없이 후보를 찾습니다.
+# - 색인 대상: 시군구, 도로명, 건물번호 (없으면 roadAddr 전체)
+# - 포스팅 리스트: array('I') (문서 id 오름차순)
+# - 점수: IDF 가중 n-gram 겹침 / 문서 n-gram 수 정규화
+
+import math
+import re
+import threading
+from array import array
+
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+
+# 문서 비율이 이 값을 넘는 n-gram은 후보 수집에서 제외 (예: "서울")
+# 단, 문서 수가 적을 때는 _MIN_DF_CAP 건까지는 제외하지 않음
+_MAX_DF_RATIO = 0.2
+_MIN_DF_CAP = 1000
+
+
+def _grams(text: str) -> set:
+    """토큰별 문자 bigram + 숫자 토큰 전체"""
+    grams = set()
+    for token in _TOKEN_PATTERN.findall(text):
+        if token.isdigit():
+            grams.add(f"#{token}")
+            continue
+        padded = f"^{token}$"
+        for i in range(len(padded) - 1):
+            grams.add(padded[i:i + 2])
+    return grams
+
+
+def _doc_text(juso: dict) -> str:
+    """색인용 텍스트: 시군구 + 도로명 + 건물번호 (+ 법정동)"""
+    if juso.get("rn") and juso.get("buldMnnm"):
+        parts = [juso.get("sggNm", ""), juso.get("emdNm", ""), juso["rn"], str(juso["buldMnnm"])]
+        if str(juso.get("buldSlno", "0")) not in ("", "0"):
+            parts.append(str(juso["buldSlno"]))
+        return " ".join(p for p in parts if p)
+    return juso.get("roadAddr", "")
+
+
+class NgramIndex:
+    """
+    juso dict에 대한 문자 n-gram 역색인 (스레드 안전, 추가 전용).
+
+    같은 roadAddr은 한 번만 색인하며, max_docs를 넘으면 더 이상 추가하지 않습니다.
+    """
+
+    def __init__(self, max_docs: int = 500_000):
+        self.max_docs = max_docs
+        self._docs = []
+        self._doc_lengths = array("H")
+        self._keys = {}
+        self._postings = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, juso: dict) -> bool:
+        """juso 1건 색인 (이미 있거나 가득 찼으면 False)"""
+        key = juso.get("roadAddr")
+        if not key or not juso.get("zipNo"):
+            return False
+
+        grams = _grams(_doc_text(juso))
+        if not grams:
+            return False
+
+        with self._lock:
+            if key in self._keys or len(self._docs) >= self.max_docs:
+                return False
+            doc_id = len(self._docs)
+            self._docs.append(juso)
+            self._doc_lengths.append(min(len(grams), 0xFFFF))
+            self._keys[key] = doc_id
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("I")
+                posting.append(doc_id)
+        return True
+
+    def add_many(self, jusos) -> int:
+        """여러 건 색인, 새로 추가된 수 반환"""
+        return sum(1 for juso in jusos if self.add(juso))
+
+    def query(self, text: str, k: int = 10) -> list:
+        """
+        입력 주소와 n-gram이 가장 많이 겹치는 후보 상위 k건을 반환합니다.
+
+        Returns:
+            list[dict]: juso dict 리스트 (점수 내림차순)
+        """
+        grams = _grams(text or "")
+        if not grams:
+            return []
+
+        with self._lock:
+            total = len(self._docs)
+            if total == 0:
+                return []
+
+            postings = [(g, self._postings[g]) for g in grams if g in self._postings]
+            max_df = max(_MIN_DF_CAP, int(total * _MAX_DF_RATIO))
+            selective = [(g, p) for g, p in postings if len(p) <= max_df]
+            if selective:
+                postings = selective
+
+            scores = {}
+            for _, posting in postings:
+                weight = math.log(1 + total / len(posting))
+                for doc_id in posting:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: item[1] / math.sqrt(self._doc_lengths[item[0]]),
+                reverse=True,
+            )
+            return [self._docs[doc_id] for doc_id, _ in ranked[:k]]
@@ -0,0 +1,188 @@
+# ==========================================
+# [속도 제한] 토큰 버킷 Rate Limiter
+# ==========================================
+# 고정 sleep 대신 API별 초당 요청 수를 제한합니다.
+# 여러 스레드가 하나의 버킷을 공유할 수 있습니다.
+# AdaptiveRate는 제한(throttle) 응답에 따라 버킷 속도를 AIMD 방식으로 조절하고,
+# CircuitBreaker는 연속 실패 시 일정 시간 요청을 차단합니다.
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷.
+
+    rate: 초당 토큰 보충량 (0 이하이면 제한 없음)
+    capacity: 최대 토큰 수 (순간 허용 요청 수, 기본값은 rate)
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self._fixed_capacity = capacity is not None
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def set_rate(self, rate: float):
+        """초당 보충량 변경 (capacity를 지정하지 않았으면 capacity도 함께 변경)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if not self._fixed_capacity:
+                self.capacity = max(1.0, rate)
+                self._tokens = min(self._tokens, self.capacity)
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """토큰을 얻기까지 남은 대기 시간 (초, 토큰은 차감하지 않음)"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 있으면 즉시 차감하고 True, 없으면 False"""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveRate:
+    """
+    AIMD 속도 조절.
+    성공 응답마다 약 1초 분량의 성공이 쌓일 때 increase만큼 올리고 (additive increase),
+    제한 응답을 받으면 decrease를 곱해 낮춥니다 (multiplicative decrease).
+    동시에 보낸 요청들이 한꺼번에 제한 응답을 받아도 cooldown 동안은 한 번만 낮춥니다.
+    """
+
+    def __init__(self, bucket: TokenBucket, min_rate: float, max_rate: float,
+                 increase: float = 1.0, decrease: float = 0.5, cooldown: float = 1.0):
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.throttled = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _current(self) -> float:
+        # 제한 없음(0 이하)은 max_rate로 간주
+        return self.bucket.rate if self.bucket.rate > 0 else self.max_rate
+
+    def on_success(self):
+        with self._lock:
+            rate = self._current()
+            if self.bucket.rate > 0 and rate < self.max_rate:
+                self.bucket.set_rate(min(self.max_rate, rate + self.increase / rate))
+
+    def on_throttle(self):
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.bucket.set_rate(max(self.min_rate, self._current() * self.decrease))
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+
+class CircuitBreaker:
+    """
+    연속 실패 failure_threshold회 → open (reset_timeout초 동안 요청 차단)
+    → half_open (시험 요청 1건 허용) → 성공 시 closed, 실패 시 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.last_error = None
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 (half_open에서는 시험 요청 1건만 허용)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def retry_after(self) -> float:
+        """open 상태에서 시험 요청이 가능해질 때까지 남은 시간 (초, 그 외 0)"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def release_probe(self):
+        """시험 요청이 성공/실패로 판정되지 않고 끝남 (예: 제한 응답) → 다음 시험 요청 허용"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._probing = False
+
+    def record_failure(self, error: str = None, trip: bool = False):
+        """실패 기록 (trip=True이면 횟수와 관계없이 즉시 open, 예: 인증 오류)"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self._probing = False
+            if trip or self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -0,0 +1,89 @@
+# ==========================================
+# [도로구간 인덱스] 도로명 + 건물번호 → 우편번호
+# ==========================================
+# 우편번호(기초구역번호)는 도로 구간과 건물번호 범위로 정해지므로,
+# 이미 받은 juso 결과를 (시군구, 도로명, 건물본번, 건물부번) 키로 모아 두면
+# 같은 도로·같은 건물의 다른 행은 API 호출 없이 해시 조회로 찾을 수 있습니다.
+# - 정확히 같은 키만 사용 (근사 검색은 ngram_index 담당)
+# - 같은 키가 여러 시도에 있으면 (예: 중구) 입력의 시도로 좁히고, 그래도 우편번호가 둘 이상이면 사용하지 않음
+# - 지하 건물은 지상 건물과 번호가 겹칠 수 있어 색인하지 않음
+
+import threading
+
+from address_parser import SIDO_ALIASES, ParsedAddress
+
+
+def _compact(text: str) -> str:
+    return "".join((text or "").split())
+
+
+def road_key(sigungu: str, road_name: str, main_no, sub_no) -> tuple:
+    """(시군구, 도로명, 본번, 부번) 정규화 키 (공백 제거, 번호는 정수)"""
+    return (_compact(sigungu), _compact(road_name), int(main_no or 0), int(sub_no or 0))
+
+
+def _juso_key(juso: dict):
+    if not juso.get("rn") or not juso.get("buldMnnm") or str(juso.get("udrtYn", "0")) == "1":
+        return None
+    try:
+        return road_key(juso.get("sggNm", ""), juso["rn"], juso["buldMnnm"], juso.get("buldSlno") or 0)
+    except ValueError:
+        return None
+
+
+class RoadIndex:
+    """
+    도로명 주소 정확 일치 인덱스 (스레드 안전, 추가 전용).
+
+    max_entries개의 키를 넘으면 더 이상 추가하지 않습니다.
+    """
+
+    def __init__(self, max_entries: int = 1_000_000):
+        self.max_entries = max_entries
+        self._entries = {}      # 키 → [juso, ...] (roadAddr 중복 없음)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, juso: dict) -> bool:
+        """juso 1건 색인 (이미 있거나, 키를 만들 수 없거나, 가득 찼으면 False)"""
+        if not juso.get("zipNo") or not juso.get("roadAddr"):
+            return False
+        key = _juso_key(juso)
+        if key is None:
+            return False
+
+        with self._lock:
+            bucket = self._entries.get(key)
+            if bucket is None:
+                if len(self._entries) >= self.max_entries:
+                    return False
+                bucket = self._entries[key] = []
+            if any(j["roadAddr"] == juso["roadAddr"] for j in bucket):
+                return False
+            bucket.append(juso)
+        return True
+
+    def add_many(self, jusos) -> int:
+        """여러 건 색인, 새로 추가된 수 반환"""
+        return sum(1 for juso in jusos if self.add(juso))
+
+    def lookup(self, parsed: ParsedAddress):
+        """
+        파싱된 도로명 주소와 키가 정확히 같은 juso (없거나 우편번호가 하나로 정해지지 않으면 None).
+        시군구가 없는 주소(세종 등)는 시도가 있어야 조회합니다.
+        """
+        if parsed.kind != "road" or not parsed.road_name or not parsed.main_no:
+            return None
+        if not parsed.sigungu and not parsed.sido:
+            return None
+
+        key = road_key(parsed.sigungu, parsed.road_name, parsed.main_no, parsed.sub_no)
+        with self._lock:
+            bucket = list(self._entries.get(key, ()))
+        if parsed.sido:
+            bucket = [j for j in bucket if SIDO_ALIASES.get(j.get("siNm", ""), j.get("siNm")) == parsed.sido]
+        if not bucket or len({j["zipNo"] for j in bucket}) > 1:
+            return None
+        return bucket[0]
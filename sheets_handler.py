@@ -3,10 +3,22 @@
 # ==========================================
 
 import re
+import threading
+import time
+from collections import OrderedDict
+
 import gspread
+from gspread.utils import Dimension, rowcol_to_a1
 from google.oauth2.service_account import Credentials
 
-from config import SERVICE_ACCOUNT_FILE, SERVICE_ACCOUNT_INFO
+from config import (
+    SERVICE_ACCOUNT_FILE,
+    SERVICE_ACCOUNT_INFO,
+    SHEET_READ_CHUNK_ROWS,
+    SPREADSHEET_CACHE_SIZE,
+    WRITE_CHUNK_CELLS,
+    WRITE_MAX_RETRIES,
+)
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
@@ -21,6 +33,54 @@ def _get_credentials():
     return Credentials.from_service_account_info(SERVICE_ACCOUNT_INFO, scopes=SCOPES)
 
 
+# 프로세스 전체에서 공유하는 인증 client / 열린 spreadsheet (URL → Spreadsheet, LRU)
+_client = None
+_spreadsheets = OrderedDict()
+_client_lock = threading.Lock()
+
+
+def _get_client(reauthorize: bool = False):
+    """인증된 gspread client (최초 1회 인증, 이후 재사용)"""
+    global _client
+    with _client_lock:
+        if _client is None or reauthorize:
+            # access token은 만료 시 google-auth가 자동 갱신
+            _client = gspread.authorize(_get_credentials())
+            _spreadsheets.clear()
+        return _client
+
+
+def _is_auth_error(error: gspread.exceptions.APIError) -> bool:
+    return getattr(error.response, "status_code", None) == 401
+
+
+def open_spreadsheet(sheet_url: str):
+    """
+    URL로 스프레드시트를 엽니다.
+    최근 SPREADSHEET_CACHE_SIZE개의 spreadsheet 핸들은 재사용하며,
+    인증 오류(401) 시 한 번 재인증 후 다시 시도합니다.
+    """
+    with _client_lock:
+        spreadsheet = _spreadsheets.get(sheet_url)
+        if spreadsheet is not None:
+            _spreadsheets.move_to_end(sheet_url)
+            return spreadsheet
+
+    try:
+        spreadsheet = _get_client().open_by_url(sheet_url)
+    except gspread.exceptions.APIError as e:
+        if not _is_auth_error(e):
+            raise
+        spreadsheet = _get_client(reauthorize=True).open_by_url(sheet_url)
+
+    with _client_lock:
+        _spreadsheets[sheet_url] = spreadsheet
+        _spreadsheets.move_to_end(sheet_url)
+        while len(_spreadsheets) > SPREADSHEET_CACHE_SIZE:
+            _spreadsheets.popitem(last=False)
+    return spreadsheet
+
+
 def connect_sheet(sheet_url: str, worksheet_name: str = None):
     """
     Google Sheets에 서비스 계정으로 연결합니다.
@@ -32,10 +92,7 @@ def connect_sheet(sheet_url: str, worksheet_name: str = None):
     Returns:
         tuple: (gspread.Worksheet, gspread.Spreadsheet)
     """
-    creds = _get_credentials()
-    gc = gspread.authorize(creds)
-
-    spreadsheet = gc.open_by_url(sheet_url)
+    spreadsheet = open_spreadsheet(sheet_url)
 
     if worksheet_name:
         worksheet = spreadsheet.worksheet(worksheet_name)
@@ -47,9 +104,7 @@ def connect_sheet(sheet_url: str, worksheet_name: str = None):
 
 def get_worksheet_names(sheet_url: str) -> list:
     """스프레드시트의 모든 워크시트 이름 반환"""
-    creds = _get_credentials()
-    gc = gspread.authorize(creds)
-    spreadsheet = gc.open_by_url(sheet_url)
+    spreadsheet = open_spreadsheet(sheet_url)
     return [ws.title for ws in spreadsheet.worksheets()]
 
 
@@ -64,8 +119,8 @@ def read_sheet_preview(worksheet, max_rows=20) -> list:
     Returns:
         list[list]: 2D 배열 (헤더 포함)
     """
-    all_values = worksheet.get_all_values()
-    return all_values[:max_rows] if len(all_values) > max_rows else all_values
+    values = worksheet.get(f"1:{max_rows}", pad_values=True)
+    return [list(row) for row in values]
 
 
 def read_all_data(worksheet) -> list:
@@ -73,6 +128,69 @@ def read_all_data(worksheet) -> list:
     return worksheet.get_all_values()
 
 
+def _column_letter(col_idx: int) -> str:
+    """0-based column 인덱스 → A1 표기 column 문자 (0 → A)"""
+    return re.sub(r"\d+", "", rowcol_to_a1(1, col_idx + 1))
+
+
+def read_columns(worksheet, col_indices: list, chunk_rows: int = None):
+    """
+    선택한 column만 행 묶음(chunk) 단위로 읽어 한 행씩 생성합니다.
+    chunk마다 선택 column들을 한 번의 batch_get으로 요청하며,
+    시트 끝의 빈 행은 get_all_values()처럼 생략합니다.
+
+    Args:
+        worksheet: gspread Worksheet 객체
+        col_indices: 읽을 column 인덱스 리스트 (0-based)
+        chunk_rows: 요청당 행 수 (None이면 SHEET_READ_CHUNK_ROWS)
+
+    Yields:
+        list: 1행(헤더)부터 순서대로 [col_indices 순서의 값, ...]
+    """
+    if chunk_rows is None:
+        chunk_rows = SHEET_READ_CHUNK_ROWS
+
+    letters = [_column_letter(idx) for idx in col_indices]
+    # row_count는 시트를 연 시점의 캐시 값이라 이후 추가된 행을 모름 →
+    # 마지막 chunk는 끝이 열린 범위(A{start}:A)로 읽어 실제 마지막 행까지 포함
+    total_rows = max(worksheet.row_count, 1)
+    pending_empty = 0  # 아직 내보내지 않은 연속 빈 행 수
+
+    for start in range(1, total_rows + 1, chunk_rows):
+        is_last = start + chunk_rows > total_rows
+        end = "" if is_last else start + chunk_rows - 1
+        value_ranges = worksheet.batch_get(
+            [f"{letter}{start}:{letter}{end}" for letter in letters],
+            major_dimension=Dimension.cols,
+        )
+        columns = [vr[0] if vr else [] for vr in value_ranges]
+        size = max((len(col) for col in columns), default=0) if is_last else chunk_rows
+
+        for offset in range(size):
+            row = [col[offset] if offset < len(col) else "" for col in columns]
+            if not any(row):
+                pending_empty += 1
+                continue
+            # 중간의 빈 행은 행 번호 유지를 위해 그대로 내보냄
+            for _ in range(pending_empty):
+                yield [""] * len(columns)
+            pending_empty = 0
+            yield row
+
+
+def get_last_modified(worksheet):
+    """
+    스프레드시트 마지막 수정 시각 (Drive API modifiedTime, 변경 감지용)
+
+    Returns:
+        str | None: RFC 3339 시각 문자열 (조회 실패 시 None)
+    """
+    try:
+        return worksheet.spreadsheet.get_lastUpdateTime()
+    except Exception:
+        return None
+
+
 def get_column_index(header_row: list, column_name: str) -> int:
     """
     헤더 행에서 column 이름의 인덱스를 반환합니다 (0-based).
@@ -95,7 +213,7 @@ def find_empty_zipcode_rows(all_data: list, addr_col_idx: int, zip_col_idx: int)
     주소가 있고 우편번호가 비어있는 행들을 찾습니다.
 
     Args:
-        all_data: 전체 시트 데이터 (헤더 포함)
+        all_data: 시트 데이터 (헤더 포함, 리스트 또는 read_columns 같은 행 generator)
         addr_col_idx: 주소 column 인덱스
         zip_col_idx: 우편번호 column 인덱스
 
@@ -121,31 +239,149 @@ def find_empty_zipcode_rows(all_data: list, addr_col_idx: int, zip_col_idx: int)
     return rows_to_process
 
 
-def write_results(worksheet, results: list, zip_col_idx: int, acc_col_idx: int):
+def _parse_accuracy(text: str):
+    """정확도 셀 값 ("85%", "85") → 정수 (빈 값/형식 오류는 None)"""
+    text = text.strip().rstrip("%").strip()
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+def find_known_zipcode_pairs(all_data: list, addr_col_idx: int, zip_col_idx: int,
+                             acc_col_idx: int = -1, min_accuracy: int = 0) -> list:
+    """
+    주소와 우편번호가 모두 있는 행의 (주소, 우편번호) 쌍을 찾습니다 (warm start용).
+    정확도 column이 있으면 값이 min_accuracy 미만인 행(낮은 정확도로 자동 입력된 행)은 제외하고,
+    정확도가 비어있는 행은 직접 입력한 값으로 보고 포함합니다.
+
+    Args:
+        all_data: 시트 데이터 (헤더 포함)
+        addr_col_idx: 주소 column 인덱스
+        zip_col_idx: 우편번호 column 인덱스
+        acc_col_idx: 정확도 column 인덱스 (-1이면 없음)
+        min_accuracy: 포함할 최소 정확도
+
+    Returns:
+        list[tuple]: [(주소, 우편번호), ...]
+    """
+    pairs = []
+
+    for i, row in enumerate(all_data):
+        if i == 0:  # 헤더 스킵
+            continue
+
+        address = row[addr_col_idx].strip() if addr_col_idx < len(row) else ""
+        zipcode = row[zip_col_idx].strip() if zip_col_idx < len(row) else ""
+        if not address or not zipcode:
+            continue
+
+        if 0 <= acc_col_idx < len(row):
+            accuracy = _parse_accuracy(row[acc_col_idx])
+            if accuracy is not None and accuracy < min_accuracy:
+                continue
+
+        pairs.append((address, zipcode))
+
+    return pairs
+
+
+def _coalesce_runs(values_by_row: dict, max_cells: int) -> list:
+    """
+    {row_num: 값} → 연속된 행 구간 리스트 [(시작 행, [값, ...]), ...]
+    구간 하나의 길이는 max_cells를 넘지 않습니다.
+    """
+    runs = []
+    for row_num in sorted(values_by_row):
+        if (
+            runs
+            and runs[-1][0] + len(runs[-1][1]) == row_num
+            and len(runs[-1][1]) < max_cells
+        ):
+            runs[-1][1].append(values_by_row[row_num])
+        else:
+            runs.append((row_num, [values_by_row[row_num]]))
+    return runs
+
+
+def _send_ranges(worksheet, ranges: list) -> bool:
+    """value range 묶음을 한 번의 batch_update로 기록 (재시도 포함)"""
+    for attempt in range(WRITE_MAX_RETRIES):
+        try:
+            worksheet.batch_update(
+                [{"range": r["range"], "values": r["values"]} for r in ranges],
+                value_input_option="USER_ENTERED",
+            )
+            return True
+        except Exception:
+            if attempt < WRITE_MAX_RETRIES - 1:
+                time.sleep(2 ** attempt)
+    return False
+
+
+def write_results(worksheet, results: list, zip_col_idx: int, acc_col_idx: int) -> dict:
     """
     결과를 시트에 일괄 기록합니다.
+    column별로 연속된 행을 하나의 범위(B5:B9 등)로 묶어 value range로 보내고,
+    요청당 셀 수가 WRITE_CHUNK_CELLS를 넘지 않도록 나눕니다.
+    실패한 요청은 재시도 후 범위 단위로 하나씩 다시 보냅니다.
 
     Args:
         worksheet: gspread Worksheet 객체
         results: [{row_num, zipcode, accuracy}, ...]
         zip_col_idx: 우편번호 column 인덱스 (0-based)
         acc_col_idx: 정확도 column 인덱스 (0-based)
+
+    Returns:
+        dict: {"cells": 기록한 셀 수, "requests": 요청 수, "failed_rows": 기록 실패 행 번호 리스트}
     """
+    summary = {"cells": 0, "requests": 0, "failed_rows": []}
     if not results:
-        return
-
-    # batch update로 효율적 기록
-    cells_to_update = []
-
-    for r in results:
-        row_num = r["row_num"]
-        # gspread cell 좌표는 (row, col) 1-based
-        zip_cell = gspread.Cell(row_num, zip_col_idx + 1, value=r["zipcode"])
-        cells_to_update.append(zip_cell)
-
-        if acc_col_idx >= 0:
-            acc_value = f'{r["accuracy"]}%'
-            acc_cell = gspread.Cell(row_num, acc_col_idx + 1, value=acc_value)
-            cells_to_update.append(acc_cell)
+        return summary
+
+    columns = {zip_col_idx: {r["row_num"]: r["zipcode"] for r in results}}
+    if acc_col_idx >= 0:
+        columns[acc_col_idx] = {r["row_num"]: f'{r["accuracy"]}%' for r in results}
+
+    # column별 연속 구간 → A1 범위
+    ranges = []
+    for col_idx, values_by_row in columns.items():
+        letter = _column_letter(col_idx)
+        for start, values in _coalesce_runs(values_by_row, WRITE_CHUNK_CELLS):
+            end = start + len(values) - 1
+            ranges.append({
+                "range": f"{letter}{start}:{letter}{end}",
+                "rows": range(start, end + 1),
+                "values": [[v] for v in values],
+            })
 
-    worksheet.update_cells(cells_to_update, value_input_option="USER_ENTERED")
+    # 요청당 셀 수 제한으로 묶기
+    chunks, chunk, chunk_cells = [], [], 0
+    for r in ranges:
+        if chunk and chunk_cells + len(r["values"]) > WRITE_CHUNK_CELLS:
+            chunks.append(chunk)
+            chunk, chunk_cells = [], 0
+        chunk.append(r)
+        chunk_cells += len(r["values"])
+    if chunk:
+        chunks.append(chunk)
+
+    failed_rows = set()
+    for chunk in chunks:
+        summary["requests"] += 1
+        if _send_ranges(worksheet, chunk):
+            summary["cells"] += sum(len(r["values"]) for r in chunk)
+            continue
+        if len(chunk) == 1:
+            failed_rows.update(chunk[0]["rows"])
+            continue
+        # 묶음 실패 → 범위별로 개별 재시도
+        for r in chunk:
+            summary["requests"] += 1
+            if _send_ranges(worksheet, [r]):
+                summary["cells"] += len(r["values"])
+            else:
+                failed_rows.update(r["rows"])
+
+    summary["failed_rows"] = sorted(failed_rows)
+    return summary
@@ -0,0 +1,90 @@
+# ==========================================
+# [단계 순서 정책] 정규식/재시도/Gemini 실행 순서
+# ==========================================
+# gemini_first: Gemini 정제 → 정규식 → 키워드 재시도 (기존 순서)
+# cheap_first:  정규식 → 키워드 재시도 → Gemini (앞 단계 정확도가 GEMINI_GATE_ACCURACY 미만일 때만)
+# adaptive:     최근 행들의 정규식 단계 성공률을 보고 두 순서 중 하나를 고름
+#               (성공률이 낮으면 대부분 Gemini까지 가므로 Gemini를 먼저 호출)
+#               성공률 기록은 실행(process_rows 호출)마다 new_adaptive_order()로 새로 만들어 넘깁니다.
+
+import threading
+from collections import deque
+
+from config import (
+    ADAPTIVE_CHEAP_MIN_SUCCESS,
+    ADAPTIVE_EXPLORE_EVERY,
+    ADAPTIVE_MIN_SAMPLES,
+    ADAPTIVE_WINDOW,
+    STAGE_ORDER_POLICY,
+)
+
+GEMINI_FIRST = ("gemini", "regex", "retry")
+CHEAP_FIRST = ("regex", "retry", "gemini")
+
+POLICIES = ("gemini_first", "cheap_first", "adaptive")
+
+
+class AdaptiveStageOrder:
+    """
+    정규식 단계가 맨 앞에서 실행된 최근 window건의 성공(정확도 80 이상) 여부를 기록하고
+    성공률이 min_success 이상이면 cheap_first, 미만이면 gemini_first 순서를 고릅니다.
+    gemini_first 동안에도 explore_every건마다 한 번은 cheap_first로 실행해 성공률을 갱신합니다.
+    """
+
+    def __init__(self, window: int, min_samples: int, min_success: float, explore_every: int):
+        self.min_samples = min_samples
+        self.min_success = min_success
+        self.explore_every = max(1, explore_every)
+        self._outcomes = deque(maxlen=window)
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def cheap_first(self) -> bool:
+        with self._lock:
+            self._calls += 1
+            if len(self._outcomes) < self.min_samples:
+                return True
+            if self._calls % self.explore_every == 0:
+                return True
+            return sum(self._outcomes) / len(self._outcomes) >= self.min_success
+
+    def record(self, success: bool):
+        """맨 앞에서 실행된 정규식 단계의 성공 여부"""
+        with self._lock:
+            self._outcomes.append(bool(success))
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = len(self._outcomes)
+            return {
+                "samples": n,
+                "cheap_success_rate": sum(self._outcomes) / n if n else None,
+            }
+
+
+def new_adaptive_order() -> AdaptiveStageOrder:
+    """실행 하나에 쓸 adaptive 정책 상태 (이전 실행/다른 시트의 성공률이 섞이지 않도록 실행마다 생성)"""
+    return AdaptiveStageOrder(
+        ADAPTIVE_WINDOW, ADAPTIVE_MIN_SAMPLES, ADAPTIVE_CHEAP_MIN_SUCCESS, ADAPTIVE_EXPLORE_EVERY
+    )
+
+
+def prefetch_gemini() -> bool:
+    """모든 주소를 처음부터 Gemini로 일괄 정제할지 (gemini_first 정책)"""
+    return STAGE_ORDER_POLICY == "gemini_first"
+
+
+def stage_order(use_gemini: bool, policy: str = None, adaptive: AdaptiveStageOrder = None) -> tuple:
+    """
+    이번 주소에 적용할 단계 순서
+    (adaptive 정책인데 실행 상태가 없으면, 즉 단건 조회면 표본이 없을 때처럼 cheap_first)
+    """
+    if not use_gemini:
+        return ("regex", "retry")
+
+    policy = policy or STAGE_ORDER_POLICY
+    if policy == "gemini_first":
+        return GEMINI_FIRST
+    if policy == "adaptive" and adaptive is not None:
+        return CHEAP_FIRST if adaptive.cheap_first() else GEMINI_FIRST
+    return CHEAP_FIRST
@@ -0,0 +1,114 @@
+# ==========================================
+# [CLI] sheet 명령 smoke test (가짜 워크시트 + 가짜 주소 API)
+# ==========================================
+
+import re
+
+import pytest
+
+import cli
+import http_client
+import job_journal
+import sheets_handler
+import zipcode_helper
+
+JUSO = {
+    "roadAddr": "서울특별시 강남구 테헤란로 152 (역삼동)",
+    "zipNo": "06236",
+    "siNm": "서울특별시",
+    "sggNm": "강남구",
+    "emdNm": "역삼동",
+    "rn": "테헤란로",
+    "buldMnnm": "152",
+    "buldSlno": "0",
+}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+        self.text = ""
+
+    def json(self):
+        return self._data
+
+
+class FakeSpreadsheet:
+    id = "sheet-1"
+    title = "주소록"
+
+
+class FakeWorksheet:
+    """read_sheet_preview / read_columns / write_results가 쓰는 gspread 메서드만 구현"""
+
+    id = 0
+    title = "Sheet1"
+    spreadsheet = FakeSpreadsheet()
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.row_count = len(rows)
+        self.updates = []
+
+    def get(self, a1, pad_values=False):
+        last = int(a1.split(":")[1])
+        return self.rows[:last]
+
+    def batch_get(self, ranges, major_dimension=None):
+        out = []
+        for a1 in ranges:
+            letter, start, end = re.fullmatch(r"([A-Z]+)(\d+):[A-Z]+(\d*)", a1).groups()
+            col = ord(letter) - ord("A")
+            stop = int(end) if end else len(self.rows)
+            values = [row[col] if col < len(row) else "" for row in self.rows[int(start) - 1:stop]]
+            while values and not values[-1]:
+                values.pop()
+            out.append([values] if values else [])
+        return out
+
+    def batch_update(self, data, value_input_option=None):
+        self.updates.extend(data)
+
+
+@pytest.fixture
+def fake_env(monkeypatch, tmp_path):
+    rows = [
+        ["주소", "우편번호", "정확도"],
+        ["서울 강남구 테헤란로 152 3층", "", ""],
+        ["", "", ""],
+    ]
+    worksheet = FakeWorksheet(rows)
+
+    def fake_request(name, method, url, timeout, limiter=None, **kwargs):
+        return FakeResponse({"results": {"common": {"errorCode": "0"}, "juso": [JUSO]}})
+
+    monkeypatch.setattr(sheets_handler, "connect_sheet",
+                        lambda url, name=None: (worksheet, worksheet.spreadsheet))
+    monkeypatch.setattr(http_client, "request", fake_request)
+    monkeypatch.setattr(job_journal, "JOB_JOURNAL_DIR", str(tmp_path))
+    for flag in ("LOOKUP_CACHE_ENABLED", "WARM_START_ENABLED", "LOCAL_INDEX_ENABLED", "ROAD_INDEX_ENABLED"):
+        monkeypatch.setattr(zipcode_helper, flag, False)
+    return worksheet
+
+
+def test_sheet_command_writes_results(fake_env):
+    code = cli.main([
+        "sheet", "https://docs.google.com/spreadsheets/d/x",
+        "--address-col", "주소", "--zip-col", "우편번호", "--acc-col", "정확도", "--no-gemini",
+    ])
+
+    assert code == cli.EXIT_OK
+    written = {u["range"]: u["values"] for u in fake_env.updates}
+    assert written["B2:B2"] == [["06236"]]
+    assert "C2:C2" in written
+
+
+def test_sheet_command_unknown_column(fake_env):
+    code = cli.main([
+        "sheet", "https://docs.google.com/spreadsheets/d/x",
+        "--address-col", "주소", "--zip-col", "없는열", "--no-gemini",
+    ])
+
+    assert code == cli.EXIT_USAGE
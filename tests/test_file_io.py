@@ -0,0 +1,37 @@
+# ==========================================
+# [파일 입출력] 결과 column 위치 (짧은 행 / 긴 행 / 헤더 이름 충돌)
+# ==========================================
+
+import csv
+
+import batch_runner
+from file_io import process_file
+
+
+def _fake_process_rows(rows, **kwargs):
+    return [
+        {"row_num": r["row_num"], "address": r["address"], "zipcode": "06236",
+         "road_addr": "서울특별시 강남구 테헤란로 152", "accuracy": 100, "source": "regex+api"}
+        for r in rows
+    ]
+
+
+def test_result_columns_start_after_header(monkeypatch, tmp_path):
+    monkeypatch.setattr(batch_runner, "process_rows", _fake_process_rows)
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    src.write_text(
+        "id,주소,우편번호\n"
+        "1,서울 강남구 테헤란로 152\n"
+        "2,서울 강남구 테헤란로 152,,extra1,extra2\n",
+        encoding="utf-8-sig",
+    )
+
+    summary = process_file(str(src), str(out), "주소", use_gemini=False, use_warm_start=False)
+
+    with open(out, encoding="utf-8-sig", newline="") as f:
+        header, short_row, long_row = list(csv.reader(f))
+    assert header == ["id", "주소", "우편번호", "조회_우편번호", "정확도", "출처", "매칭주소"]
+    assert short_row[3:5] == ["06236", "100%"]
+    assert long_row[3:5] == ["06236", "100%"]
+    assert long_row[7:] == ["extra1", "extra2"]
+    assert summary["found"] == 2
@@ -0,0 +1,267 @@
+# ==========================================
+# [실행 추적] 단계별 소요 시간 / API 호출 수 집계
+# ==========================================
+# recommend_zipcode 한 번(주소 1건)의 추적 정보를 스레드 로컬 Trace에 모읍니다.
+# http_client, 캐시 조회 등 하위 모듈은 tracing.count()만 호출하고,
+# 활성 Trace가 없으면 아무 일도 하지 않습니다.
+# RunMetrics는 행별 Trace를 모아 실행 요약(처리량, 단계별 시간, 호출 수)을 만듭니다.
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import wait
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class Trace:
+    """
+    주소 1건(또는 하나의 처리 단계)의 추적 정보.
+    wrap()으로 다른 스레드에 넘겨 함께 기록할 수 있도록 스레드 안전합니다.
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.stages = {}            # 단계 이름 → 소요 시간 (초)
+        self.exit_stage = None      # 결과를 반환한 단계
+        self._started = time.perf_counter()
+        self._elapsed = None
+        self._lock = threading.Lock()
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def add_time(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def absorb(self, other: "Trace"):
+        """다른 Trace의 카운터와 단계 시간을 더함 (따로 실행한 단계의 결과를 채택할 때)"""
+        with other._lock:
+            counters = Counter(other.counters)
+            stages = dict(other.stages)
+        with self._lock:
+            self.counters.update(counters)
+            for stage, seconds in stages.items():
+                self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def finish(self):
+        if self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._started
+
+    def to_dict(self) -> dict:
+        self.finish()
+        with self._lock:
+            return {
+                "total_ms": round(self._elapsed * 1000, 1),
+                "stages_ms": {k: round(v * 1000, 1) for k, v in self.stages.items()},
+                "counters": dict(self.counters),
+                "exit_stage": self.exit_stage,
+            }
+
+
+def current():
+    """현재 스레드의 활성 Trace (없으면 None)"""
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def collect(trace: Trace = None):
+    """
+    블록 안에서 발생한 호출/단계를 trace에 기록합니다 (None이면 새 Trace).
+    중첩 가능하며, 블록이 끝나면 이전 Trace가 다시 활성화됩니다.
+    """
+    trace = trace if trace is not None else Trace()
+    previous = current()
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def count(name: str, n: int = 1):
+    """활성 Trace의 카운터 증가 (예: "juso_requests", "juso_cache_hits")"""
+    trace = current()
+    if trace is not None:
+        trace.count(name, n)
+
+
+@contextmanager
+def stage(name: str):
+    """블록 소요 시간을 활성 Trace의 단계 시간에 더하고, 마지막 실행 단계로 기록"""
+    trace = current()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_time(name, time.perf_counter() - started)
+        trace.exit_stage = name
+
+
+def wrap(fn):
+    """현재 Trace를 worker 스레드에서도 활성화하도록 fn을 감쌉니다."""
+    trace = current()
+    if trace is None:
+        return fn
+
+    def bound(*args, **kwargs):
+        with collect(trace):
+            return fn(*args, **kwargs)
+
+    return bound
+
+
+def current_run():
+    """현재 스레드에 연결된 RunMetrics (RunMetrics.wrap으로 실행 중일 때만, 없으면 None)"""
+    return getattr(_local, "run", None)
+
+
+def merge(first: dict, second: dict) -> dict:
+    """Trace.to_dict() 두 개를 합침 (나눠서 실행한 같은 주소의 조회, exit_stage는 나중 것)"""
+    if not first:
+        return second
+    stages = dict(first["stages_ms"])
+    for name, ms in second["stages_ms"].items():
+        stages[name] = round(stages.get(name, 0.0) + ms, 1)
+    counters = Counter(first["counters"])
+    counters.update(second["counters"])
+    return {
+        "total_ms": round(first["total_ms"] + second["total_ms"], 1),
+        "stages_ms": stages,
+        "counters": dict(counters),
+        "exit_stage": second["exit_stage"] or first["exit_stage"],
+    }
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class RunMetrics:
+    """
+    한 번의 실행(시트/파일) 요약.
+    process_rows가 주소 그룹마다 add_row_trace를, 앱/CLI가 시트 읽기·쓰기 등을 add_phase로 기록합니다.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.lookups = 0
+        self.resumed = 0
+        self.counters = Counter()
+        self.stage_seconds = Counter()
+        self.phase_seconds = Counter()
+        self.exit_stages = Counter()
+        self.sources = Counter()
+        self.latencies = []
+        self.discarded_counters = Counter()   # 결과를 버린 동시 실행 단계의 호출 수 (counters에도 포함)
+        self._discarded_pending = set()
+        self._started = time.perf_counter()
+        self._elapsed = None
+        self._lock = threading.Lock()
+
+    def finish(self):
+        """
+        처리 종료 시각 고정 (이후 summary()의 경과 시간/처리량 기준).
+        결과를 버렸지만 아직 실행 중인 단계가 있으면 끝날 때까지 기다려 호출 수를 빠짐없이 집계합니다.
+        """
+        with self._lock:
+            pending = list(self._discarded_pending)
+        if pending:
+            wait(pending)
+        if self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._started
+
+    def add_row_trace(self, trace: dict, rows: int = 1, source: str = None):
+        """주소 1건 조회 결과 (같은 주소의 행 rows개에 공유, 조회 중 예외 시 trace는 None)"""
+        with self._lock:
+            self.rows += rows
+            self.lookups += 1
+            if source:
+                self.sources[source] += rows
+            if not trace:
+                return
+            self.counters.update(trace["counters"])
+            for stage_name, ms in trace["stages_ms"].items():
+                self.stage_seconds[stage_name] += ms / 1000
+            self.exit_stages[trace["exit_stage"] or "none"] += 1
+            self.latencies.append(trace["total_ms"])
+
+    def add_discarded(self, future, trace: Trace):
+        """
+        조기 종료로 결과를 버렸지만 이미 실행 중인 단계 (future가 끝나면 trace의 카운터를 합산).
+        버린 단계의 API 호출도 실제 트래픽이므로 counters에 더하고 discarded_counters로 따로 보여 줍니다.
+        """
+        with self._lock:
+            self._discarded_pending.add(future)
+
+        def absorb(done):
+            counters = trace.to_dict()["counters"]
+            with self._lock:
+                self._discarded_pending.discard(done)
+                self.counters.update(counters)
+                self.discarded_counters.update(counters)
+
+        future.add_done_callback(absorb)
+
+    def wrap(self, fn):
+        """fn 실행 중 current_run()이 이 RunMetrics를 가리키도록 감쌈 (행 worker용)"""
+        def bound(*args, **kwargs):
+            previous = current_run()
+            _local.run = self
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _local.run = previous
+
+        return bound
+
+    def add_phase(self, name: str, seconds: float, trace: dict = None):
+        """행 단위가 아닌 처리 단계 (Gemini 일괄 정제, 시트 읽기/쓰기 등)"""
+        with self._lock:
+            self.phase_seconds[name] += seconds
+            if trace:
+                self.counters.update(trace["counters"])
+
+    @contextmanager
+    def phase(self, name: str):
+        """블록 소요 시간과 그 안의 API 호출 수를 name 단계로 기록"""
+        started = time.perf_counter()
+        with collect() as trace:
+            try:
+                yield
+            finally:
+                self.add_phase(name, time.perf_counter() - started, trace.to_dict())
+
+    def summary(self) -> dict:
+        with self._lock:
+            wall = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+            rows = self.rows + self.resumed
+            per_row = {k: round(v / self.rows, 3) for k, v in self.counters.items()} if self.rows else {}
+            return {
+                "rows": rows,
+                "resumed_rows": self.resumed,
+                "lookups": self.lookups,
+                "wall_seconds": round(wall, 2),
+                "rows_per_sec": round(self.rows / wall, 2) if wall > 0 else 0.0,
+                "lookup_latency_ms": {
+                    "p50": round(_percentile(self.latencies, 0.50), 1),
+                    "p95": round(_percentile(self.latencies, 0.95), 1),
+                    "max": round(max(self.latencies), 1) if self.latencies else 0.0,
+                },
+                "stage_seconds": {k: round(v, 2) for k, v in self.stage_seconds.items()},
+                "phase_seconds": {k: round(v, 2) for k, v in self.phase_seconds.items()},
+                "counters": dict(self.counters),
+                "counters_per_row": per_row,
+                "discarded_counters": dict(self.discarded_counters),
+                "exit_stages": dict(self.exit_stages),
+                "sources": dict(self.sources),
+            }
@@ -3,97 +3,476 @@
 # ==========================================
 # 원본 코드를 기반으로 Gemini fallback 통합
 
-import re
-import requests
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from difflib import SequenceMatcher
 
-from config import JUSO_API_KEY
+from config import (
+    GEMINI_GATE_ACCURACY,
+    JUSO_API_KEYS,
+    JUSO_BACKEND,
+    JUSO_OFFLINE_DB_PATH,
+    JUSO_BREAKER_RESET,
+    JUSO_BREAKER_THRESHOLD,
+    JUSO_RATE_DECREASE,
+    JUSO_RATE_INCREASE,
+    JUSO_RATE_LIMIT,
+    JUSO_RATE_MAX,
+    JUSO_RATE_MIN,
+    JUSO_THROTTLE_RETRIES,
+    JUSO_TIMEOUT,
+    KNOWN_PAIRS_MAX_ENTRIES,
+    KNOWN_PAIRS_TTL,
+    KEY_ACQUIRE_MAX_WAIT,
+    KEY_THROTTLE_COOLDOWN,
+    LOCAL_INDEX_ENABLED,
+    LOCAL_INDEX_MAX_DOCS,
+    LOCAL_INDEX_MIN_ACCURACY,
+    LOOKUP_CACHE_ENABLED,
+    LOOKUP_CACHE_PATH,
+    LOOKUP_CACHE_TTL,
+    LOOKUP_CACHE_NEGATIVE_TTL,
+    LOOKUP_CACHE_MAX_ENTRIES,
+    ROAD_INDEX_ENABLED,
+    ROAD_INDEX_MAX_ENTRIES,
+    SPECULATIVE_STAGES,
+    STAGE_EXECUTOR_WORKERS,
+    WARM_START_ENABLED,
+)
+import http_client
+import tracing
+from address_parser import parse_address
+from address_scoring import score_candidates
 from gemini_helper import refine_address_with_gemini
+from juso_offline import OfflineJusoBackend
+from key_pool import KeyPool
+from lookup_cache import LookupCache
+from ngram_index import NgramIndex
+from road_index import RoadIndex
+from stage_policy import stage_order
+
+# 환경 변수로 대체 가능 (벤치마크용 로컬 stub 서버 등)
+JUSO_API_URL = os.environ.get("JUSO_API_URL", "https://business.juso.go.kr/addrlink/addrLinkApi.do")
+
+# 모든 worker가 공유하는 API 키 풀 (키별 속도 제한 + 제한 응답 시 AIMD 조절 + 연속 실패 차단기)
+_juso_keys = KeyPool(
+    "juso", JUSO_API_KEYS, JUSO_RATE_LIMIT, JUSO_BREAKER_THRESHOLD, JUSO_BREAKER_RESET,
+    min_rate=JUSO_RATE_MIN, max_rate=JUSO_RATE_MAX,
+    increase=JUSO_RATE_INCREASE, decrease=JUSO_RATE_DECREASE,
+    throttle_cooldown=KEY_THROTTLE_COOLDOWN, max_wait=KEY_ACQUIRE_MAX_WAIT,
+)
+
+_juso_cache = None
+_juso_cache_lock = threading.Lock()
+
+_offline_backend = None
+_offline_backend_lock = threading.Lock()
+
+_local_index = None
+_local_index_lock = threading.Lock()
+
+_road_index = None
+_road_index_lock = threading.Lock()
+
+_known_cache = None
+_known_cache_lock = threading.Lock()
+
+_index_seed_thread = None
+_index_seed_lock = threading.Lock()
+
+_stage_executor = None
+_stage_executor_lock = threading.Lock()
+
+
+def get_offline_backend():
+    """오프라인 주소DB 백엔드 (JUSO_BACKEND == "offline"일 때만 생성)"""
+    global _offline_backend
+    if JUSO_BACKEND != "offline":
+        return None
+    if _offline_backend is None:
+        with _offline_backend_lock:
+            if _offline_backend is None:
+                _offline_backend = OfflineJusoBackend(JUSO_OFFLINE_DB_PATH)
+    return _offline_backend
+
+
+def get_juso_cache():
+    """도로명주소 API 응답 캐시 (최초 호출 시 생성, 비활성화 시 None)"""
+    global _juso_cache
+    if not LOOKUP_CACHE_ENABLED:
+        return None
+    if _juso_cache is None:
+        with _juso_cache_lock:
+            if _juso_cache is None:
+                _juso_cache = LookupCache(
+                    LOOKUP_CACHE_PATH,
+                    table="juso",
+                    ttl=LOOKUP_CACHE_TTL,
+                    max_entries=LOOKUP_CACHE_MAX_ENTRIES,
+                )
+    return _juso_cache
+
+
+def get_local_index():
+    """
+    로컬 n-gram 인덱스 (최초 호출 시 빈 인덱스로 생성, 비활성화 시 None)
+    조회 캐시에 쌓인 결과는 _seed_indexes가 행 worker 밖에서 적재하고,
+    이후 API 응답은 search_zipcode_api에서 계속 추가됩니다.
+    """
+    global _local_index
+    if not LOCAL_INDEX_ENABLED:
+        return None
+    if _local_index is None:
+        with _local_index_lock:
+            if _local_index is None:
+                _local_index = NgramIndex(max_docs=LOCAL_INDEX_MAX_DOCS)
+        start_index_seed()
+    return _local_index
+
+
+def get_known_cache():
+    """확인된 주소 캐시: 정규화 주소 키 → {zipcode, address} (warm start 비활성화 시 None)"""
+    global _known_cache
+    if not WARM_START_ENABLED:
+        return None
+    if _known_cache is None:
+        with _known_cache_lock:
+            if _known_cache is None:
+                _known_cache = LookupCache(
+                    LOOKUP_CACHE_PATH,
+                    table="known",
+                    ttl=KNOWN_PAIRS_TTL,
+                    max_entries=KNOWN_PAIRS_MAX_ENTRIES,
+                )
+    return _known_cache
+
+
+def get_road_index():
+    """
+    도로구간 정확 일치 인덱스 (최초 호출 시 빈 인덱스로 생성, 비활성화 시 None)
+    조회 캐시와 확인된 주소 캐시는 _seed_indexes가 행 worker 밖에서 적재하고,
+    이후 API 응답은 search_zipcode_api에서, 시트의 기존 우편번호는 warm_start에서 계속 추가됩니다.
+    """
+    global _road_index
+    if not ROAD_INDEX_ENABLED:
+        return None
+    if _road_index is None:
+        with _road_index_lock:
+            if _road_index is None:
+                _road_index = RoadIndex(max_entries=ROAD_INDEX_MAX_ENTRIES)
+        start_index_seed()
+    return _road_index
+
+
+def _seed_indexes():
+    """
+    조회 캐시를 한 번만 읽어 로컬 n-gram 인덱스와 도로구간 인덱스에 함께 적재
+    (두 인덱스가 같은 juso 객체를 공유하므로 JSON 파싱·메모리가 한 벌)
+    """
+    indexes = [index for index in (get_local_index(), get_road_index()) if index is not None]
+    if not indexes:
+        return
+    cache = get_juso_cache()
+    if cache is not None:
+        for jusos in cache.values():
+            for index in indexes:
+                index.add_many(jusos)
+    road = get_road_index()
+    known = get_known_cache()
+    if road is not None and known is not None:
+        for entry in known.values():
+            juso = _known_juso(entry["address"], entry["zipcode"])
+            if juso is not None:
+                road.add(juso)
+
+
+def start_index_seed():
+    """인덱스 적재를 백그라운드 스레드로 시작 (프로세스당 한 번, 적재 중에도 조회는 막히지 않음)"""
+    global _index_seed_thread
+    with _index_seed_lock:
+        if _index_seed_thread is None:
+            _index_seed_thread = threading.Thread(target=_seed_indexes, name="index-seed", daemon=True)
+            _index_seed_thread.start()
+        return _index_seed_thread
+
+
+def prepare_indexes():
+    """
+    처리 시작 전에 인덱스 적재를 끝까지 기다림 (process_rows가 worker 시작 전에 호출).
+    첫 행부터 같은 인덱스를 보게 되어 결과가 실행 순서에 따라 달라지지 않습니다.
+    """
+    if not (LOCAL_INDEX_ENABLED or ROAD_INDEX_ENABLED):
+        return
+    start_index_seed().join()
+
+
+def _known_juso(address, zipcode):
+    """시트의 (도로명 주소, 우편번호) → 도로구간 인덱스용 juso dict (도로명 주소가 아니면 None)"""
+    parsed = parse_address(address)
+    if parsed.kind != "road" or not parsed.road_name or not parsed.main_no:
+        return None
+    return {
+        "roadAddr": parsed.base,
+        "zipNo": zipcode,
+        "siNm": parsed.sido,
+        "sggNm": parsed.sigungu,
+        "rn": parsed.road_name,
+        "buldMnnm": str(parsed.main_no),
+        "buldSlno": str(parsed.sub_no),
+    }
 
 
-def search_zipcode_api(keyword, api_key=None):
-    """행안부 도로명주소 API 조회"""
-    if not keyword:
-        return []
+def _known_key(parsed):
+    """
+    확인된 주소 캐시 키 (도로구간 인덱스와 같은 기준: 도로명/지번 주소 + 번호 + 시도나 시군구).
+    지역이 없는 키(예: road:||중앙로|10)는 다른 지역의 같은 이름 도로와 섞이므로 None
+    """
+    if parsed.kind == "road":
+        named = parsed.road_name
+    elif parsed.kind == "jibun":
+        named = parsed.emd
+    else:
+        return None
+    if not named or not parsed.main_no or not (parsed.sido or parsed.sigungu):
+        return None
+    return parsed.key
+
+
+def warm_start(pairs):
+    """
+    시트에 이미 있는 (주소, 우편번호) 쌍을 확인된 주소 캐시와 도로구간 인덱스에 넣습니다.
+    같은 주소 키에 서로 다른 우편번호가 있으면 (이번 입력 안에서든 이미 저장된 항목과든)
+    그 키는 넣지 않고 저장된 항목도 지웁니다.
+
+    Args:
+        pairs: [(주소, 우편번호), ...]
 
-    if api_key is None:
-        api_key = JUSO_API_KEY
+    Returns:
+        dict: {"pairs": 입력 쌍 수, "added": 저장한 주소 키 수, "conflicts": 우편번호가 엇갈린 키 수,
+               "invalid": 우편번호 형식 오류 수, "skipped": 지역/번호가 없어 건너뛴 쌍 수}
+    """
+    summary = {"pairs": 0, "added": 0, "conflicts": 0, "invalid": 0, "skipped": 0}
+    known = {}
+    conflicts = set()
+    for address, zipcode in pairs:
+        summary["pairs"] += 1
+        zipcode = normalize_zipcode(zipcode).replace("-", "")
+        if len(zipcode) != 5 or not zipcode.isdigit():
+            summary["invalid"] += 1
+            continue
+        key = _known_key(parse_address(address))
+        if key is None:
+            summary["skipped"] += 1
+            continue
+        entry = known.get(key)
+        if entry is None:
+            known[key] = {"zipcode": zipcode, "address": address.strip()}
+        elif entry["zipcode"] != zipcode:
+            conflicts.add(key)
+    for key in conflicts:
+        del known[key]
+
+    cache = get_known_cache()
+    if cache is not None:
+        stored = cache.get_many(known)
+        stale = [key for key, entry in stored.items() if entry["zipcode"] != known[key]["zipcode"]]
+        for key in stale:
+            del known[key]
+        conflicts.update(stale)
+        cache.delete_many(conflicts)
+        cache.set_many(known.items())
+    summary["conflicts"] = len(conflicts)
+    summary["added"] = len(known)
+
+    index = get_road_index()
+    if index is not None:
+        for entry in known.values():
+            juso = _known_juso(entry["address"], entry["zipcode"])
+            if juso is not None:
+                index.add(juso)
+    return summary
+
+
+def _get_stage_executor():
+    """단계 동시 실행용 스레드 풀 (행 worker가 제출하므로 행 worker pool과 분리)"""
+    global _stage_executor
+    if _stage_executor is None:
+        with _stage_executor_lock:
+            if _stage_executor is None:
+                _stage_executor = ThreadPoolExecutor(
+                    max_workers=STAGE_EXECUTOR_WORKERS, thread_name_prefix="stage"
+                )
+    return _stage_executor
+
+
+def _normalize_keyword(keyword):
+    """캐시 키용 키워드 정규화 (공백 정리 + 소문자)"""
+    return " ".join(keyword.split()).lower()
+
+
+# 도로명주소 API errorCode 분류
+JUSO_AUTH_ERRORS = {"E0001", "E0014"}                 # 승인되지 않은 키 / 키 기간 만료
+JUSO_INVALID_QUERY_ERRORS = {                         # 검색어 문제 (같은 검색어는 다시 보내도 실패)
+    "E0005", "E0006", "E0008", "E0009", "E0010", "E0011", "E0012", "E0013", "E0015",
+}
+JUSO_THROTTLE_ERRORS = {"-999"}                       # 시스템 에러 (과부하)
+
+# 조회 상태: 캐시해도 되는 상태 / 호출 실패로 보는 상태
+STATUS_OK = "ok"
+STATUS_NO_RESULT = "no_result"
+STATUS_INVALID_QUERY = "invalid_query"
+STATUS_AUTH = "auth_error"
+STATUS_THROTTLED = "throttled"
+STATUS_ERROR = "error"
+STATUS_CIRCUIT_OPEN = "circuit_open"
+FAILURE_STATUSES = (STATUS_AUTH, STATUS_CIRCUIT_OPEN, STATUS_THROTTLED, STATUS_ERROR)  # 심각한 순
+
+
+def _classify_response(response):
+    """
+    HTTP 응답 → (검색 결과 리스트, 상태, 오류 설명)
+    """
+    if response.status_code == 429:
+        return [], STATUS_THROTTLED, f"HTTP {response.status_code}"
+    if response.status_code != 200:
+        return [], STATUS_ERROR, f"HTTP {response.status_code}"
+
+    common = response.json()["results"]["common"]
+    code = str(common.get("errorCode", ""))
+    if code == "0":
+        results = response.json()["results"]["juso"] or []
+        return results, (STATUS_OK if results else STATUS_NO_RESULT), None
+
+    message = f"{code} {common.get('errorMessage', '')}".strip()
+    if code in JUSO_AUTH_ERRORS:
+        return [], STATUS_AUTH, message
+    if code in JUSO_INVALID_QUERY_ERRORS:
+        return [], STATUS_INVALID_QUERY, message
+    if code in JUSO_THROTTLE_ERRORS:
+        return [], STATUS_THROTTLED, message
+    return [], STATUS_ERROR, message
+
+
+def _request_juso(keyword, api_key=None):
+    """
+    도로명주소 API 호출 (키 풀에서 고른 키의 차단기/속도 조절 반영)
+    제한 응답(429/-999)은 키 속도를 낮춘 뒤 JUSO_THROTTLE_RETRIES회까지 다시 보냅니다.
+    5xx는 서버 오류로 보고 http_client의 백오프 재시도 후에도 실패하면 차단기 실패로 기록합니다
+    (계속 실패하는 서버에는 차단기가 열려 호출을 멈춤).
 
-    url = "https://business.juso.go.kr/addrlink/addrLinkApi.do"
+    Returns:
+        tuple: (검색 결과 리스트, 상태)
+    """
     params = {
-        "confmKey": api_key,
         "currentPage": 1,
         "countPerPage": 10,
         "keyword": keyword,
         "resultType": "json",
     }
 
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if data["results"]["common"]["errorCode"] != "0":
-                return []
-            return data["results"]["juso"] or []
-        return []
-    except Exception:
+    for attempt in range(JUSO_THROTTLE_RETRIES + 1):
+        key = _juso_keys.acquire(preferred=api_key)
+        if key is None:
+            return [], STATUS_CIRCUIT_OPEN
+        if attempt:
+            tracing.count("juso_throttle_retries")
+
+        try:
+            response = http_client.request(
+                "juso", "GET", JUSO_API_URL,
+                timeout=JUSO_TIMEOUT,
+                limiter=key.limiter,
+                params={**params, "confmKey": key.key},
+            )
+            results, status, error = _classify_response(response)
+        except Exception as e:
+            results, status, error = [], STATUS_ERROR, type(e).__name__
+
+        if status == STATUS_THROTTLED:
+            _juso_keys.record_throttle(key, error)
+            continue
+        if status == STATUS_AUTH:
+            # 키 문제는 재시도해도 해결되지 않으므로 이 키만 제외 (다른 키로 계속)
+            _juso_keys.disable(key, error)
+        elif status == STATUS_ERROR:
+            _juso_keys.record_failure(key, error)
+        else:
+            _juso_keys.record_success(key)
+        return results, status
+    return [], STATUS_THROTTLED
+
+
+def search_zipcode_api(keyword, api_key=None, use_cache=True):
+    """
+    행안부 도로명주소 API 조회 (캐시 적중 시 API 호출 생략)
+    JUSO_BACKEND == "offline"이면 로컬 주소DB에서 같은 형식으로 검색합니다.
+    호출 상태는 활성 trace의 juso_<상태> 카운터로 남습니다 (recommend_zipcode의 api_status).
+    api_key를 지정하지 않으면 키 풀(JUSO_API_KEYS)에서 돌아가며 고르고,
+    지정하면 그 키로만 호출합니다 (키 풀에 없는 키면 ValueError).
+    """
+    if not keyword:
         return []
 
+    offline = get_offline_backend()
+    if offline is not None:
+        tracing.count("offline_queries")
+        return offline.search(keyword)
+
+    cache = get_juso_cache() if use_cache else None
+    cache_key = _normalize_keyword(keyword)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            tracing.count("juso_cache_hits")
+            return cached
+
+    results, status = _request_juso(keyword, api_key)
+    tracing.count(f"juso_{status}")
+
+    if results:
+        for index in (get_local_index(), get_road_index()):
+            if index is not None:
+                index.add_many(results)
+
+    # 결과가 확정된 응답만 캐시 (제한/오류/차단은 다음 조회 때 다시 시도)
+    if cache is not None:
+        if status == STATUS_OK:
+            cache.set(cache_key, results)
+        elif status in (STATUS_NO_RESULT, STATUS_INVALID_QUERY):
+            cache.set(cache_key, results, ttl=LOOKUP_CACHE_NEGATIVE_TTL, negative=True)
+
+    return results
+
+
+def get_juso_health():
+    """
+    도로명주소 API 호출 상태 (키 풀 전체의 초당 요청 수, 차단기 상태, 제한 응답 수, 마지막 오류,
+    사용 가능한 키 수와 키별 상태)
+    """
+    return _juso_keys.health()
+
+
+def _api_status(trace_dict):
+    """주소 1건 조회 중 가장 심각한 API 실패 상태 (없으면 "ok")"""
+    counters = trace_dict["counters"]
+    for status in FAILURE_STATUSES:
+        if counters.get(f"juso_{status}"):
+            return status
+    return STATUS_OK
+
+
+def get_cache_stats():
+    """조회 캐시 적중/미적중 통계 (캐시 비활성화 시 None)"""
+    cache = get_juso_cache()
+    return cache.stats() if cache is not None else None
+
 
 def extract_base_address(full_address):
     """전체 주소에서 기본 주소(도로명/지번)만 추출 (상세주소 제거)"""
     if not full_address:
         return ""
-
-    address = full_address.strip()
-
-    # 괄호 안 내용 임시 보존
-    paren_match = re.search(r"\([^)]+\)", address)
-    paren_content = paren_match.group() if paren_match else ""
-
-    address_no_paren = re.sub(r"\([^)]+\)", "", address).strip()
-
-    base_address = None
-
-    # 1단계: 도로명 주소 패턴 직접 추출 (~로/~길 + 건물번호)
-    road_pattern = r"^(.+?(?:로|길)(?:\s*\d+번?길)?\s*\d+(?:-\d+)?)"
-    road_match = re.match(road_pattern, address_no_paren)
-    if road_match:
-        base_address = road_match.group(1)
-
-    # 2단계: 지번 주소 패턴 직접 추출 (동/리 + 번지)
-    if not base_address:
-        jibun_pattern = r"^(.+?(?:동\d*가?|리|읍|면)\s+\d+(?:-\d+)?)"
-        jibun_match = re.match(jibun_pattern, address_no_paren)
-        if jibun_match:
-            base_address = jibun_match.group(1)
-
-    # 3단계: 패턴 매칭 실패 시 상세주소 제거 후 반환
-    if not base_address:
-        detail_patterns = [
-            r"\s+\d+동\s*\d*호?.*$",
-            r"\s+[A-Za-z가-힣]+동(?![가-힣]|\d+가)\s*\d*호?.*$",
-            r"\s+\d+층.*$",
-            r"\s+\d+-\d+호?.*$",
-            r"\s+\d+호.*$",
-            r"\s+[가-힣]+아파트.*$",
-            r"\s+[가-힣]+빌딩.*$",
-            r"\s+[가-힣]+타워.*$",
-            r"\s+[가-힣]+오피스텔.*$",
-            r"\s+[가-힣]+빌라.*$",
-            r"\s+[가-힣]+맨션.*$",
-            r"\s+[가-힣]+주택.*$",
-            r"\s+[가-힣]+마을.*$",
-            r"\s+[가-힣]+단지.*$",
-        ]
-        base_address = address_no_paren
-        for pattern in detail_patterns:
-            base_address = re.sub(pattern, "", base_address, flags=re.IGNORECASE)
-
-    if paren_content:
-        base_address = f"{base_address} {paren_content}"
-
-    return base_address.strip()
+    return parse_address(full_address).base_address
 
 
 def calculate_similarity(str1, str2):
@@ -115,54 +494,370 @@ def normalize_zipcode(zipcode):
 
 def _build_retry_keyword(address):
     """검색 실패 시 동/로/길 접미사를 제거한 핵심 키워드만 추출"""
-    cleaned = address.strip()
-    # 괄호 내용 제거
-    cleaned = re.sub(r"\([^)]+\)", "", cleaned).strip()
-    # 동/로/길 접미사 제거: 잠원동60 → 잠원, 이곡동 → 이곡
-    cleaned = re.sub(r"([가-힣]{2,})(?:동\d*가?|로|길)\d*", r"\1", cleaned)
-    # 숫자, 특수문자 제거 (한글과 공백만 유지)
-    cleaned = re.sub(r"[^가-힣\s]", " ", cleaned)
-    # 단일 글자 단어 제거 (호, 동, 층 등 잔여 조각)
-    words = [w for w in cleaned.split() if len(w) > 1]
-    cleaned = " ".join(words)
-    return cleaned if len(cleaned) > 3 else None
+    return parse_address(address).retry_keyword or None
 
 
 def _find_best_match(search_results, full_input, base_address):
-    """검색 결과에서 가장 유사한 주소 찾기"""
-    best_match = None
-    best_similarity = 0.0
+    """검색 결과에서 가장 유사한 주소 찾기 (전체 후보를 한 번에 점수화)"""
+    if not search_results:
+        return None, 0.0
+
+    scores = score_candidates(
+        full_input, base_address, [item["roadAddr"] for item in search_results]
+    )
+    best = int(scores.argmax())
+    best_similarity = float(scores[best])
+    if best_similarity <= 0.0:
+        return None, 0.0
+
+    return search_results[best], best_similarity
+
+
+def _same_building(juso, parsed):
+    """juso의 건물번호(도로명) 또는 지번이 입력 주소의 번호와 정확히 같은지"""
+    if parsed.kind == "road":
+        main, sub = juso.get("buldMnnm"), juso.get("buldSlno")
+    else:
+        main, sub = juso.get("lnbrMnnm"), juso.get("lnbrSlno")
+    try:
+        return int(main or 0) == parsed.main_no and int(sub or 0) == parsed.sub_no
+    except ValueError:
+        return False
+
+
+def _search_local_index(address, keyword):
+    """
+    로컬 n-gram 인덱스에서 재시도 후보 검색
+    인덱스에는 이미 본 주소만 있으므로 건물번호(지번)가 정확히 같은 후보만 사용합니다
+    (같은 도로의 이웃 건물이 다른 우편번호로 답하지 않도록).
+    번호가 없는 주소이거나 최선 후보의 정확도가 LOCAL_INDEX_MIN_ACCURACY 미만이면 빈 리스트 (API 재시도)
+    """
+    index = get_local_index()
+    if index is None:
+        return []
+
+    parsed = parse_address(address)
+    if not parsed.main_no:
+        return []
+
+    local_results = [j for j in index.query(address) if _same_building(j, parsed)]
+    if not local_results:
+        return []
+
+    _, best_similarity = _find_best_match(local_results, address, keyword)
+    if int(best_similarity * 100) < LOCAL_INDEX_MIN_ACCURACY:
+        return []
+    tracing.count("local_index_hits")
+    return local_results
+
+
+def _stage_known(address):
+    """
+    시트에서 확인된 같은 주소(정규화 키 기준)의 우편번호 (API 호출 없음)
+    """
+    cache = get_known_cache()
+    if cache is None:
+        return None
+    key = _known_key(parse_address(address))
+    if key is None:
+        return None
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    tracing.count("known_hits")
+    return (100, entry["zipcode"], entry["address"], "sheet",
+            [{"zipcode": entry["zipcode"], "road_addr": entry["address"]}])
+
+
+def _stage_road_index(address):
+    """
+    0단계: 같은 도로·건물번호의 받아 둔 결과로 바로 응답 (API 호출 없음)
+    정확도가 EARLY_EXIT_ACCURACY 미만이면 None (일반 단계로 진행)
+    """
+    index = get_road_index()
+    if index is None:
+        return None
+
+    parsed = parse_address(address)
+    juso = index.lookup(parsed)
+    if juso is None:
+        return None
 
-    for item in search_results:
-        road_addr = item["roadAddr"]
-        similarity = calculate_similarity(full_input, road_addr)
+    _, best_similarity = _find_best_match([juso], address, parsed.base_address or address)
+    accuracy = min(100, int(best_similarity * 100))
+    if accuracy < EARLY_EXIT_ACCURACY:
+        return None
+    tracing.count("road_index_hits")
+    return (accuracy, juso["zipNo"], juso["roadAddr"], "road_index", _api_candidates([juso]))
 
-        # 키워드 매칭 보너스
-        keywords = base_address.split()
-        keyword_bonus = sum(0.1 for kw in keywords if kw in road_addr)
-        similarity = min(1.0, similarity + keyword_bonus)
 
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_match = item
+def _api_candidates(search_results):
+    return [
+        {"zipcode": item["zipNo"], "road_addr": item["roadAddr"]}
+        for item in search_results[:5]
+    ]
 
-    return best_match, best_similarity
+
+def _stage_gemini(address, gemini_result, result):
+    """
+    1단계(gemini_first) / 마지막 단계(cheap_first): Gemini 정제 결과로 API 조회
+
+    Returns:
+        tuple | None: (accuracy, zipNo, roadAddr, source, api_candidates)
+    """
+    if gemini_result is None:
+        gemini_result = refine_address_with_gemini(address)
+    result["gemini_info"] = gemini_result
+
+    if not gemini_result.get("success"):
+        return None
+    search_keyword = gemini_result.get("search_keyword", "")
+    if not search_keyword:
+        return None
+
+    search_results = search_zipcode_api(search_keyword)
+    if not search_results:
+        refined = gemini_result.get("refined_address", "")
+        if refined and refined != search_keyword:
+            search_results = search_zipcode_api(refined)
+    if not search_results:
+        return None
+
+    best_match, best_similarity = _find_best_match(search_results, address, search_keyword)
+    if not best_match:
+        return None
+    gemini_confidence = gemini_result.get("confidence", 0.5)
+    raw_accuracy = best_similarity * gemini_confidence
+    accuracy = min(95, max(30, int(raw_accuracy * 100)))
+    return (accuracy, best_match["zipNo"], best_match["roadAddr"], "gemini+api",
+            _api_candidates(search_results))
+
+
+def _stage_regex(address):
+    """정규식 기반 정제 후 API 조회"""
+    parsed = parse_address(address)
+    base_address = parsed.base_address or address
+
+    search_results = search_zipcode_api(base_address)
+    if not search_results:
+        shorter = parsed.base_without_number
+        if shorter and shorter != base_address:
+            search_results = search_zipcode_api(shorter)
+    if not search_results:
+        return None
+
+    best_match, best_similarity = _find_best_match(search_results, address, base_address)
+    if not best_match:
+        return None
+    accuracy = min(100, int(best_similarity * 100))
+    return (accuracy, best_match["zipNo"], best_match["roadAddr"], "regex+api",
+            _api_candidates(search_results))
+
+
+def _stage_retry(address):
+    """키워드 재시도 (동/로/길 접미사 제거 후 핵심 키워드 검색, 로컬 인덱스 우선)"""
+    retry_keyword = parse_address(address).retry_keyword
+    if not retry_keyword:
+        return None
+
+    search_results = _search_local_index(address, retry_keyword)
+    if not search_results:
+        search_results = search_zipcode_api(retry_keyword)
+    if not search_results:
+        return None
+
+    best_match, best_similarity = _find_best_match(search_results, address, retry_keyword)
+    if not best_match:
+        return None
+    accuracy = min(75, int(best_similarity * 100))
+    return (accuracy, best_match["zipNo"], best_match["roadAddr"], "retry",
+            _api_candidates(search_results))
+
+
+# 이 정확도 이상이면 남은 단계 생략 (재시도 단계는 최대 75라 해당 없음)
+EARLY_EXIT_ACCURACY = 80
+
+
+def _exit_accuracy(stages, i):
+    """
+    stages[i]까지 실행한 뒤 바로 반환할 정확도.
+    뒤에 Gemini 단계가 남아 있으면 gate(GEMINI_GATE_ACCURACY)를 넘어야 Gemini를 건너뛰므로 둘 중 큰 값
+    """
+    if "gemini" in stages[i + 1:]:
+        return max(EARLY_EXIT_ACCURACY, GEMINI_GATE_ACCURACY)
+    return EARLY_EXIT_ACCURACY
+
+
+def _apply_candidate(result, candidate):
+    """지금까지의 최선 결과보다 정확도가 높으면 교체"""
+    accuracy, zipcode, road_addr, source, api_cands = candidate
+    if result["zipcode"] and accuracy <= result["accuracy"]:
+        return
+    result["accuracy"] = accuracy
+    result["zipcode"] = zipcode
+    result["road_addr"] = road_addr
+    result["source"] = source
+    result["candidates"] = api_cands
 
 
-def recommend_zipcode(address: str, use_gemini_fallback: bool = True) -> dict:
+def _speculative_group(stages, gemini_result=None, defer_gemini=False):
+    """
+    동시에 시작할 수 있는 앞쪽 단계들.
+    뒤쪽 Gemini 단계는 앞 단계 결과로 실행 여부가 정해지므로(gate/일괄 정제) 포함하지 않고,
+    defer_gemini이고 Gemini 결과가 아직 없으면 첫 단계라도 포함하지 않습니다 (일괄 정제로 미룸).
+    """
+    group = []
+    for i, name in enumerate(stages):
+        if name == "gemini" and (i > 0 or (defer_gemini and gemini_result is None)):
+            break
+        group.append(name)
+    return group
+
+
+def _run_stage_isolated(name, address, gemini_result):
+    """동시 실행용: result를 공유하지 않고 (후보, gemini_info) 반환"""
+    if name == "gemini":
+        scratch = {}
+        candidate = _stage_gemini(address, gemini_result, scratch)
+        return candidate, scratch.get("gemini_info")
+    return _STAGE_FUNCS[name](address), None
+
+
+def _run_concurrently(address, group, result, gemini_result, exit_accuracy, adaptive=None):
+    """
+    group의 단계들을 동시에 실행합니다.
+    정확도 exit_accuracy 이상 후보가 나오면 나머지 단계를 취소(시작 전)하거나 결과를 버리고 True,
+    모두 미달이면 전체 후보 중 최고를 result에 반영하고 False를 반환합니다.
+    각 단계는 자기 Trace에 기록하고, 끝난 단계만 행의 Trace에 합칩니다
+    (버린 단계가 반환 후에도 행의 Trace를 고치지 않도록).
+    이미 실행 중이라 취소하지 못한 단계의 호출 수는 끝난 뒤 실행의 RunMetrics에 따로 합산됩니다.
+    """
+    executor = _get_stage_executor()
+    trace = tracing.current()
+
+    def run(name, stage_trace):
+        with tracing.collect(stage_trace), tracing.stage(name):
+            return _run_stage_isolated(name, address, gemini_result)
+
+    stage_traces = {name: tracing.Trace() for name in group}
+    futures = {executor.submit(run, name, stage_traces[name]): name for name in group}
+    outcomes = {}
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        finished = [futures[future] for future in done]
+        for future in done:
+            name = futures[future]
+            try:
+                outcomes[name] = future.result()
+            except Exception:
+                outcomes[name] = (None, None)
+            if trace is not None:
+                trace.absorb(stage_traces[name])
+
+        for name in sorted(finished, key=group.index):
+            candidate, gemini_info = outcomes[name]
+            if adaptive is not None and name == "regex" and group[0] == "regex":
+                adaptive.record(candidate is not None and candidate[0] >= EARLY_EXIT_ACCURACY)
+            if candidate is not None and candidate[0] >= exit_accuracy:
+                run = tracing.current_run()
+                for other in pending:
+                    if not other.cancel() and run is not None:
+                        run.add_discarded(other, stage_traces[futures[other]])
+                if gemini_info is not None:
+                    result["gemini_info"] = gemini_info
+                _apply_candidate(result, candidate)
+                if trace is not None:
+                    trace.count("speculative_discarded", len(pending))
+                    trace.exit_stage = name
+                return True
+
+    # 조기 종료 없음: 원래 단계 순서대로 반영 (동점이면 앞 단계 우선)
+    for name in group:
+        candidate, gemini_info = outcomes[name]
+        if gemini_info is not None:
+            result["gemini_info"] = gemini_info
+        if candidate is not None:
+            _apply_candidate(result, candidate)
+    if trace is not None:
+        trace.exit_stage = group[-1]
+    return False
+
+
+def _run_stages(address, stages, result, gemini_result, defer_gemini, adaptive=None):
+    """
+    stages 순서대로 실행하며 정확도 최고 결과를 result에 반영합니다.
+    SPECULATIVE_STAGES이면 앞쪽의 독립 단계들은 동시에 실행합니다.
+    adaptive가 있으면 맨 앞 정규식 단계의 성공 여부를 기록합니다 (stage_policy 참고).
+    defer_gemini이고 Gemini 결과가 아직 없으면 Gemini 단계부터 남겨두고 반환합니다
+    (result["pending_stages"], 호출 측이 일괄 정제 후 resume_recommendation으로 이어서 실행).
+    """
+    start = 0
+    if SPECULATIVE_STAGES:
+        group = _speculative_group(stages, gemini_result, defer_gemini)
+        if len(group) > 1:
+            exit_accuracy = _exit_accuracy(stages, len(group) - 1)
+            if _run_concurrently(address, group, result, gemini_result, exit_accuracy, adaptive):
+                return result
+            start = len(group)
+
+    for i, name in enumerate(stages[start:], start):
+        if name == "gemini":
+            # cheap_first: 앞 단계 결과가 충분하면 Gemini 생략
+            if i > 0 and result["zipcode"] and result["accuracy"] >= GEMINI_GATE_ACCURACY:
+                tracing.count("gemini_gated")
+                continue
+            if gemini_result is None and defer_gemini:
+                result["pending_stages"] = list(stages[i:])
+                return result
+            with tracing.stage("gemini"):
+                candidate = _stage_gemini(address, gemini_result, result)
+        else:
+            with tracing.stage(name):
+                candidate = _STAGE_FUNCS[name](address)
+
+        if adaptive is not None and name == "regex" and i == 0:
+            adaptive.record(candidate is not None and candidate[0] >= EARLY_EXIT_ACCURACY)
+
+        if candidate is not None:
+            _apply_candidate(result, candidate)
+            # 높은 정확도면 바로 반환 (불필요한 추가 검색 생략)
+            if candidate[0] >= _exit_accuracy(stages, i):
+                return result
+
+    return result
+
+
+_STAGE_FUNCS = {"regex": _stage_regex, "retry": _stage_retry}
+
+
+def recommend_zipcode(address: str, use_gemini_fallback: bool = True,
+                      gemini_result: dict = None, defer_gemini: bool = False,
+                      adaptive=None) -> dict:
     """
     주소를 기반으로 우편번호를 추천합니다.
-    Gemini 활성화 시: Gemini 정제 → API 조회 → (실패 시) 정규식 fallback
-    Gemini 비활성화 시: 정규식 정제 → API 조회
+    시트에서 확인된 같은 주소가 있으면 그 우편번호를 (source "sheet"),
+    같은 도로·건물번호의 결과를 이미 받아 두었으면 도로구간 인덱스에서 바로 반환하고 (source "road_index"),
+    아니면 단계 순서는 STAGE_ORDER_POLICY를 따릅니다 (stage_policy 참고).
+      cheap_first (기본): 정규식 정제 → API 조회 → 키워드 재시도 → (정확도 부족 시) Gemini 정제
+      gemini_first: Gemini 정제 → API 조회 → (실패 시) 정규식 fallback
+    Gemini 비활성화 시: 정규식 정제 → API 조회 → 키워드 재시도
 
     Args:
         address: 주소 문자열
         use_gemini_fallback: Gemini AI 사용 여부
+        gemini_result: 미리 정제한 Gemini 결과 (일괄 정제 시, None이면 필요할 때 개별 호출)
+        defer_gemini: True이면 Gemini가 필요해진 시점에 개별 호출하지 않고
+                      result["pending_stages"]를 남긴 채 반환 (일괄 정제 후 resume_recommendation)
+        adaptive: adaptive 정책의 실행별 상태 (stage_policy.new_adaptive_order, 없으면 cheap_first)
 
     Returns:
         dict: {
             zipcode, road_addr, accuracy, source,
-            candidates, gemini_info
+            candidates, gemini_info,
+            trace: {total_ms, stages_ms, counters, exit_stage},
+            api_status: 조회 중 가장 심각한 API 실패 상태 ("ok" / "auth_error" / "circuit_open" / "throttled" / "error"),
+            pending_stages (defer_gemini로 중단된 경우만)
         }
     """
     result = {
@@ -174,105 +869,51 @@ def recommend_zipcode(address: str, use_gemini_fallback: bool = True) -> dict:
         "gemini_info": None,
     }
 
-    if not address:
-        return result
+    with tracing.collect() as trace:
+        if address:
+            # 확인된 주소 → 도로구간 인덱스 순으로 로컬 조회 (해시 조회뿐이라 단계 시간은 기록하지 않음)
+            for name, local_stage in (("known", _stage_known), ("road_index", _stage_road_index)):
+                candidate = local_stage(address)
+                if candidate is not None:
+                    _apply_candidate(result, candidate)
+                    trace.exit_stage = name
+                    break
+            else:
+                stages = stage_order(use_gemini_fallback, adaptive=adaptive)
+                _run_stages(address, stages, result, gemini_result, defer_gemini, adaptive)
+    result["trace"] = trace.to_dict()
+    _mark_api_status(result)
+    return result
 
-    # 각 단계의 최선 결과를 모아서 가장 정확도 높은 것을 반환
-    candidates = []  # [(accuracy, zipNo, roadAddr, source, api_candidates)]
 
-    # ── 1단계: Gemini AI 정제 (활성화 시 우선 시도) ──
-    if use_gemini_fallback:
-        gemini_result = refine_address_with_gemini(address)
-        result["gemini_info"] = gemini_result
-
-        if gemini_result.get("success"):
-            search_keyword = gemini_result.get("search_keyword", "")
-            if search_keyword:
-                search_results = search_zipcode_api(search_keyword)
-
-                if not search_results:
-                    refined = gemini_result.get("refined_address", "")
-                    if refined and refined != search_keyword:
-                        search_results = search_zipcode_api(refined)
-
-                if search_results:
-                    best_match, best_similarity = _find_best_match(
-                        search_results, address, search_keyword
-                    )
-                    if best_match:
-                        gemini_confidence = gemini_result.get("confidence", 0.5)
-                        raw_accuracy = best_similarity * gemini_confidence
-                        accuracy = min(95, max(30, int(raw_accuracy * 100)))
-                        api_cands = [
-                            {"zipcode": item["zipNo"], "road_addr": item["roadAddr"]}
-                            for item in search_results[:5]
-                        ]
-                        candidates.append((accuracy, best_match["zipNo"], best_match["roadAddr"], "gemini+api", api_cands))
-
-                        # 높은 정확도면 바로 반환 (불필요한 추가 검색 생략)
-                        if accuracy >= 80:
-                            result["zipcode"] = best_match["zipNo"]
-                            result["road_addr"] = best_match["roadAddr"]
-                            result["accuracy"] = accuracy
-                            result["source"] = "gemini+api"
-                            result["candidates"] = api_cands
-                            return result
-
-    # ── 2단계: 정규식 기반 정제 ──
-    base_address = extract_base_address(address)
-    if not base_address:
-        base_address = address
+def _mark_api_status(result):
+    """API 실패로 결과를 못 찾은 경우 source를 "api_error"로 표시 (단순 검색 실패와 구분)"""
+    result["api_status"] = _api_status(result["trace"])
+    if not result["zipcode"] and result["api_status"] != STATUS_OK:
+        result["source"] = "api_error"
 
-    search_results = search_zipcode_api(base_address)
 
-    if not search_results:
-        shorter = re.sub(r"\s+\d+(-\d+)?$", "", base_address)
-        if shorter != base_address:
-            search_results = search_zipcode_api(shorter)
+def resume_recommendation(address: str, partial: dict, gemini_result: dict) -> dict:
+    """
+    defer_gemini로 중단된 결과를 Gemini 정제 결과와 함께 남은 단계부터 이어서 실행합니다.
 
-    if search_results:
-        best_match, best_similarity = _find_best_match(
-            search_results, address, base_address
-        )
-        if best_match:
-            accuracy = min(100, int(best_similarity * 100))
-            api_cands = [
-                {"zipcode": item["zipNo"], "road_addr": item["roadAddr"]}
-                for item in search_results[:5]
-            ]
-            candidates.append((accuracy, best_match["zipNo"], best_match["roadAddr"], "regex+api", api_cands))
-
-            if accuracy >= 80:
-                result["zipcode"] = best_match["zipNo"]
-                result["road_addr"] = best_match["roadAddr"]
-                result["accuracy"] = accuracy
-                result["source"] = "regex+api"
-                result["candidates"] = api_cands
-                return result
+    Args:
+        address: 주소 문자열
+        partial: recommend_zipcode(defer_gemini=True)가 반환한 결과 (pending_stages 포함)
+        gemini_result: refine_addresses_with_gemini 등으로 얻은 정제 결과
 
-    # ── 3단계: 키워드 재시도 (동/로/길 접미사 제거 후 핵심 키워드 검색) ──
-    retry_keyword = _build_retry_keyword(address)
-    if retry_keyword:
-        search_results = search_zipcode_api(retry_keyword)
-        if search_results:
-            best_match, best_similarity = _find_best_match(
-                search_results, address, retry_keyword
-            )
-            if best_match:
-                accuracy = min(75, int(best_similarity * 100))
-                api_cands = [
-                    {"zipcode": item["zipNo"], "road_addr": item["roadAddr"]}
-                    for item in search_results[:5]
-                ]
-                candidates.append((accuracy, best_match["zipNo"], best_match["roadAddr"], "retry", api_cands))
-
-    # ── 모든 단계의 결과 중 정확도 최고를 반환 ──
-    if candidates:
-        best = max(candidates, key=lambda x: x[0])
-        result["accuracy"] = best[0]
-        result["zipcode"] = best[1]
-        result["road_addr"] = best[2]
-        result["source"] = best[3]
-        result["candidates"] = best[4]
+    Returns:
+        dict: recommend_zipcode와 같은 형식 (trace는 두 실행을 합친 값)
+    """
+    result = dict(partial)
+    stages = result.pop("pending_stages", None)
+    if not stages:
+        return result
 
+    with tracing.collect() as trace:
+        _run_stages(address, stages, result, gemini_result, defer_gemini=False)
+    result["trace"] = tracing.merge(partial.get("trace"), trace.to_dict())
+    if result["source"] == "api_error":
+        result["source"] = "none"
+    _mark_api_status(result)
     return result